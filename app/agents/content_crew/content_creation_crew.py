@@ -1,11 +1,19 @@
 from crewai import Agent, Crew, Task, Process
 from crewai_tools import SerperDevTool, WebsiteSearchTool, ScrapeWebsiteTool
+from app.tools.content_tools.keyword_extractor import KeywordCandidates, extract_keywords
+from app.tools.content_tools.page_fingerprints import PageFingerprint
 from app.tools.content_tools.trend_tools import ContentTrendTools
+from app.services.trend_report_scheduler import get_trend_report_store
+from app.core.metrics import instrument_llm_calls
 from typing import List, Dict, Optional
 from datetime import datetime
+import hashlib
 import json
 import os
 
+# Characters of each competitor page handed to the analyst
+COMPETITOR_EXCERPT_CHARS = 1500
+
 class ContentCreationCrew:
     """Content Creation Crew for trend-based content optimization"""
 
@@ -15,6 +23,9 @@ class ContentCreationCrew:
             print("Warning: OPENAI_API_KEY not found. CrewAI may require this for embeddings.")
 
         self.tools = ContentTrendTools()
+        # Time each LLM call the crew makes as an upstream request
+        instrument_llm_calls()
+        self.trend_reports = get_trend_report_store()
         self._setup_agents()
 
     def _setup_agents(self):
@@ -67,9 +78,61 @@ class ContentCreationCrew:
             allow_delegation=False
         )
 
-    def create_trend_research_task(self, content_idea: Dict) -> Task:
+    def extract_candidate_keywords(
+        self,
+        content_idea: Dict,
+        trend_data: Optional[Dict] = None
+    ) -> KeywordCandidates:
+        """Extract keyword and hashtag candidates locally from cached results"""
+        documents = self.tools.cached_documents(content_idea.get('competitors'))
+        if trend_data:
+            documents.extend(trend_data.values())
+        report = self.trend_reports.get_fresh(content_idea.get('industry') or 'general')
+        if report is not None:
+            documents.extend([report.trending_topics, report.social_trends])
+        documents.append(content_idea.get('topic') or '')
+        return extract_keywords(documents, content_idea.get('keywords') or [])
+
+    def create_trend_research_task(
+        self,
+        content_idea: Dict,
+        trend_data: Optional[Dict] = None,
+        candidates: Optional[KeywordCandidates] = None
+    ) -> Task:
         """Create a task for trend research"""
         topic = content_idea.get('topic', 'general topic')
+        industry = content_idea.get('industry') or 'general'
+        if candidates is None:
+            candidates = self.extract_candidate_keywords(content_idea, trend_data)
+
+        # A fresh scheduled report replaces live research for this industry
+        report = self.trend_reports.get_fresh(industry)
+        if report is not None:
+            return Task(
+                description=f"""
+            A precomputed trend report for the {industry} industry is provided below.
+            Do not perform new research. Adapt the report to this content idea: {topic}
+            Target audience: {content_idea.get('target_audience', 'general')}
+
+            {report.to_prompt()}
+
+            Keywords and hashtags extracted locally (select and refine, do not regenerate):
+            {candidates.to_prompt()}
+            """,
+                expected_output="""The precomputed trend report adapted to the content idea, containing:
+            - Top 5 trending angles relevant to the topic
+            - Hashtags and keywords selected from the candidates
+            - Emerging opportunities and content gaps""",
+                agent=self.trend_researcher
+            )
+
+        search_context = ""
+        if trend_data:
+            search_context = f"""
+            Search results already gathered for this idea (use these before general knowledge):
+            Trending topics: {trend_data.get('trending_topics', '')}
+            Social trends: {trend_data.get('social_trends', '')}
+            """
         return Task(
             description=f"""
             Research current trends related to: {topic}
@@ -80,11 +143,14 @@ class ContentCreationCrew:
             1. Identify top 5 trending topics or angles related to this content idea
             2. Find viral content examples in this space
             3. Analyze what makes these trends successful
-            4. Identify trending hashtags and keywords
+            4. Select the strongest hashtags and keywords from the candidates below
             5. Look for emerging conversations and pain points
 
             Use the available trend analysis tools to gather this information.
             If tools are not available, provide insights based on general knowledge and best practices.
+            {search_context}
+            Keywords and hashtags extracted locally (select and refine, do not regenerate):
+            {candidates.to_prompt()}
 
             Provide a comprehensive trend analysis report.
             """,
@@ -92,17 +158,17 @@ class ContentCreationCrew:
             - Top 5 trending angles with evidence
             - Viral content examples with engagement metrics
             - Key success factors analysis
-            - List of 10+ trending hashtags and keywords
+            - Hashtags and keywords selected from the candidates
             - Emerging opportunities and content gaps""",
             agent=self.trend_researcher
         )
 
-    def create_competitor_analysis_task(self, content_idea: Dict) -> Task:
-        """Create a task for competitor analysis"""
+    @staticmethod
+    def competitor_analysis_description(content_idea: Dict) -> str:
+        """The competitor task's instructions, without the page text fetched for this request"""
         topic = content_idea.get('topic', 'general topic')
         competitors = content_idea.get('competitors', [])
-        return Task(
-            description=f"""
+        return f"""
             Analyze competitor content strategies for: {topic}
             Competitors to analyze: {competitors if competitors else 'Find top 3 competitors in this space'}
 
@@ -117,7 +183,33 @@ class ContentCreationCrew:
             If no specific competitors are provided, research general competitive landscape.
 
             Provide insights on how to differentiate our content.
-            """,
+            """
+
+    @classmethod
+    def competitor_task_key(cls, content_idea: Dict) -> str:
+        """Key under which the analyst's output is stored: a hash of the task's instructions"""
+        description = cls.competitor_analysis_description(content_idea)
+        return hashlib.blake2b(description.encode("utf-8"), digest_size=16).hexdigest()
+
+    def create_competitor_analysis_task(
+        self,
+        content_idea: Dict,
+        pages: Optional[Dict[str, Optional[str]]] = None
+    ) -> Task:
+        """Create a task for competitor analysis, including the fetched page text when available"""
+        page_context = "".join(
+            f"""
+            {url}:
+            {text[:COMPETITOR_EXCERPT_CHARS]}
+            """
+            for url, text in (pages or {}).items() if text
+        )
+        if page_context:
+            page_context = f"""
+            Current text of the competitor pages, fetched for this request:
+            {page_context}"""
+        return Task(
+            description=self.competitor_analysis_description(content_idea) + page_context,
             expected_output="""A competitor analysis report including:
             - Summary of each competitor's content strategy
             - High-performing content examples
@@ -127,7 +219,21 @@ class ContentCreationCrew:
             agent=self.competitor_analyst
         )
 
-    def create_strategy_task(self, content_idea: Dict) -> Task:
+    @staticmethod
+    def stored_competitor_context(stored: Optional[PageFingerprint]) -> str:
+        """Prompt section carrying a reused competitor analysis, or '' when there is none"""
+        if stored is None:
+            return ""
+        return f"""
+            Competitor analysis (competitor pages unchanged since {stored.analyzed_at}, reused as is):
+            {stored.analysis['competitor_analysis']}
+            """
+
+    def create_strategy_task(
+        self,
+        content_idea: Dict,
+        stored_competitor_analysis: Optional[PageFingerprint] = None
+    ) -> Task:
         """Create a task for content strategy development"""
         topic = content_idea.get('topic', 'general topic')
         return Task(
@@ -148,7 +254,7 @@ class ContentCreationCrew:
 
             Work with the available information from the trend research and competitor analysis.
             Do not delegate - use the context provided to create your strategy.
-            """,
+            {self.stored_competitor_context(stored_competitor_analysis)}""",
             expected_output="""A comprehensive content strategy including:
             - 3-5 unique content angles with headlines
             - Content calendar with optimal publishing times
@@ -158,9 +264,20 @@ class ContentCreationCrew:
             agent=self.content_strategist
         )
 
-    def create_content_creation_task(self, content_idea: Dict) -> Task:
+    def create_content_creation_task(
+        self,
+        content_idea: Dict,
+        candidates: Optional[KeywordCandidates] = None,
+        stored_competitor_analysis: Optional[PageFingerprint] = None
+    ) -> Task:
         """Create a task for final content creation"""
         topic = content_idea.get('topic', 'general topic')
+        candidate_context = ""
+        if candidates is not None:
+            candidate_context = f"""
+            Keyword and hashtag candidates:
+            {candidates.to_prompt()}
+            """
         return Task(
             description=f"""
             Using all the insights from trend research, competitor analysis, and content strategy,
@@ -183,7 +300,7 @@ class ContentCreationCrew:
             The content should feel fresh, relevant, and timely.
             Use the context from all previous tasks to inform your content creation.
             Do not delegate - create the content using all available insights.
-            """,
+            {candidate_context}{self.stored_competitor_context(stored_competitor_analysis)}""",
             expected_output="""Final content deliverables:
             - Main headline (optimized for trends)
             - 3 alternative headlines
@@ -196,42 +313,83 @@ class ContentCreationCrew:
             agent=self.content_creator
         )
 
-    def process_content_idea(self, content_idea: Dict) -> Dict:
-        """Process a single content idea through the crew"""
+    def prefetch_trend_data(self, content_ideas: List[Dict]) -> List[Optional[Dict]]:
+        """Run the trend searches for a batch of ideas in one concurrent wave"""
+        # Ideas covered by a fresh precomputed report need no searches
+        covered = [
+            self.trend_reports.get_fresh(idea.get('industry') or 'general') is not None
+            for idea in content_ideas
+        ]
+        searched = iter(self.tools.search_ideas(
+            [idea for idea, is_covered in zip(content_ideas, covered) if not is_covered]
+        ))
+        return [None if is_covered else next(searched) for is_covered in covered]
 
-        # Create tasks
-        trend_task = self.create_trend_research_task(content_idea)
-        competitor_task = self.create_competitor_analysis_task(content_idea)
-        strategy_task = self.create_strategy_task(content_idea)
-        content_task = self.create_content_creation_task(content_idea)
+    def prefetch_competitor_pages(self, content_ideas: List[Dict]) -> None:
+        """Fetch every distinct competitor page named by a batch of ideas in one concurrent wave"""
+        self.tools.fetch_competitor_pages(
+            [url for idea in content_ideas for url in idea.get('competitors') or []]
+        )
+
+    def build_crew(
+        self,
+        content_idea: Dict,
+        trend_data: Optional[Dict] = None,
+        candidates: Optional[KeywordCandidates] = None,
+        stored_competitor_analysis: Optional[PageFingerprint] = None,
+        competitor_pages: Optional[Dict[str, Optional[str]]] = None
+    ) -> Crew:
+        """Create the tasks for one idea, skipping competitor analysis when a stored one applies"""
+        trend_task = self.create_trend_research_task(content_idea, trend_data, candidates)
+        strategy_task = self.create_strategy_task(content_idea, stored_competitor_analysis)
+        content_task = self.create_content_creation_task(content_idea, candidates, stored_competitor_analysis)
+
+        if stored_competitor_analysis is None:
+            competitor_task = self.create_competitor_analysis_task(content_idea, competitor_pages)
+            research_tasks = [trend_task, competitor_task]
+            agents = [self.trend_researcher, self.competitor_analyst]
+        else:
+            research_tasks = [trend_task]
+            agents = [self.trend_researcher]
 
         # Set up task dependencies
-        strategy_task.context = [trend_task, competitor_task]
-        content_task.context = [trend_task, competitor_task, strategy_task]
-
-        # Create and run crew
-        crew = Crew(
-            agents=[
-                self.trend_researcher,
-                self.competitor_analyst,
-                self.content_strategist,
-                self.content_creator
-            ],
-            tasks=[
-                trend_task,
-                competitor_task,
-                strategy_task,
-                content_task
-            ],
+        strategy_task.context = list(research_tasks)
+        content_task.context = research_tasks + [strategy_task]
+
+        return Crew(
+            agents=agents + [self.content_strategist, self.content_creator],
+            tasks=research_tasks + [strategy_task, content_task],
             process=Process.sequential,
             verbose=True,
             memory=False  # Disable memory to avoid OpenAI embedding dependency
         )
 
+    def process_content_idea(self, content_idea: Dict, trend_data: Optional[Dict] = None) -> Dict:
+        """Process a single content idea through the crew"""
+
+        # Extract keyword candidates locally so agents refine instead of generating them
+        candidates = self.extract_candidate_keywords(content_idea, trend_data)
+
+        # Unchanged competitor pages and the same task: reuse the stored analysis
+        # instead of running the competitor task again
+        competitors = content_idea.get('competitors')
+        page_fingerprints = self.tools.fingerprint_competitor_pages(competitors)
+        task_key = self.competitor_task_key(content_idea)
+        stored_analysis = self.tools.stored_competitor_analysis(page_fingerprints, task_key)
+        pages = self.tools.fetch_competitor_pages(competitors) if stored_analysis is None else None
+
+        crew = self.build_crew(content_idea, trend_data, candidates, stored_analysis, pages)
+        competitor_task = next(
+            (task for task in crew.tasks if task.agent is self.competitor_analyst), None
+        )
+
         try:
             # Execute the crew
             result = crew.kickoff()
 
+            if competitor_task is not None and page_fingerprints and competitor_task.output:
+                self.tools.store_competitor_analysis(page_fingerprints, competitor_task.output.raw, task_key)
+
             return {
                 'original_idea': content_idea,
                 'optimized_content': str(result) if result else "Content creation completed successfully",
@@ -1,29 +1,108 @@
+import math
 from datetime import timedelta
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
+from jose import JWTError, jwt
 
-from app.core.security import create_access_token, verify_password
-from app.db.database import fake_users_db
-from app.models.user import Token
+from app.core.rate_limit import client_ip, login_rate_limiter
+from app.core.revocation import revocation_list
+from app.core.security import (
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    ALGORITHM,
+    SECRET_KEY,
+    PasswordHashingBusy,
+    create_access_token,
+    create_refresh_token,
+    verify_and_update_password_async
+)
+from app.db.database import users_db
+from app.models.user import RefreshRequest, RevokeRequest, Token
 
 router = APIRouter()
 
 
+def _issue_tokens(username: str) -> dict:
+    access_token = create_access_token(
+        data={"sub": username}, expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    refresh_token = create_refresh_token(data={"sub": username})
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
+    request: Request,
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()]
 ):
-    user = fake_users_db.get_user(form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    # Rejected before the user lookup so floods never reach bcrypt
+    retry_after = login_rate_limiter.check(form_data.username, client_ip(request))
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, please retry later",
+            headers={"Retry-After": str(max(1, math.ceil(min(retry_after, 3600))))},
+        )
+
+    user = await users_db.aget_user(form_data.username)
+    password_ok, new_hash = False, None
+    try:
+        if user is not None:
+            password_ok, new_hash = await verify_and_update_password_async(
+                form_data.password, user.hashed_password
+            )
+    except PasswordHashingBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent login attempts, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token_expires = timedelta(minutes=30)
-    access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+    if new_hash:
+        # The stored hash predates the current policy; upgrade it transparently
+        user = user.model_copy(update={"hashed_password": new_hash})
+        await users_db.aadd_user(user.username, user)
+    return _issue_tokens(user.username)
+
+
+@router.post("/token/refresh", response_model=Token)
+async def refresh_access_token(body: RefreshRequest):
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
     )
-    return {"access_token": access_token, "token_type": "bearer"}
+    try:
+        payload = jwt.decode(body.refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise credentials_exception
+    jti = payload.get("jti")
+    if payload.get("type") != "refresh" or not jti or await revocation_list.ais_revoked(jti):
+        raise credentials_exception
+    user = await users_db.aget_user(payload.get("sub"))
+    if user is None or user.disabled:
+        raise credentials_exception
+
+    # Refresh tokens are single use: only the request that claims the id gets
+    # new tokens, even when a replay races it on another worker
+    if not await revocation_list.arevoke_if_absent(jti, float(payload["exp"])):
+        raise credentials_exception
+    return _issue_tokens(user.username)
+
+
+@router.post("/token/revoke", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_token(body: RevokeRequest):
+    try:
+        payload = jwt.decode(body.token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        # Expired or forged tokens need no revocation
+        return None
+    if payload.get("jti") and "exp" in payload:
+        await revocation_list.arevoke(payload["jti"], float(payload["exp"]))
+    return None
@@ -1,6 +1,5 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
-from crewai import Agent, Crew, Task
 
 router = APIRouter()
 
@@ -35,6 +34,12 @@ async def run_crewai_hello(request: CrewAIRequest = CrewAIRequest()) -> CrewAIRe
         CrewAIResponse: The result from the agent execution
     """
     try:
+        # Imported on first use; crewai is the slowest import in the app
+        from crewai import Agent, Crew, Task
+        from app.core.metrics import instrument_llm_calls
+
+        instrument_llm_calls()
+
         agent = Agent(
             role=request.role,
             goal=request.goal,
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from app.api.v1.schemas.content.content_schemas import (
     ContentCreationRequest,
     ContentCreationResponse,
     ContentIdea
 )
-from app.agents.content_crew.content_creation_crew import ContentCreationCrew
-from app.tools.content_tools.trend_tools import ContentTrendTools
+from app.core import timing
+from app.core.dependencies import get_current_active_user
+from app.core.drain import long_job
+from app.core.responses import ModelResponse
 from typing import Dict, List
 import time
 
@@ -17,6 +19,8 @@ router = APIRouter()
     description="Process content ideas through AI crew for trend analysis and optimization",
     response_model=ContentCreationResponse,
     response_description="Optimized content with trend insights",
+    # Bearer token or service API key (e.g. N8N); checked before the job is counted
+    dependencies=[Depends(get_current_active_user), Depends(long_job("content"))],
 )
 async def create_content(request: ContentCreationRequest) -> ContentCreationResponse:
     """
@@ -33,26 +37,36 @@ async def create_content(request: ContentCreationRequest) -> ContentCreationResp
     Returns:
         ContentCreationResponse: Results of content processing with optimization insights
     """
+    timing.mark("validate")
     start_time = time.time()
     errors = []
     processed_ideas = []
 
     try:
-        # Initialize the content crew
-        crew = ContentCreationCrew()
+        # Imported on first use so crewai stays out of application startup
+        with timing.phase("crew_init"):
+            from app.agents.content_crew.content_creation_crew import ContentCreationCrew
+
+            # Initialize the content crew
+            crew = ContentCreationCrew()
+
+        # Gather trend searches for all ideas in one concurrent batch
+        idea_dicts = [idea.model_dump() for idea in request.content_ideas]
+        with timing.phase("trends"):
+            trend_data = crew.prefetch_trend_data(idea_dicts)
+        with timing.phase("competitor_pages"):
+            crew.prefetch_competitor_pages(idea_dicts)
 
         # Process each content idea
-        for idea in request.content_ideas:
+        for idea, idea_dict, idea_trend_data in zip(request.content_ideas, idea_dicts, trend_data):
             try:
-                # Convert Pydantic model to dict
-                idea_dict = idea.model_dump()
-
                 # Add Google Sheet context if available
                 if request.google_sheet_row:
                     idea_dict['sheet_context'] = request.google_sheet_row
 
                 # Process through crew
-                result = crew.process_content_idea(idea_dict)
+                with timing.phase("crew"):
+                    result = crew.process_content_idea(idea_dict, idea_trend_data)
                 processed_ideas.append(result)
 
             except Exception as e:
@@ -62,12 +76,14 @@ async def create_content(request: ContentCreationRequest) -> ContentCreationResp
 
         processing_time = time.time() - start_time
 
-        return ContentCreationResponse(
-            status="success" if not errors else "partial_success",
-            processed_ideas=processed_ideas,
-            processing_time=processing_time,
-            errors=errors
-        )
+        # Validated once here and serialized once by ModelResponse
+        with timing.phase("serialize"):
+            return ModelResponse(ContentCreationResponse(
+                status="success" if not errors else "partial_success",
+                processed_ideas=processed_ideas,
+                processing_time=processing_time,
+                errors=errors
+            ))
 
     except Exception as e:
         raise HTTPException(
@@ -89,11 +105,16 @@ async def process_content_background(task_id: str, request: ContentCreationReque
         task_status[task_id]["status"] = "processing"
 
         # Initialize crew
+        from app.agents.content_crew.content_creation_crew import ContentCreationCrew
+
         crew = ContentCreationCrew()
         processed_ideas = []
         errors = []
 
         total_ideas = len(request.content_ideas)
+        idea_dicts = [idea.model_dump() for idea in request.content_ideas]
+        trend_data = crew.prefetch_trend_data(idea_dicts)
+        crew.prefetch_competitor_pages(idea_dicts)
 
         for idx, idea in enumerate(request.content_ideas):
             try:
@@ -102,11 +123,11 @@ async def process_content_background(task_id: str, request: ContentCreationReque
                 task_status[task_id]["progress"] = progress
 
                 # Process idea
-                idea_dict = idea.model_dump()
+                idea_dict = idea_dicts[idx]
                 if request.google_sheet_row:
                     idea_dict['sheet_context'] = request.google_sheet_row
 
-                result = crew.process_content_idea(idea_dict)
+                result = crew.process_content_idea(idea_dict, trend_data[idx])
                 processed_ideas.append(result)
 
             except Exception as e:
@@ -143,6 +164,9 @@ async def content_service_health() -> Dict:
     """
     try:
         # Test basic functionality
+        from app.agents.content_crew.content_creation_crew import ContentCreationCrew
+        from app.tools.content_tools.trend_tools import ContentTrendTools
+
         tools = ContentTrendTools()
         crew = ContentCreationCrew()
 
@@ -1,10 +1,12 @@
 """Gemini TTS Podcast API endpoint."""
 
 import logging
-from fastapi import APIRouter, HTTPException, Response, Header
+from fastapi import APIRouter, Depends, HTTPException, Response, Header
 from pydantic import BaseModel, Field
 from typing import Annotated
-from tests.utils.gemini.gemini_tts_utils import create_gemini_client_with_key, generate_podcast_audio_binary
+from app.core import timing
+from app.core.drain import long_job
+from app.core.metrics import upstream_timer
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -39,8 +41,10 @@ Speaker 2: And I'm Kevin, delighted to join you. Let's dive into the conscious c
         400: {"description": "Invalid input text format"},
         401: {"description": "Missing or invalid API key in X-API-Key header"},
         500: {"description": "Internal server error"},
-        502: {"description": "Gemini API error"}
-    }
+        502: {"description": "Gemini API error"},
+        503: {"description": "Server is draining for shutdown"}
+    },
+    dependencies=[Depends(long_job("podcast"))],
 )
 async def generate_podcast(
     request: PodcastRequest,
@@ -62,6 +66,8 @@ async def generate_podcast(
     Raises:
         HTTPException: For various error conditions (400, 401, 500, 502)
     """
+    timing.mark("validate")
+
     # Validate API key
     if not x_api_key or not x_api_key.strip():
         logger.error("No API key provided in X-API-Key header")
@@ -81,14 +87,19 @@ async def generate_podcast(
         )
 
     try:
+        # Imported on first use so google.genai stays out of application startup
+        from tests.utils.gemini.gemini_tts_utils import create_gemini_client_with_key, generate_podcast_audio_binary
+
         # Create Gemini client with user's API key
         logger.info("Creating Gemini client with user-provided API key...")
-        client = create_gemini_client_with_key(api_key)
+        with timing.phase("client"):
+            client = create_gemini_client_with_key(api_key)
         logger.info("Gemini client created successfully")
 
         # Generate audio as binary data
         logger.info(f"Generating audio for text of length: {len(request.text)}")
-        audio_data = generate_podcast_audio_binary(client, request.text)
+        with upstream_timer("gemini"):
+            audio_data = generate_podcast_audio_binary(client, request.text)
         logger.info(f"Audio generation successful, size: {len(audio_data)} bytes")
 
         # Return binary response with appropriate headers
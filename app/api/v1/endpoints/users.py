@@ -1,8 +1,9 @@
-from typing import Annotated
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Response, status
 
 from app.core.dependencies import get_current_active_user
+from app.core.etag import etag_matches, weak_etag
 from app.models.user import User
 
 router = APIRouter()
@@ -10,9 +11,18 @@ router = APIRouter()
 
 @router.get("/users/me/", response_model=User)
 async def read_users_me(
-    current_user: Annotated[User, Depends(get_current_active_user)]
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    response: Response,
+    if_none_match: Annotated[Optional[str], Header()] = None,
 ):
     """
     Fetch the current logged in user.
+
+    Responses carry a weak ETag from the user's version counter; a matching
+    If-None-Match returns 304 without serializing the user.
     """
+    etag = weak_etag(current_user.username, getattr(current_user, "version", 0))
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return current_user
@@ -0,0 +1,85 @@
+"""
+Machine API keys for service clients such as N8N.
+
+Keys are never stored. The server keeps HMAC-SHA256 digests of them (keyed
+with a server secret) mapped to the username they act as, so verifying a key
+is one HMAC plus one dict lookup instead of a bcrypt round.
+
+To provision a key:
+
+    $ python -m app.core.api_keys n8n
+
+then add the printed digest to `service_api_keys` and hand the key to the client,
+which sends it in the `X-Service-Key` header.
+"""
+
+import hashlib
+import hmac
+import secrets
+import sys
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.security import SECRET_KEY
+
+API_KEY_HEADER = "X-Service-Key"
+
+
+def _secret() -> bytes:
+    return (settings.api_key_secret or SECRET_KEY).encode("utf-8")
+
+
+def hash_api_key(api_key: str, secret: Optional[bytes] = None) -> str:
+    """Return the hex HMAC-SHA256 digest stored for an API key."""
+    return hmac.new(secret or _secret(), api_key.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def generate_api_key() -> str:
+    return secrets.token_urlsafe(32)
+
+
+class ApiKeyStore:
+    """Hash index from API key digest to the username the key acts as."""
+
+    def __init__(self, digests: Optional[Dict[str, str]] = None, secret: Optional[bytes] = None):
+        self._secret = secret
+        self._records: Dict[str, Tuple[str, str]] = {}
+        for digest, username in (digests or {}).items():
+            self.add(digest, username)
+
+    def add(self, digest: str, username: str) -> None:
+        self._records[digest.lower()] = (digest.lower(), username)
+
+    def revoke(self, digest: str) -> None:
+        self._records.pop(digest.lower(), None)
+
+    def verify(self, api_key: str) -> Optional[str]:
+        """
+        Resolve an API key to its username.
+
+        The digest is keyed with the server secret, so the hash-index lookup
+        leaks nothing an attacker can steer; the final comparison is constant time.
+
+        Args:
+            api_key: The key presented by the client
+
+        Returns:
+            The username, or None if the key is unknown
+        """
+        digest = hash_api_key(api_key, self._secret)
+        record = self._records.get(digest)
+        if record is None or not hmac.compare_digest(record[0], digest):
+            return None
+        return record[1]
+
+
+api_key_store = ApiKeyStore(settings.service_api_keys)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python -m app.core.api_keys <username>")
+        sys.exit(1)
+    key = generate_api_key()
+    print(f"API key (give to the client): {key}")
+    print(f"Digest (add to service_api_keys): {hash_api_key(key)} -> {sys.argv[1]}")
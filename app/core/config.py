@@ -1,8 +1,13 @@
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, List, Optional
+import importlib.util
 import os
 from pathlib import Path
 
+# Supported password hash schemes; app/core/security.py builds its CryptContext from these
+PASSWORD_SCHEMES = ("bcrypt", "argon2")
+
 class Settings(BaseSettings):
     """Application settings using Pydantic."""
     
@@ -14,6 +19,123 @@ class Settings(BaseSettings):
     base_dir: Path = Path(__file__).resolve().parent.parent.parent
     images_dir: Path = base_dir / "output" / "images"
     audio_dir: Path = base_dir / "output" / "audio"
+
+    # User store: "memory" (per process) or "sqlite" (shared across workers)
+    user_store_backend: str = "memory"
+    user_db_path: Path = base_dir / "output" / "users.sqlite3"
+    user_db_pool_size: int = 4
+
+    # Seed users with precomputed password hashes
+    seed_users_path: Path = base_dir / "app" / "db" / "seed_users.json"
+
+    # Password hashing pool: bcrypt runs here instead of on the event loop
+    password_hash_workers: int = 2
+    password_hash_max_queue: int = 16
+
+    # Password hashing policy; outdated hashes are upgraded on the next login.
+    # "argon2" means argon2id and requires the argon2-cffi package.
+    password_hash_scheme: str = "bcrypt"
+    bcrypt_rounds: int = 12
+    argon2_time_cost: int = 3
+    argon2_memory_cost: int = 65536  # KiB
+    argon2_parallelism: int = 4
+
+    @field_validator("password_hash_scheme")
+    @classmethod
+    def _check_password_hash_scheme(cls, scheme: str) -> str:
+        # Fail at startup rather than on the first login
+        if scheme not in PASSWORD_SCHEMES:
+            raise ValueError(f"Unknown password hash scheme: {scheme}")
+        if scheme == "argon2" and importlib.util.find_spec("argon2") is None:
+            raise ValueError('password_hash_scheme "argon2" requires the argon2-cffi package')
+        return scheme
+
+    # Service API keys: HMAC-SHA256 digest -> username (see app/core/api_keys.py)
+    service_api_keys: Dict[str, str] = {}
+    api_key_secret: str = ""
+
+    # Decoded bearer tokens kept in memory (0 disables the cache). With the sqlite
+    # user store, other workers see a disabled or changed user within the shared TTL.
+    token_cache_max_size: int = 10000
+    token_cache_shared_ttl_seconds: float = 5.0
+
+    # Token lifetimes and revocation (see app/core/revocation.py)
+    access_token_expire_minutes: int = 15
+    refresh_token_expire_days: int = 7
+    revoked_tokens_path: Path = base_dir / "output" / "revoked_tokens.jsonl"
+    revocation_filter_capacity: int = 100000
+    revocation_filter_error_rate: float = 0.001
+    revocation_reload_seconds: float = 5.0
+
+    # Reverse proxies in front of the app (e.g. 1 behind Railway or Cloud Run).
+    # The client IP is read from X-Forwarded-For that many entries from the right;
+    # leave at 0 when clients connect directly, or they can forge the header.
+    trusted_proxy_hops: int = 0
+
+    # Login attempts allowed per username and per client IP (token buckets)
+    login_rate_limit_enabled: bool = True
+    login_rate_per_minute_per_username: float = 10.0
+    login_burst_per_username: int = 10
+    login_rate_per_minute_per_ip: float = 60.0
+    login_burst_per_ip: int = 30
+
+    # Response compression (see app/middleware/compression.py).
+    # Route levels map a path prefix to a level for that prefix; 0 disables it.
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024
+    compression_level: int = 6
+    compression_route_levels: Dict[str, int] = {}
+
+    # Prometheus metrics middleware and the /metrics endpoint
+    metrics_enabled: bool = True
+
+    # Server-Timing header; requests slower than the threshold are logged at INFO
+    server_timing_enabled: bool = True
+    request_timing_log_threshold_ms: float = 1000.0
+
+    # Concurrency limits per route class (see app/middleware/concurrency.py).
+    # Path prefix -> class; the longest prefix wins and unmatched paths are unlimited.
+    concurrency_limits_enabled: bool = True
+    concurrency_route_classes: Dict[str, str] = {
+        "/api/v1/content/create": "crew",
+        "/api/v1/crewai": "crew",
+        "/api/v1/gemini": "tts",
+        "/api/v1/token": "auth",
+    }
+    # Class -> max_concurrency, max_queue, queue_timeout (s), status_code, retry_after (s)
+    concurrency_class_limits: Dict[str, Dict[str, float]] = {
+        "crew": {"max_concurrency": 4, "max_queue": 8, "queue_timeout": 30, "status_code": 503, "retry_after": 30},
+        "tts": {"max_concurrency": 4, "max_queue": 8, "queue_timeout": 30, "status_code": 503, "retry_after": 15},
+        "auth": {"max_concurrency": 8, "max_queue": 32, "queue_timeout": 5, "status_code": 429, "retry_after": 2},
+    }
+    concurrency_exempt_paths: List[str] = ["/health", "/ready", "/metrics", "/api/v1/content/health"]
+
+    # Shutdown waits this long for in-flight podcast and crew requests (see app/core/drain.py)
+    drain_timeout_seconds: float = 300.0
+    drain_retry_after_seconds: int = 5
+
+    # Event-loop lag monitor: stalls longer than the threshold are logged with the blocking stack
+    loop_monitor_enabled: bool = True
+    loop_monitor_interval_seconds: float = 0.1
+    loop_lag_threshold_seconds: float = 0.25
+
+    # Local trend corpus (JSONL) used before and instead of remote search; a hit
+    # replaces the remote search only when it is recent and covers most query terms
+    trend_corpus_path: Path = base_dir / "data" / "trend_corpus.jsonl"
+    trend_corpus_min_score: float = 2.0
+    trend_corpus_min_coverage: float = 0.5
+    trend_corpus_max_age_days: float = 7.0
+    trend_search_max_workers: int = 8
+
+    # Competitor page change detection
+    competitor_fingerprints_path: Path = base_dir / "output" / "competitor_fingerprints.json"
+    simhash_max_distance: int = 3
+
+    # Precomputed trend reports: industry -> keyword set, refreshed in-process
+    trend_report_targets: Dict[str, List[str]] = {}
+    trend_report_refresh_seconds: int = 3600
+    trend_report_max_age_seconds: int = 3 * 3600
+    trend_reports_dir: Path = base_dir / "output" / "trend_reports"
     
     class Config:
         env_file = ".env"
@@ -1,21 +1,51 @@
-from typing import Annotated
+from typing import Annotated, Optional
 from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
+from fastapi.security import APIKeyHeader, OAuth2PasswordBearer
 from jose import JWTError, jwt
 
+from app.core.api_keys import API_KEY_HEADER, api_key_store
+from app.core.revocation import revocation_list
 from app.core.security import ALGORITHM, SECRET_KEY
+from app.core.token_cache import token_cache
 from app.models.user import TokenData, User
-from app.db.database import fake_users_db
+from app.db.database import users_db
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+# Either scheme may authenticate a request, so neither rejects on its own
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
+api_key_scheme = APIKeyHeader(name=API_KEY_HEADER, auto_error=False)
 
 
-async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]):
+async def get_current_user(
+    token: Annotated[Optional[str], Depends(oauth2_scheme)],
+    api_key: Annotated[Optional[str], Depends(api_key_scheme)],
+):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    if api_key:
+        # Service clients: one HMAC and a hash lookup, no JWT or bcrypt
+        username = api_key_store.verify(api_key)
+        user = await users_db.aget_user(username) if username else None
+        if user is None:
+            raise credentials_exception
+        return user
+
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    cached = token_cache.lookup(token)
+    if cached is not None:
+        cached_user, jti = cached
+        # Revocation is still checked on a cache hit; usually just a Bloom filter probe
+        if jti and await revocation_list.ais_revoked(jti):
+            raise credentials_exception
+        return cached_user
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
@@ -24,9 +54,17 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]):
         token_data = TokenData(username=username)
     except JWTError:
         raise credentials_exception
-    user = fake_users_db.get_user(username=token_data.username)
+    # Refresh tokens may only be exchanged at /token/refresh
+    if payload.get("type", "access") != "access":
+        raise credentials_exception
+    jti = payload.get("jti")
+    if jti and await revocation_list.ais_revoked(jti):
+        raise credentials_exception
+    user = await users_db.aget_user(token_data.username)
     if user is None:
         raise credentials_exception
+    if "exp" in payload:
+        token_cache.put(token, user, float(payload["exp"]), jti)
     return user
 
 
@@ -0,0 +1,153 @@
+"""
+Graceful draining of long-running requests.
+
+Podcast and crew requests can run for minutes, so on shutdown the worker
+first drains: from the moment SIGTERM arrives (or the lifespan starts to shut
+down), /ready reports "draining", new long jobs are refused with 503 and
+Retry-After so a load balancer or client sends them to another instance,
+and shutdown waits up to `drain_timeout_seconds` for the jobs already
+running to finish.
+
+Long-running routes opt in with a dependency:
+
+    @router.post("/podcast", dependencies=[Depends(long_job("podcast"))])
+"""
+
+import asyncio
+import logging
+import signal
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DRAIN_SIGNALS = (signal.SIGTERM, signal.SIGINT)
+
+
+class DrainTracker:
+    """
+    Counts in-flight long jobs per kind and refuses new ones once draining.
+
+    Counters are guarded by a lock rather than tied to one event loop, so
+    jobs may start on any loop or thread.
+    """
+
+    def __init__(self, poll_interval: float = 0.1):
+        self.poll_interval = poll_interval
+        self.draining = False
+        self._in_flight: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def start_draining(self) -> None:
+        if not self.draining:
+            self.draining = True
+            logger.info("Draining: refusing new long jobs, %d in flight", self.total_in_flight())
+
+    def begin(self, kind: str) -> None:
+        """Register a new job, or raise 503 if the worker is draining."""
+        with self._lock:
+            if self.draining:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Server is shutting down, retry on another instance",
+                    headers={"Retry-After": str(settings.drain_retry_after_seconds)},
+                )
+            self._in_flight[kind] = self._in_flight.get(kind, 0) + 1
+
+    def end(self, kind: str) -> None:
+        with self._lock:
+            remaining = self._in_flight.get(kind, 0) - 1
+            if remaining > 0:
+                self._in_flight[kind] = remaining
+            else:
+                self._in_flight.pop(kind, None)
+
+    def in_flight(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._in_flight)
+
+    def total_in_flight(self) -> int:
+        with self._lock:
+            return sum(self._in_flight.values())
+
+    async def wait_idle(self, timeout: float) -> bool:
+        """
+        Wait for every in-flight job to finish.
+
+        Returns:
+            bool: True if all jobs finished before the timeout
+        """
+        deadline = time.monotonic() + timeout
+        while self.total_in_flight():
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(self.poll_interval)
+        return True
+
+    def reset(self) -> None:
+        with self._lock:
+            self.draining = False
+            self._in_flight.clear()
+
+
+drain_tracker = DrainTracker()
+
+
+def long_job(kind: str):
+    """
+    Build a route dependency that tracks the request as a long job of `kind`.
+
+    Args:
+        kind: Label for the job, e.g. "podcast" or "content"
+    """
+    async def track_long_job():
+        drain_tracker.begin(kind)
+        try:
+            yield
+        finally:
+            drain_tracker.end(kind)
+
+    return track_long_job
+
+
+def install_drain_signal_handlers() -> Optional[Callable[[], None]]:
+    """
+    Start draining as soon as SIGTERM/SIGINT arrives, then run the previous handler.
+
+    The server's own handler still stops the process as before; chaining in
+    front of it means requests still arriving on open connections already
+    see the worker as draining.
+    Signals can only be handled on the main thread, so elsewhere (e.g. under
+    TestClient) nothing is installed.
+
+    Returns:
+        A function restoring the previous handlers, or None if none were installed
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return None
+
+    previous = {}
+
+    def handler(signum, frame):
+        drain_tracker.start_draining()
+        original = previous.get(signum)
+        if callable(original):
+            original(signum, frame)
+        else:
+            # SIG_DFL / SIG_IGN: put it back and let the signal take its usual effect
+            signal.signal(signum, signal.SIG_DFL if original is None else original)
+            signal.raise_signal(signum)
+
+    for sig in DRAIN_SIGNALS:
+        previous[sig] = signal.signal(sig, handler)
+
+    def restore() -> None:
+        for sig, original in previous.items():
+            signal.signal(sig, signal.SIG_DFL if original is None else original)
+
+    return restore
@@ -0,0 +1,27 @@
+import hashlib
+from typing import Optional
+
+
+def weak_etag(*parts) -> str:
+    """Build a weak ETag from values that change whenever the representation does."""
+    digest = hashlib.blake2b(":".join(str(part) for part in parts).encode("utf-8"), digest_size=8)
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag using weak comparison.
+
+    Args:
+        if_none_match: Raw header value, possibly a comma-separated list or "*"
+        etag: The current ETag of the resource
+
+    Returns:
+        bool: True if the client's cached copy is still current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
@@ -0,0 +1,111 @@
+"""
+Event-loop lag monitor.
+
+Blocking work on the event loop (a synchronous SDK call or bcrypt inside an
+async handler) stalls every request on the worker. This module measures it
+continuously in two parts:
+
+* a heartbeat task on the loop that sleeps for `interval` seconds and
+  records how late it wakes up (`event_loop_lag_seconds`);
+* a watchdog thread that notices when the heartbeat is overdue by more than
+  `threshold` seconds, i.e. the loop is blocked *right now*, and captures the
+  loop thread's stack with sys._current_frames(). The stack points at the
+  blocking call; it is logged once per stall and counted in
+  `event_loop_blocked_total`.
+
+Started and stopped by the application lifespan.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import List, Optional
+
+from app.core.config import settings
+from app.core.metrics import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+# Seconds; finer at the low end, where a healthy loop sits
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+event_loop_lag_seconds = Histogram(
+    "event_loop_lag_seconds", "How late the event loop heartbeat woke up.", buckets=LAG_BUCKETS
+)
+event_loop_blocked_total = Counter(
+    "event_loop_blocked_total", "Stalls of the event loop longer than the lag threshold."
+)
+
+
+class LoopLagMonitor:
+    def __init__(self, interval: float = 0.1, threshold: float = 0.25):
+        self.interval = interval
+        self.threshold = threshold
+        self.stalls: List[str] = []  # Recent stall stacks, newest last
+        self.max_stalls = 20
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        """Start monitoring the running loop; call from a coroutine on that loop."""
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._heartbeat_task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat_task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=self.interval * 2)
+            self._watchdog = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._last_beat = now
+            event_loop_lag_seconds.observe((), max(now - start - self.interval, 0.0))
+
+    def _watch(self) -> None:
+        # Check a few times per interval so short stalls just over the threshold are caught
+        poll = min(self.interval, self.threshold) / 4
+        reported_beat = None
+        while not self._stop.wait(poll):
+            last_beat = self._last_beat
+            overdue = time.monotonic() - last_beat - self.interval
+            if overdue > self.threshold and reported_beat != last_beat:
+                # One report per stall: the next report needs a fresh heartbeat
+                reported_beat = last_beat
+                self._report(overdue)
+
+    def _report(self, overdue: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else "<loop thread not found>\n"
+        event_loop_blocked_total.inc()
+        self.stalls.append(stack)
+        del self.stalls[:-self.max_stalls]
+        logger.warning("Event loop blocked for over %.0f ms, loop thread stack:\n%s", overdue * 1000, stack)
+
+
+def create_loop_monitor() -> LoopLagMonitor:
+    """Build a monitor from `settings.loop_monitor_interval_seconds` and `loop_lag_threshold_seconds`."""
+    return LoopLagMonitor(
+        interval=settings.loop_monitor_interval_seconds,
+        threshold=settings.loop_lag_threshold_seconds,
+    )
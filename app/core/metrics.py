@@ -0,0 +1,276 @@
+"""
+In-process metrics exposed in the Prometheus text format.
+
+A deliberately small registry: counters, gauges and fixed-bucket histograms
+keyed by a tuple of label values. `metric.labels(*values)` returns the child
+for one label set; hot paths bind it once and then record with a couple of
+additions under the child's own lock, with no tuple building or dict lookup
+per call. Each worker process keeps its own registry; scrape every worker or
+aggregate at the scraper.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Generic, Iterator, List, Sequence, Tuple, TypeVar
+
+from app.core import timing
+
+LabelValues = Tuple[str, ...]
+Child = TypeVar("Child")
+
+# Seconds; covers sub-millisecond cached reads up to multi-minute crew runs
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+# Bytes
+SIZE_BUCKETS = (100, 1000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+_registry: List["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(Generic[Child]):
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[LabelValues, Child] = {}
+        _registry.append(self)
+
+    def _new_child(self) -> Child:
+        raise NotImplementedError
+
+    def labels(self, *values: str) -> Child:
+        """Return the child for these label values, created on first use."""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._children[values] = self._new_child()
+        return child
+
+    def _labels(self, values: LabelValues, extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def _samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self.value = value
+
+
+class Counter(_Metric[_CounterChild]):
+    type_name = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, labels: LabelValues = (), amount: float = 1.0) -> None:
+        self.labels(*labels).inc(amount)
+
+    def value(self, labels: LabelValues = ()) -> float:
+        child = self._children.get(labels)
+        return child.value if child else 0.0
+
+    def _samples(self) -> Iterator[str]:
+        for labels, child in list(self._children.items()):
+            yield f"{self.name}{self._labels(labels)} {_format_value(child.value)}"
+
+
+class Gauge(Counter):
+    type_name = "gauge"
+
+    def dec(self, labels: LabelValues = (), amount: float = 1.0) -> None:
+        self.labels(*labels).dec(amount)
+
+    def set(self, labels: LabelValues, value: float) -> None:
+        self.labels(*labels).set(value)
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "count", "_lock")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+
+class Histogram(_Metric[_HistogramChild]):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, labels: LabelValues, value: float) -> None:
+        self.labels(*labels).observe(value)
+
+    def count(self, labels: LabelValues = ()) -> int:
+        child = self._children.get(labels)
+        return child.count if child else 0
+
+    def _samples(self) -> Iterator[str]:
+        bounds = self.buckets + (float("inf"),)
+        for labels, child in list(self._children.items()):
+            with child._lock:
+                counts, total, count = list(child.counts), child.sum, child.count
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{self._labels(labels, le)} {cumulative}"
+            yield f"{self.name}_sum{self._labels(labels)} {_format_value(total)}"
+            yield f"{self.name}_count{self._labels(labels)} {count}"
+
+
+def render_metrics() -> str:
+    """Render every registered metric in the Prometheus text exposition format."""
+    return "\n".join(metric.render() for metric in _registry) + "\n"
+
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+http_requests_total = Counter(
+    "http_requests_total", "HTTP requests by method, route template and status.", ("method", "route", "status")
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency in seconds.", ("method", "route")
+)
+http_requests_in_progress = Gauge(
+    "http_requests_in_progress", "HTTP requests currently being served.", ("method", "route")
+)
+http_response_size_bytes = Histogram(
+    "http_response_size_bytes", "HTTP response body size in bytes.", ("method", "route"), buckets=SIZE_BUCKETS
+)
+upstream_request_duration_seconds = Histogram(
+    "upstream_request_duration_seconds",
+    "Latency of calls to upstream services (gemini, openai, elevenlabs, serper).",
+    ("service", "outcome"),
+)
+
+
+@contextmanager
+def upstream_timer(service: str) -> Iterator[None]:
+    """
+    Time a call to an upstream service.
+
+    The duration also appears as a phase named after the service in the
+    request's Server-Timing header.
+
+    Example:
+        with upstream_timer("serper"):
+            result = search_tool.run(query)
+    """
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        duration = time.perf_counter() - start
+        upstream_request_duration_seconds.observe((service, outcome), duration)
+        timing.record(service, duration)
+
+
+# Key in litellm's per-call kwargs holding the timer of the request that made the call
+_REQUEST_TIMER_KEY = "request_timer"
+
+
+def _llm_started(kwargs) -> None:
+    # Runs in the calling thread, where the request context is still current;
+    # the success and failure callbacks run later on litellm's own thread pool
+    timer = timing.current_timer()
+    if timer is not None:
+        kwargs[_REQUEST_TIMER_KEY] = timer
+
+
+def _record_llm_call(kwargs, response_obj, start_time, end_time, outcome: str) -> None:
+    service = kwargs.get("custom_llm_provider") or "openai"
+    try:
+        duration = (end_time - start_time).total_seconds()
+    except (TypeError, AttributeError):
+        return
+    upstream_request_duration_seconds.observe((service, outcome), duration)
+    timing.record(service, duration, timer=kwargs.get(_REQUEST_TIMER_KEY))
+
+
+def _llm_success(kwargs, response_obj, start_time, end_time) -> None:
+    _record_llm_call(kwargs, response_obj, start_time, end_time, "success")
+
+
+def _llm_failure(kwargs, response_obj, start_time, end_time) -> None:
+    _record_llm_call(kwargs, response_obj, start_time, end_time, "error")
+
+
+def instrument_llm_calls() -> None:
+    """
+    Record every LLM call CrewAI makes (through litellm) as an upstream call,
+    both in the histogram and in the calling request's Server-Timing.
+
+    Call it where crewai is already imported; it imports litellm.
+    """
+    import litellm
+
+    if _llm_started not in litellm.input_callback:
+        litellm.input_callback.append(_llm_started)
+    if _llm_success not in litellm.success_callback:
+        litellm.success_callback.append(_llm_success)
+    if _llm_failure not in litellm.failure_callback:
+        litellm.failure_callback.append(_llm_failure)
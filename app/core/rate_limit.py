@@ -0,0 +1,143 @@
+import heapq
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import Counter
+
+login_attempts_rejected_total = Counter(
+    "login_attempts_rejected_total", "Login attempts rejected by the rate limiter.", ("limit",)
+)
+
+
+class TokenBucketLimiter:
+    """
+    In-process token-bucket rate limiter keyed by an arbitrary string.
+
+    Buckets are spread over independently locked shards so concurrent
+    requests for different keys rarely contend on the same lock.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int, shards: int = 16, max_keys_per_shard: int = 10000):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.burst = burst
+        self.max_keys_per_shard = max_keys_per_shard
+        self._shards: List[Tuple[threading.Lock, Dict[str, List[float]]]] = [
+            (threading.Lock(), {}) for _ in range(shards)
+        ]
+        self._rejected = [0] * shards
+
+    @property
+    def rejected(self) -> int:
+        """Total number of rejected attempts since start (or the last reset)."""
+        return sum(self._rejected)
+
+    def _prune(self, buckets: Dict[str, List[float]], now: float) -> None:
+        # Buckets that have refilled completely carry no state worth keeping
+        full = [
+            key for key, (tokens, updated) in buckets.items()
+            if tokens + (now - updated) * self.rate_per_second >= self.burst
+        ]
+        for key in full:
+            del buckets[key]
+
+        # A flood of distinct keys leaves nothing full: evict the least recently
+        # used tenth so the shard stays bounded and pruning is not rerun per key
+        excess = len(buckets) - self.max_keys_per_shard + max(1, self.max_keys_per_shard // 10)
+        if excess > 0:
+            stale = heapq.nsmallest(excess, buckets.items(), key=lambda item: item[1][1])
+            for key, _ in stale:
+                del buckets[key]
+
+    def acquire(self, key: str) -> Optional[float]:
+        """
+        Take one token for `key`.
+
+        Returns:
+            None if allowed, otherwise the seconds until a token is available
+        """
+        index = hash(key) % len(self._shards)
+        lock, buckets = self._shards[index]
+        now = time.monotonic()
+        with lock:
+            bucket = buckets.get(key)
+            if bucket is None:
+                if len(buckets) >= self.max_keys_per_shard:
+                    self._prune(buckets, now)
+                bucket = buckets[key] = [float(self.burst), now]
+
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate_per_second)
+            bucket[1] = now
+            if tokens >= 1:
+                bucket[0] = tokens - 1
+                return None
+
+            bucket[0] = tokens
+            self._rejected[index] += 1
+            if self.rate_per_second <= 0:
+                return float("inf")
+            return (1 - tokens) / self.rate_per_second
+
+    def reset(self) -> None:
+        for index, (lock, buckets) in enumerate(self._shards):
+            with lock:
+                buckets.clear()
+                self._rejected[index] = 0
+
+
+class LoginRateLimiter:
+    """Per-username and per-client-IP limits applied before any password hashing."""
+
+    def __init__(self):
+        self.by_username = TokenBucketLimiter(
+            settings.login_rate_per_minute_per_username, settings.login_burst_per_username
+        )
+        self.by_ip = TokenBucketLimiter(
+            settings.login_rate_per_minute_per_ip, settings.login_burst_per_ip
+        )
+
+    def check(self, username: str, client_ip: str) -> Optional[float]:
+        """Return None if the attempt may proceed, else a Retry-After in seconds."""
+        if not settings.login_rate_limit_enabled:
+            return None
+        retry_after = self.by_ip.acquire(client_ip)
+        if retry_after is not None:
+            login_attempts_rejected_total.inc(("ip",))
+            return retry_after
+        retry_after = self.by_username.acquire(username.lower())
+        if retry_after is not None:
+            login_attempts_rejected_total.inc(("username",))
+        return retry_after
+
+    def counters(self) -> Dict[str, int]:
+        return {"username": self.by_username.rejected, "ip": self.by_ip.rejected}
+
+    def reset(self) -> None:
+        self.by_username.reset()
+        self.by_ip.reset()
+
+
+def client_ip(request, trusted_proxy_hops: Optional[int] = None) -> str:
+    """
+    The address of the client, seen through `trusted_proxy_hops` reverse proxies.
+
+    Each proxy appends the address it received the request from to
+    X-Forwarded-For, so the entry `trusted_proxy_hops` from the right was
+    written by our outermost proxy and cannot be forged by the client.
+    With no trusted proxies the socket peer address is used.
+    """
+    hops = settings.trusted_proxy_hops if trusted_proxy_hops is None else trusted_proxy_hops
+    if hops > 0:
+        forwarded = [
+            entry.strip()
+            for header in request.headers.getlist("x-forwarded-for")
+            for entry in header.split(",")
+            if entry.strip()
+        ]
+        if len(forwarded) >= hops:
+            return forwarded[-hops]
+    return request.client.host if request.client else "unknown"
+
+
+login_rate_limiter = LoginRateLimiter()
@@ -0,0 +1,24 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+class ModelResponse(ORJSONResponse):
+    """
+    JSON response for an already validated pydantic model.
+
+    Returning a model through `response_model` makes FastAPI dump it to a
+    dict, validate that dict into a new model and serialize it again. Handlers
+    that build their response model themselves can return it wrapped in this
+    class instead: it is dumped once and encoded by orjson, which for large
+    string payloads is also faster than `model_dump_json`. Keep
+    `response_model` on the route for the OpenAPI schema; FastAPI skips it for
+    returned Response objects.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            content = content.model_dump(mode="json")
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,406 @@
+"""
+Revocation of access and refresh tokens by their `jti` claim.
+
+Revoked ids are appended to a JSONL file shared by all workers. Each process
+keeps only a Bloom filter of them in memory, so the common case, a token that
+was never revoked, is answered with a few bit lookups. A filter hit is
+confirmed against the file, which also rules out false positives.
+
+Refresh tokens are single use. `revoke_if_absent` claims a token id
+atomically, under an exclusive lock on the file, so two workers exchanging
+the same refresh token cannot both succeed. When the shared SQLite user
+store is configured, revocations live in a table of that database instead,
+behind the same Bloom filter, and the claim is an INSERT on the unique jti.
+
+The async variants keep file and database reads off the event loop.
+
+Entries outlive their token's expiry harmlessly. To drop them:
+
+    $ python -m app.core.revocation compact
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: the claim is only atomic within one process
+    fcntl = None
+
+from app.core.config import settings
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        # Double hashing: k positions from two halves of one digest
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class TokenRevocationList:
+    """
+    Persistent list of revoked token ids with an in-memory Bloom filter.
+
+    Other workers' revocations are picked up by re-reading the appended part
+    of the file at most every `reload_seconds`.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        capacity: int = 100000,
+        error_rate: float = 0.001,
+        reload_seconds: float = 5.0,
+    ):
+        self.path = Path(path)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.reload_seconds = reload_seconds
+        self._filter: Optional[BloomFilter] = None
+        self._count = 0
+        self._offset = 0
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _read_entries(self, offset: int = 0) -> Tuple[Dict[str, float], int]:
+        entries: Dict[str, float] = {}
+        if not self.path.exists():
+            return entries, 0
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Partially written by another worker; read it next time
+                offset += len(line)
+                try:
+                    record = json.loads(line)
+                    entries[record["jti"]] = float(record["exp"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+        return entries, offset
+
+    def _add_to_filter(self, jtis) -> None:
+        for jti in jtis:
+            self._filter.add(jti)
+            self._count += 1
+
+    def _load(self) -> None:
+        entries, offset = self._read_entries()
+        now = time.time()
+        live = [jti for jti, expires_at in entries.items() if expires_at > now]
+        self._filter = BloomFilter(max(self.capacity, 2 * len(live)), self.error_rate)
+        self._count = 0
+        self._add_to_filter(live)
+        self._offset = offset
+        self._checked_at = time.monotonic()
+
+    def _is_fresh(self) -> bool:
+        return self._filter is not None and time.monotonic() - self._checked_at < self.reload_seconds
+
+    def _refresh(self, force: bool = False) -> None:
+        # Called with the lock held
+        if self._filter is None:
+            self._load()
+            return
+        if not force and self._is_fresh():
+            return
+        self._checked_at = time.monotonic()
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+        if size < self._offset or self._count > 2 * self.capacity:
+            # Compacted by someone else, or the filter is past its sizing
+            self._load()
+        elif size > self._offset:
+            entries, self._offset = self._read_entries(self._offset)
+            self._add_to_filter(entries)
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        """
+        Revoke a token id until `expires_at` (a Unix timestamp).
+
+        The line is appended in a single write so concurrent workers never
+        interleave records.
+        """
+        line = json.dumps({"jti": jti, "exp": expires_at}) + "\n"
+        with self._lock:
+            self._refresh()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+            self._filter.add(jti)
+            self._count += 1
+
+    def revoke_if_absent(self, jti: str, expires_at: float) -> bool:
+        """
+        Revoke a token id unless it is revoked already.
+
+        The check and the append happen under an exclusive lock on the file,
+        so across all workers exactly one caller claims a given id.
+
+        Returns:
+            bool: True if this call revoked it, False if it was already revoked
+        """
+        line = json.dumps({"jti": jti, "exp": expires_at}) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                # Catch up with other workers now, not after the reload interval
+                self._refresh(force=True)
+                if jti in self._filter and self._confirm(jti):
+                    return False
+                f.write(line)
+                f.flush()
+            self._filter.add(jti)
+            self._count += 1
+            return True
+
+    def _confirm(self, jti: str) -> bool:
+        # Rare path: a revoked token or a filter false positive
+        entries, _ = self._read_entries()
+        expires_at = entries.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def is_revoked(self, jti: str) -> bool:
+        with self._lock:
+            self._refresh()
+            if jti not in self._filter:
+                return False
+        return self._confirm(jti)
+
+    async def ais_revoked(self, jti: str) -> bool:
+        # A fresh filter that rules the id out needs no I/O; answer on the loop
+        with self._lock:
+            if self._is_fresh() and jti not in self._filter:
+                return False
+        return await asyncio.to_thread(self.is_revoked, jti)
+
+    async def arevoke(self, jti: str, expires_at: float) -> None:
+        await asyncio.to_thread(self.revoke, jti, expires_at)
+
+    async def arevoke_if_absent(self, jti: str, expires_at: float) -> bool:
+        return await asyncio.to_thread(self.revoke_if_absent, jti, expires_at)
+
+    def compact(self) -> int:
+        """
+        Rewrite the file without expired entries.
+
+        Run it while no worker is revoking tokens; returns the number kept.
+        """
+        with self._lock:
+            entries, _ = self._read_entries()
+            now = time.time()
+            live = {jti: expires_at for jti, expires_at in entries.items() if expires_at > now}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for jti, expires_at in live.items():
+                    f.write(json.dumps({"jti": jti, "exp": expires_at}) + "\n")
+            os.replace(tmp_path, self.path)
+            self._load()
+            return len(live)
+
+
+REVOCATION_SCHEMA = """
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    jti TEXT NOT NULL UNIQUE,
+    expires_at REAL NOT NULL
+);
+"""
+INSERT_REVOCATION = "INSERT INTO revoked_tokens (jti, expires_at) VALUES (?, ?)"
+UPSERT_REVOCATION = """
+INSERT INTO revoked_tokens (jti, expires_at) VALUES (?, ?)
+ON CONFLICT (jti) DO UPDATE SET expires_at = MAX(expires_at, excluded.expires_at)
+"""
+SELECT_REVOCATION = "SELECT expires_at FROM revoked_tokens WHERE jti = ?"
+# AUTOINCREMENT ids never go backwards, even after deletes, so `id > ?` finds every new row
+SELECT_LIVE = "SELECT jti FROM revoked_tokens WHERE expires_at > ?"
+SELECT_NEWER = "SELECT id, jti FROM revoked_tokens WHERE id > ? ORDER BY id"
+SELECT_LAST_ID = "SELECT COALESCE(MAX(id), 0) FROM revoked_tokens"
+DELETE_EXPIRED = "DELETE FROM revoked_tokens WHERE expires_at <= ?"
+COUNT_REVOCATIONS = "SELECT COUNT(*) FROM revoked_tokens"
+
+
+class SQLiteRevocationList:
+    """
+    Revoked token ids in a table of the shared SQLite database, behind the
+    same in-memory Bloom filter as TokenRevocationList.
+
+    A token that was never revoked is answered from the filter with no query.
+    Rows inserted by other workers are read at most every `reload_seconds`
+    (only those with a higher id than the last one seen). `revoke_if_absent`
+    is an INSERT on the unique jti, so a claim never depends on the filter
+    being current.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        capacity: int = 100000,
+        error_rate: float = 0.001,
+        reload_seconds: float = 5.0,
+    ):
+        self.path = Path(path)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.reload_seconds = reload_seconds
+        self._connection: Optional[sqlite3.Connection] = None
+        self._filter: Optional[BloomFilter] = None
+        self._count = 0
+        self._last_id = 0
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Opened on first use, not at import time
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(REVOCATION_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def _is_fresh(self) -> bool:
+        return self._filter is not None and time.monotonic() - self._checked_at < self.reload_seconds
+
+    def _load(self) -> None:
+        connection = self._connect()
+        last_id = connection.execute(SELECT_LAST_ID).fetchone()[0]
+        live = [row[0] for row in connection.execute(SELECT_LIVE, (time.time(),))]
+        self._filter = BloomFilter(max(self.capacity, 2 * len(live)), self.error_rate)
+        self._count = 0
+        for jti in live:
+            self._add_to_filter(jti)
+        self._last_id = last_id
+        self._checked_at = time.monotonic()
+
+    def _add_to_filter(self, jti: str) -> None:
+        self._filter.add(jti)
+        self._count += 1
+
+    def _refresh(self) -> None:
+        # Called with the lock held
+        if self._filter is None or self._count > 2 * self.capacity:
+            self._load()
+            return
+        if self._is_fresh():
+            return
+        self._checked_at = time.monotonic()
+        for row_id, jti in self._connect().execute(SELECT_NEWER, (self._last_id,)):
+            self._add_to_filter(jti)
+            self._last_id = row_id
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        with self._lock:
+            self._refresh()
+            connection = self._connect()
+            with connection:
+                connection.execute(UPSERT_REVOCATION, (jti, expires_at))
+            self._add_to_filter(jti)
+
+    def revoke_if_absent(self, jti: str, expires_at: float) -> bool:
+        with self._lock:
+            self._refresh()
+            connection = self._connect()
+            try:
+                with connection:
+                    connection.execute(INSERT_REVOCATION, (jti, expires_at))
+            except sqlite3.IntegrityError:
+                return False
+            self._add_to_filter(jti)
+            return True
+
+    def is_revoked(self, jti: str) -> bool:
+        with self._lock:
+            self._refresh()
+            if jti not in self._filter:
+                return False
+            # Rare path: a revoked token or a filter false positive
+            row = self._connect().execute(SELECT_REVOCATION, (jti,)).fetchone()
+        return row is not None and row[0] > time.time()
+
+    def compact(self) -> int:
+        """Delete expired entries; returns the number kept."""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(DELETE_EXPIRED, (time.time(),))
+            self._load()
+            return connection.execute(COUNT_REVOCATIONS).fetchone()[0]
+
+    async def ais_revoked(self, jti: str) -> bool:
+        # A fresh filter that rules the id out needs no query; answer on the loop
+        with self._lock:
+            if self._is_fresh() and jti not in self._filter:
+                return False
+        return await asyncio.to_thread(self.is_revoked, jti)
+
+    async def arevoke(self, jti: str, expires_at: float) -> None:
+        await asyncio.to_thread(self.revoke, jti, expires_at)
+
+    async def arevoke_if_absent(self, jti: str, expires_at: float) -> bool:
+        return await asyncio.to_thread(self.revoke_if_absent, jti, expires_at)
+
+
+def create_revocation_list():
+    """
+    Create the revocation list matching `settings.user_store_backend`.
+
+    With the shared SQLite user store, revocations go in the same database;
+    otherwise they are appended to `settings.revoked_tokens_path`.
+    """
+    if settings.user_store_backend == "sqlite":
+        return SQLiteRevocationList(
+            settings.user_db_path,
+            capacity=settings.revocation_filter_capacity,
+            error_rate=settings.revocation_filter_error_rate,
+            reload_seconds=settings.revocation_reload_seconds,
+        )
+    return TokenRevocationList(
+        settings.revoked_tokens_path,
+        capacity=settings.revocation_filter_capacity,
+        error_rate=settings.revocation_filter_error_rate,
+        reload_seconds=settings.revocation_reload_seconds,
+    )
+
+
+revocation_list = create_revocation_list()
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["compact"]:
+        print("Usage: python -m app.core.revocation compact")
+        sys.exit(1)
+    print(f"Kept {revocation_list.compact()} unexpired revocations in {revocation_list.path}")
@@ -1,30 +1,149 @@
+import asyncio
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Tuple
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from app.core.config import PASSWORD_SCHEMES, settings
+
 SECRET_KEY = "your-secret-key"  # In a real app, load this from a config file
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
+REFRESH_TOKEN_EXPIRE_DAYS = settings.refresh_token_expire_days
+
+
+def build_password_context(
+    scheme: Optional[str] = None,
+    bcrypt_rounds: Optional[int] = None,
+) -> CryptContext:
+    """
+    Build the password hashing policy from settings.
+
+    The selected scheme and cost hash new passwords. Hashes made with another
+    scheme or a different cost still verify but are flagged for a rehash.
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    Args:
+        scheme: "bcrypt" or "argon2" (argon2id, needs argon2-cffi)
+        bcrypt_rounds: bcrypt cost factor (log2 of the iteration count)
+
+    Returns:
+        CryptContext: The configured context
+    """
+    scheme = scheme or settings.password_hash_scheme
+    if scheme not in PASSWORD_SCHEMES:
+        raise ValueError(f"Unknown password hash scheme: {scheme}")
+    rounds = bcrypt_rounds or settings.bcrypt_rounds
+    return CryptContext(
+        schemes=[scheme] + [other for other in PASSWORD_SCHEMES if other != scheme],
+        default=scheme,
+        deprecated="auto",
+        # Pinning min and max makes any other cost count as outdated
+        bcrypt__rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+        argon2__type="ID",
+        argon2__rounds=settings.argon2_time_cost,
+        argon2__memory_cost=settings.argon2_memory_cost,
+        argon2__parallelism=settings.argon2_parallelism,
+    )
+
+
+pwd_context = build_password_context()
 
 
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password, hashed_password) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if the stored hash is outdated.
+
+    Returns:
+        Tuple[bool, Optional[str]]: Whether the password matched, and a new
+        hash under the current policy when the stored one should be replaced
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_password_hash(password):
     return pwd_context.hash(password)
 
 
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+class PasswordHashingBusy(Exception):
+    """Raised when the password hashing pool and its queue are full."""
+
+
+# bcrypt releases the GIL, so a small thread pool keeps hashing off the event
+# loop; the semaphore caps running + queued jobs so bursts fail fast.
+_hash_executor: Optional[ThreadPoolExecutor] = None
+_hash_slots: Optional[threading.BoundedSemaphore] = None
+_hash_pool_lock = threading.Lock()
+
+
+def _get_hash_pool():
+    global _hash_executor, _hash_slots
+    if _hash_executor is None:
+        with _hash_pool_lock:
+            if _hash_executor is None:
+                _hash_slots = threading.BoundedSemaphore(
+                    settings.password_hash_workers + settings.password_hash_max_queue
+                )
+                _hash_executor = ThreadPoolExecutor(
+                    max_workers=settings.password_hash_workers,
+                    thread_name_prefix="password-hash",
+                )
+    return _hash_executor, _hash_slots
+
+
+async def _run_in_hash_pool(func, *args):
+    executor, slots = _get_hash_pool()
+    if not slots.acquire(blocking=False):
+        raise PasswordHashingBusy("Password hashing queue is full")
+    try:
+        future = executor.submit(func, *args)
+    except Exception:
+        slots.release()
+        raise
+    # Release only when the CPU work is done, even if the caller is cancelled
+    future.add_done_callback(lambda _: slots.release())
+    return await asyncio.wrap_future(future)
+
+
+async def verify_password_async(plain_password, hashed_password) -> bool:
+    """Verify a password on the dedicated hashing pool instead of the event loop."""
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(plain_password, hashed_password) -> Tuple[bool, Optional[str]]:
+    """Verify (and possibly rehash) a password on the dedicated hashing pool."""
+    return await _run_in_hash_pool(verify_and_update_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password) -> str:
+    """Hash a password on the dedicated hashing pool instead of the event loop."""
+    return await _run_in_hash_pool(get_password_hash, password)
+
+
+def _encode_token(data: dict, token_type: str, expires_delta: timedelta) -> str:
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    to_encode.update({
+        "exp": datetime.now(timezone.utc) + expires_delta,
+        # Unique id so a single token can be revoked
+        "jti": uuid.uuid4().hex,
+        "type": token_type,
+    })
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+    return _encode_token(data, "access", expires_delta or timedelta(minutes=15))
+
+
+def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
+    """Create a long-lived token that can only be exchanged for new tokens."""
+    return _encode_token(data, "refresh", expires_delta or timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS))
@@ -0,0 +1,122 @@
+"""
+Per-request phase timing.
+
+ServerTimingMiddleware starts a RequestTimer for each request and keeps it in
+a context variable, so handlers and services can record phases without
+passing it around:
+
+    timing.mark("validate")          # time from admission to here
+    with timing.phase("serialize"):  # time spent inside the block
+        ...
+
+A request is admitted when it starts, or when `queue_wait` (used by the
+concurrency limiter) ends, so a queued request shows the wait as its own
+"queue" phase rather than inside "validate".
+
+Recording is a no-op outside a request. Phases recorded more than once (e.g.
+several upstream calls) are summed. The phases are returned in the
+`Server-Timing` header and logged as one structured line per request.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+_current_timer: ContextVar[Optional["RequestTimer"]] = ContextVar("request_timer", default=None)
+
+
+class RequestTimer:
+    def __init__(self):
+        self.start = time.perf_counter()
+        # When the request got past any admission queue; `mark` measures from here
+        self.admitted = self.start
+        # name -> [seconds, count]; insertion order is the order phases first ran
+        self._phases: Dict[str, List] = {}
+        # Sync handlers and SDK calls record from worker threads
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            entry = self._phases.get(name)
+            if entry is None:
+                self._phases[name] = [seconds, 1]
+            else:
+                entry[0] += seconds
+                entry[1] += 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def phases_ms(self) -> Dict[str, float]:
+        with self._lock:
+            return {name: round(seconds * 1000, 2) for name, (seconds, _) in self._phases.items()}
+
+    def header_value(self, total_seconds: float) -> str:
+        """Format the phases and total as a Server-Timing header value."""
+        entries = [f"{name};dur={ms:.2f}" for name, ms in self.phases_ms().items()]
+        entries.append(f"total;dur={total_seconds * 1000:.2f}")
+        return ", ".join(entries)
+
+
+def start_request_timer():
+    """Start timing a request; returns the token for `stop_request_timer`."""
+    return _current_timer.set(RequestTimer())
+
+
+def stop_request_timer(token) -> None:
+    _current_timer.reset(token)
+
+
+def current_timer() -> Optional[RequestTimer]:
+    return _current_timer.get()
+
+
+def mark(name: str) -> None:
+    """Record the time from admission of the request until now as a phase."""
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.add(name, time.perf_counter() - timer.admitted)
+
+
+def record(name: str, seconds: float, timer: Optional[RequestTimer] = None) -> None:
+    """
+    Record an already measured duration as a phase.
+
+    Pass `timer` when recording from a thread that does not carry the
+    request's context, e.g. a library callback pool.
+    """
+    timer = timer or _current_timer.get()
+    if timer is not None:
+        timer.add(name, seconds)
+
+
+@contextmanager
+def queue_wait(name: str = "queue") -> Iterator[None]:
+    """Record the block as the admission wait; `mark` then measures from its end."""
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        timer.add(name, end - start)
+        timer.admitted = end
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Record the time spent in the block as a phase, even if it raises."""
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(name, time.perf_counter() - start)
@@ -0,0 +1,94 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.models.user import UserInDB
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of bearer token -> (user, expiry).
+
+    Lets hot clients that repeat the same token skip JWT signature
+    verification and the user lookup. Entries expire with their token, or
+    after `ttl_seconds` if that is sooner, and can be dropped per user, e.g.
+    when the user is disabled or changed. `invalidate_user` only reaches this
+    process, so stores shared across workers set a short TTL to bound how long
+    another worker keeps serving a stale user.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[UserInDB, float, Optional[str]]]" = OrderedDict()
+        self._tokens_by_user: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, token: str) -> None:
+        user = self._entries.pop(token)[0]
+        tokens = self._tokens_by_user.get(user.username)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[user.username]
+
+    def lookup(self, token: str) -> Optional[Tuple[UserInDB, Optional[str]]]:
+        """Return the cached (user, jti) for a token, or None."""
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            user, expires_at, jti = entry
+            if expires_at <= time.time():
+                self._remove(token)
+                return None
+            self._entries.move_to_end(token)
+            return user, jti
+
+    def get(self, token: str) -> Optional[UserInDB]:
+        entry = self.lookup(token)
+        return entry[0] if entry is not None else None
+
+    def put(self, token: str, user: UserInDB, expires_at: float, jti: Optional[str] = None) -> None:
+        if self.max_size <= 0:
+            return
+        if self.ttl_seconds is not None:
+            expires_at = min(expires_at, time.time() + self.ttl_seconds)
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = (user, expires_at, jti)
+            self._tokens_by_user.setdefault(user.username, set()).add(token)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, username: str) -> None:
+        """Drop every cached token belonging to a user."""
+        with self._lock:
+            for token in list(self._tokens_by_user.get(username, ())):
+                self._remove(token)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+
+def create_token_cache() -> TokenCache:
+    """
+    Create the token cache matching `settings.user_store_backend`.
+
+    With the shared SQLite user store, a user changed on one worker is only
+    invalidated there, so entries live at most `token_cache_shared_ttl_seconds`.
+    """
+    if settings.user_store_backend == "sqlite":
+        return TokenCache(settings.token_cache_max_size, settings.token_cache_shared_ttl_seconds)
+    return TokenCache(settings.token_cache_max_size)
+
+
+token_cache = create_token_cache()
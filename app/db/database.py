@@ -1,31 +1,89 @@
-from typing import Dict, Optional
-from app.core.security import get_password_hash
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from app.core.config import settings
+from app.core.token_cache import token_cache
 from app.models.user import UserInDB
 
 
+def load_seed_users(path: Path) -> Dict[str, UserInDB]:
+    """
+    Load seed users with precomputed password hashes from a JSON file.
+
+    Args:
+        path: JSON file containing a list of user records
+
+    Returns:
+        Dict[str, UserInDB]: Validated users keyed by username
+    """
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return {user["username"]: UserInDB(**user) for user in json.load(f)}
+
+
 class FakeUserDatabase:
-    def __init__(self):
-        self._users: Dict[str, Dict] = {
-            "johndoe": {
-                "username": "johndoe",
-                "full_name": "John Doe",
-                "email": "johndoe@example.com",
-                "hashed_password": get_password_hash("password"),
-                "disabled": False,
-            }
-        }
+    def __init__(self, seed_path: Optional[Path] = None):
+        self._seed_path = seed_path or settings.seed_users_path
+        self._users_data: Optional[Dict[str, UserInDB]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def _users(self) -> Dict[str, UserInDB]:
+        # Seed users are read on first access, not at import time
+        if self._users_data is None:
+            with self._lock:
+                if self._users_data is None:
+                    self._users_data = load_seed_users(self._seed_path)
+        return self._users_data
 
     def get_user(self, username: str) -> Optional[UserInDB]:
-        if username in self._users:
-            user_dict = self._users[username]
-            return UserInDB(**user_dict)
-        return None
+        # Users are validated once on insert; lookups return the frozen instance
+        return self._users.get(username)
 
-    def add_user(self, username: str, user_data: Dict) -> None:
-        self._users[username] = user_data
+    def add_user(self, username: str, user_data: Union[Dict, UserInDB]) -> None:
+        if not isinstance(user_data, UserInDB):
+            user_data = UserInDB(**user_data)
+        previous = self._users.get(username)
+        version = previous.version + 1 if previous is not None else user_data.version
+        self._users[username] = user_data.model_copy(update={"version": version})
+        # Cached tokens must not keep serving the previous user state
+        token_cache.invalidate_user(username)
 
     def user_exists(self, username: str) -> bool:
         return username in self._users
 
+    async def aget_user(self, username: str) -> Optional[UserInDB]:
+        return self.get_user(username)
+
+    async def aadd_user(self, username: str, user_data: Union[Dict, UserInDB]) -> None:
+        self.add_user(username, user_data)
+
+    async def auser_exists(self, username: str) -> bool:
+        return self.user_exists(username)
+
+
+def create_user_store():
+    """
+    Create the user store selected by `settings.user_store_backend`.
+
+    "memory" keeps users in this process only; "sqlite" persists them in
+    `settings.user_db_path` and shares them across workers.
+    """
+    if settings.user_store_backend == "sqlite":
+        from app.db.sqlite_users import SQLiteUserRepository
+
+        return SQLiteUserRepository(
+            settings.user_db_path,
+            pool_size=settings.user_db_pool_size,
+            seed_path=settings.seed_users_path,
+        )
+    if settings.user_store_backend != "memory":
+        raise ValueError(f"Unknown user store backend: {settings.user_store_backend}")
+    return fake_users_db
+
 
 fake_users_db = FakeUserDatabase()
+users_db = create_user_store()
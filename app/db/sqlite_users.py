@@ -0,0 +1,168 @@
+import asyncio
+import queue
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+
+from app.core.token_cache import token_cache
+from app.models.user import UserInDB
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT NOT NULL PRIMARY KEY,
+    email TEXT,
+    full_name TEXT,
+    hashed_password TEXT NOT NULL,
+    disabled INTEGER NOT NULL DEFAULT 0,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_users_email ON users (email);
+"""
+
+# Constant statements so sqlite3's per-connection statement cache reuses the prepared form
+SELECT_USER = "SELECT username, email, full_name, hashed_password, disabled, version FROM users WHERE username = ?"
+SELECT_EXISTS = "SELECT 1 FROM users WHERE username = ?"
+UPSERT_USER = """
+INSERT INTO users (username, email, full_name, hashed_password, disabled)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (username) DO UPDATE SET
+    email = excluded.email,
+    full_name = excluded.full_name,
+    hashed_password = excluded.hashed_password,
+    disabled = excluded.disabled,
+    version = users.version + 1
+"""
+COUNT_USERS = "SELECT COUNT(*) FROM users"
+# Databases created before the version column existed
+ADD_VERSION_COLUMN = "ALTER TABLE users ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+
+
+class SQLiteUserRepository:
+    """
+    User store backed by SQLite in WAL mode.
+
+    WAL lets every uvicorn worker read concurrently while one writes, so the
+    same database file can be shared across processes. Each process keeps a
+    small pool of connections; the async methods run queries on a matching
+    thread pool so the event loop never waits on disk I/O.
+    """
+
+    def __init__(self, path: Path, pool_size: int = 4, seed_path: Optional[Path] = None):
+        self.path = Path(path)
+        self.pool_size = pool_size
+        self.seed_path = seed_path
+        self._pool: Optional["queue.Queue[sqlite3.Connection]"] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self.path,
+            timeout=5.0,
+            check_same_thread=False,
+            cached_statements=64,
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _initialize(self) -> None:
+        # Connections are opened on first use, not at import time
+        if self._pool is not None:
+            return
+        with self._lock:
+            if self._pool is not None:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connections = [self._connect() for _ in range(self.pool_size)]
+            with connections[0]:
+                connections[0].executescript(SCHEMA)
+                columns = {row[1] for row in connections[0].execute("PRAGMA table_info(users)")}
+                if "version" not in columns:
+                    connections[0].execute(ADD_VERSION_COLUMN)
+            self._seed(connections[0])
+
+            pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+            for connection in connections:
+                pool.put(connection)
+            self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="user-db")
+            self._pool = pool
+
+    def _seed(self, connection: sqlite3.Connection) -> None:
+        if self.seed_path is None:
+            return
+        if connection.execute(COUNT_USERS).fetchone()[0]:
+            return
+        from app.db.database import load_seed_users
+
+        with connection:
+            for user in load_seed_users(self.seed_path).values():
+                connection.execute(UPSERT_USER, self._row(user))
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        self._initialize()
+        connection = self._pool.get()
+        try:
+            yield connection
+        finally:
+            self._pool.put(connection)
+
+    @staticmethod
+    def _row(user: UserInDB) -> tuple:
+        return (user.username, user.email, user.full_name, user.hashed_password, int(bool(user.disabled)))
+
+    def get_user(self, username: str) -> Optional[UserInDB]:
+        with self._connection() as connection:
+            row = connection.execute(SELECT_USER, (username,)).fetchone()
+        if row is None:
+            return None
+        # Rows were validated on insert, so skip re-validation here
+        return UserInDB.model_construct(
+            username=row[0],
+            email=row[1],
+            full_name=row[2],
+            hashed_password=row[3],
+            disabled=bool(row[4]),
+            version=row[5],
+        )
+
+    def add_user(self, username: str, user_data: Union[Dict, UserInDB]) -> None:
+        if not isinstance(user_data, UserInDB):
+            user_data = UserInDB(**user_data)
+        with self._connection() as connection:
+            with connection:
+                connection.execute(UPSERT_USER, self._row(user_data))
+        # Only this process's cache is cleared; other workers' entries expire within
+        # settings.token_cache_shared_ttl_seconds (see create_token_cache)
+        token_cache.invalidate_user(username)
+
+    def user_exists(self, username: str) -> bool:
+        with self._connection() as connection:
+            return connection.execute(SELECT_EXISTS, (username,)).fetchone() is not None
+
+    async def _run(self, func, *args):
+        self._initialize()
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def aget_user(self, username: str) -> Optional[UserInDB]:
+        return await self._run(self.get_user, username)
+
+    async def aadd_user(self, username: str, user_data: Union[Dict, UserInDB]) -> None:
+        await self._run(self.add_user, username, user_data)
+
+    async def auser_exists(self, username: str) -> bool:
+        return await self._run(self.user_exists, username)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._pool is None:
+                return
+            while not self._pool.empty():
+                self._pool.get_nowait().close()
+            self._executor.shutdown(wait=False)
+            self._pool = None
+            self._executor = None
@@ -17,11 +17,54 @@ To run this application:
 3. Run: `uvicorn app.main:app --reload`.
 
 """
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, PlainTextResponse
+import logging
 from app.api.v1.api import api_router
+from app.core.config import settings
+from app.core.drain import drain_tracker, install_drain_signal_handlers
+from app.core.loop_monitor import create_loop_monitor
+from app.core.metrics import PROMETHEUS_CONTENT_TYPE, render_metrics
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.concurrency import ConcurrencyLimitMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.timing import ServerTimingMiddleware
+from app.services.trend_report_scheduler import create_trend_report_scheduler
 import uvicorn
 
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start background services on startup and stop them on shutdown.
+
+    Shutdown first drains: new long jobs are refused and in-flight ones get
+    up to `drain_timeout_seconds` to finish.
+    """
+    restore_signal_handlers = install_drain_signal_handlers()
+    loop_monitor = create_loop_monitor() if settings.loop_monitor_enabled else None
+    if loop_monitor:
+        loop_monitor.start()
+    trend_report_scheduler = create_trend_report_scheduler()
+    trend_report_scheduler.start()
+    yield
+    drain_tracker.start_draining()
+    if not await drain_tracker.wait_idle(settings.drain_timeout_seconds):
+        logger.warning("Drain deadline passed with long jobs still running: %s", drain_tracker.in_flight())
+    trend_report_scheduler.stop()
+    if loop_monitor:
+        await loop_monitor.stop()
+    if restore_signal_handlers:
+        restore_signal_handlers()
+
+
 app = FastAPI(
+    lifespan=lifespan,
+    # orjson serializes plain dict/list responses several times faster than json.dumps
+    default_response_class=ORJSONResponse,
     title="GenAI API",
     version="1.0.0",
     description="A simple API for GenAI with OAuth2 Bearer Token security",
@@ -29,6 +72,16 @@ app = FastAPI(
     redoc_url="/redoc",
 )
 
+if settings.compression_enabled:
+    app.add_middleware(CompressionMiddleware)
+if settings.concurrency_limits_enabled:
+    app.add_middleware(ConcurrencyLimitMiddleware)
+if settings.server_timing_enabled:
+    app.add_middleware(ServerTimingMiddleware)
+# Added last so it is outermost and sees the final status and body size
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware, router=app.router)
+
 app.include_router(api_router, prefix="/api/v1")
 
 
@@ -54,6 +107,29 @@ async def health_check():
     return {"status": "healthy", "message": "API is running successfully"}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness check: 503 while the worker drains for shutdown, so load
+    balancers stop routing new requests to it.
+
+    Returns:
+        dict: The readiness status and the long jobs in flight.
+    """
+    content = {"status": "ready", "in_flight": drain_tracker.in_flight()}
+    if drain_tracker.draining:
+        return ORJSONResponse({**content, "status": "draining"}, status_code=503)
+    return content
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Metrics of this worker process in the Prometheus text format.
+    """
+    return PlainTextResponse(render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
 
 
 if __name__ == "__main__":
@@ -0,0 +1 @@
+# This file makes 'middleware' a Python package
\ No newline at end of file
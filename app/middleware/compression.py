@@ -0,0 +1,250 @@
+"""
+Negotiated response compression as pure ASGI middleware.
+
+Picks zstd, Brotli or gzip from the client's Accept-Encoding (zstd and
+Brotli only when `zstandard` / `brotli` are installed) and compresses:
+
+* complete bodies at or above `minimum_size` bytes in one pass,
+* streaming bodies chunk by chunk, flushing after each chunk so clients
+  still receive data as it is produced.
+
+Responses that are already encoded or whose media type is already
+compressed (audio, images, video, archives) pass through untouched. Every
+other response carries `Vary: Accept-Encoding`, compressed or not, so a
+shared cache never serves one client's encoding to another. The level can
+be set per path prefix; level 0 disables compression for it.
+"""
+
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional
+    brotli = None
+
+# Preferred first when the client rates several encodings equally
+SUPPORTED_ENCODINGS = [name for name, module in (("zstd", zstandard), ("br", brotli), ("gzip", zlib)) if module]
+EXCLUDED_CONTENT_TYPES = (
+    "audio/",
+    "image/",
+    "video/",
+    "application/zip",
+    "application/gzip",
+    "application/octet-stream",
+)
+LEVEL_RANGES = {"gzip": (1, 9), "br": (0, 11), "zstd": (1, 22)}
+
+
+class _Compressor:
+    """Uniform compress/flush/finish interface over gzip, Brotli and zstd."""
+
+    def __init__(self, encoding: str, level: int):
+        low, high = LEVEL_RANGES[encoding]
+        level = min(max(level, low), high)
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._obj = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+        elif encoding == "br":
+            self._obj = brotli.Compressor(quality=level)
+        else:
+            self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._obj.process(data)
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        if self.encoding == "gzip":
+            return self._obj.flush(zlib.Z_SYNC_FLUSH)
+        if self.encoding == "br":
+            return self._obj.flush()
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._obj.finish()
+        return self._obj.flush()
+
+
+def add_vary_accept_encoding(headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    """Return `headers` with Accept-Encoding merged into any existing Vary header."""
+    result, vary = [], None
+    for name, value in headers:
+        if name == b"vary":
+            vary = value if vary is None else vary + b", " + value
+        else:
+            result.append((name, value))
+    listed = [item.strip().lower() for item in vary.split(b",")] if vary else []
+    if b"accept-encoding" in listed or b"*" in listed:
+        result.append((b"vary", vary))
+    else:
+        result.append((b"vary", vary + b", Accept-Encoding" if vary else b"Accept-Encoding"))
+    return result
+
+
+def select_encoding(accept_encoding: str, supported: List[str] = SUPPORTED_ENCODINGS) -> Optional[str]:
+    """
+    Choose the best supported encoding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Raw header value, e.g. "gzip, br;q=0.8"
+        supported: Encodings in server preference order
+
+    Returns:
+        The chosen encoding, or None if the client accepts none of them
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in supported:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app,
+        minimum_size: Optional[int] = None,
+        level: Optional[int] = None,
+        route_levels: Optional[Dict[str, int]] = None,
+        excluded_content_types: Tuple[str, ...] = EXCLUDED_CONTENT_TYPES,
+    ):
+        self.app = app
+        self.minimum_size = settings.compression_minimum_size if minimum_size is None else minimum_size
+        self.level = settings.compression_level if level is None else level
+        routes = settings.compression_route_levels if route_levels is None else route_levels
+        # Longest prefix wins
+        self.route_levels = sorted(routes.items(), key=lambda item: len(item[0]), reverse=True)
+        self.excluded_content_types = excluded_content_types
+
+    def level_for(self, path: str) -> int:
+        for prefix, level in self.route_levels:
+            if path.startswith(prefix):
+                return level
+        return self.level
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        level = self.level_for(scope["path"])
+        if level <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        # Without an acceptable encoding the response is still marked as varying
+        encoding = select_encoding(accept_encoding) if accept_encoding else None
+        await _CompressedResponder(self, encoding, level, send).run(scope, receive)
+
+
+class _CompressedResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: Optional[str], level: int, send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.level = level
+        self.send = send
+        self.start_message = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def run(self, scope, receive) -> None:
+        await self.middleware.app(scope, receive, self.send_wrapper)
+
+    def _should_compress(self, message) -> bool:
+        if message["status"] < 200 or message["status"] in (204, 304):
+            return False
+        for name, value in message.get("headers", []):
+            if name == b"content-encoding":
+                return False
+            if name == b"content-type":
+                content_type = value.decode("latin-1").lower()
+                if content_type.startswith(self.middleware.excluded_content_types):
+                    return False
+        return True
+
+    def _identity_start(self):
+        return {**self.start_message, "headers": add_vary_accept_encoding(self.start_message.get("headers", []))}
+
+    def _encoded_headers(self, content_length: Optional[int]) -> List[Tuple[bytes, bytes]]:
+        headers = []
+        for name, value in self.start_message.get("headers", []):
+            if name == b"content-length":
+                continue
+            if name == b"etag" and not value.startswith(b"W/"):
+                # The encoded bytes differ, so a strong validator no longer holds
+                value = b"W/" + value
+            headers.append((name, value))
+        headers.append((b"content-encoding", self.encoding.encode("ascii")))
+        if content_length is not None:
+            headers.append((b"content-length", str(content_length).encode("ascii")))
+        return add_vary_accept_encoding(headers)
+
+    async def send_wrapper(self, message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self.start_message = message
+            if not self._should_compress(message):
+                self.passthrough = True
+                await self.send(message)
+            elif self.encoding is None:
+                self.passthrough = True
+                await self.send(self._identity_start())
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            if not more_body:
+                # Whole body in one message: compress only if it is worth it
+                if len(body) < self.middleware.minimum_size:
+                    await self.send(self._identity_start())
+                    await self.send(message)
+                    return
+                compressor = _Compressor(self.encoding, self.level)
+                compressed = compressor.compress(body) + compressor.finish()
+                await self.send({**self.start_message, "headers": self._encoded_headers(len(compressed))})
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+
+            # Streaming: the total size is unknown, so compress incrementally
+            self.compressor = _Compressor(self.encoding, self.level)
+            await self.send({**self.start_message, "headers": self._encoded_headers(None)})
+
+        if more_body:
+            chunk = self.compressor.compress(body) + self.compressor.flush()
+        else:
+            chunk = self.compressor.compress(body) + self.compressor.finish()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
@@ -0,0 +1,205 @@
+"""
+Per-route-class concurrency limits and load shedding as pure ASGI middleware.
+
+Paths are mapped to route classes by prefix (longest wins). Each class admits
+at most `max_concurrency` requests at once; up to `max_queue` more wait in
+FIFO order for at most `queue_timeout` seconds. Anything beyond that is
+rejected straight away with `status_code` (429 or 503) and a Retry-After
+header, so an overloaded class answers quickly instead of queueing without
+bound, and cheap routes outside it keep their latency.
+
+Paths that match no class, and exempt paths such as /health, are never limited.
+"""
+
+import asyncio
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+from fastapi.responses import ORJSONResponse
+
+from app.core import timing
+from app.core.config import settings
+from app.core.metrics import Counter, Gauge
+
+requests_shed_total = Counter(
+    "http_requests_shed_total", "Requests rejected by the concurrency limiter.", ("route_class", "reason")
+)
+route_class_queue_depth = Gauge(
+    "route_class_queue_depth", "Requests waiting for a concurrency slot.", ("route_class",)
+)
+
+
+@dataclass
+class RouteClass:
+    name: str
+    max_concurrency: int
+    max_queue: int = 0
+    queue_timeout: float = 10.0
+    status_code: int = 503
+    retry_after: int = 5
+
+    @classmethod
+    def from_settings(cls, name: str, values: Dict[str, float]) -> "RouteClass":
+        options = dict(values)
+        for key in ("max_concurrency", "max_queue", "status_code", "retry_after"):
+            if key in options:
+                options[key] = int(options[key])
+        return cls(name=name, **options)
+
+
+class ConcurrencyLimiter:
+    """
+    Admission control for one route class.
+
+    A released slot is handed directly to the oldest waiter, so waiters are
+    served in order and a newcomer cannot overtake them. Waiters may sit on
+    different event loops (TestClient runs each request on its own), so
+    hand-off to another loop goes through call_soon_threadsafe.
+    """
+
+    def __init__(self, route_class: RouteClass):
+        self.route_class = route_class
+        self.active = 0
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> Optional[str]:
+        """
+        Wait for a slot.
+
+        Returns:
+            None once a slot is held, otherwise the reason for rejection:
+            "queue_full" or "queue_timeout"
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.active < self.route_class.max_concurrency and not self._waiters:
+                self.active += 1
+                return None
+            if len(self._waiters) >= self.route_class.max_queue:
+                return "queue_full"
+            waiter = loop.create_future()
+            self._waiters.append((loop, waiter))
+        self._update_depth()
+
+        try:
+            await asyncio.wait({waiter}, timeout=self.route_class.queue_timeout)
+        except BaseException:
+            # Cancelled while waiting (e.g. the client went away)
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                self._abandon(loop, waiter)
+            raise
+        if waiter.done() and not waiter.cancelled():
+            return None
+        self._abandon(loop, waiter)
+        return "queue_timeout"
+
+    def release(self) -> None:
+        with self._lock:
+            while self._waiters:
+                loop, waiter = self._waiters.popleft()
+                if not waiter.done():
+                    break
+            else:
+                self.active -= 1
+                loop = None
+        self._update_depth()
+        if loop is None:
+            return
+
+        # The slot passes to the waiter; `active` stays the same
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if loop is running:
+            self._grant(waiter)
+            return
+        try:
+            loop.call_soon_threadsafe(self._grant, waiter)
+        except RuntimeError:
+            # The waiter's loop is closed; offer the slot to the next one
+            self.release()
+
+    def _grant(self, waiter: asyncio.Future) -> None:
+        if waiter.done():
+            # Timed out or cancelled before the hand-off arrived
+            self.release()
+        else:
+            waiter.set_result(None)
+
+    def _abandon(self, loop: asyncio.AbstractEventLoop, waiter: asyncio.Future) -> None:
+        with self._lock:
+            try:
+                self._waiters.remove((loop, waiter))
+            except ValueError:
+                pass
+        waiter.cancel()
+        self._update_depth()
+
+    def _update_depth(self) -> None:
+        route_class_queue_depth.set((self.route_class.name,), len(self._waiters))
+
+
+class ConcurrencyLimitMiddleware:
+    def __init__(
+        self,
+        app,
+        route_classes: Optional[Dict[str, str]] = None,
+        class_limits: Optional[Dict[str, Dict[str, float]]] = None,
+        exempt_paths: Optional[Iterable[str]] = None,
+    ):
+        self.app = app
+        routes = settings.concurrency_route_classes if route_classes is None else route_classes
+        limits = settings.concurrency_class_limits if class_limits is None else class_limits
+        self.limiters = {
+            name: ConcurrencyLimiter(RouteClass.from_settings(name, values)) for name, values in limits.items()
+        }
+        # Longest prefix wins; classes without limits are not enforced
+        self.prefixes: List[Tuple[str, ConcurrencyLimiter]] = sorted(
+            ((prefix, self.limiters[name]) for prefix, name in routes.items() if name in self.limiters),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+        self.exempt_paths = frozenset(settings.concurrency_exempt_paths if exempt_paths is None else exempt_paths)
+
+    def limiter_for(self, path: str) -> Optional[ConcurrencyLimiter]:
+        if path in self.exempt_paths:
+            return None
+        for prefix, limiter in self.prefixes:
+            if path.startswith(prefix):
+                return limiter
+        return None
+
+    async def __call__(self, scope, receive, send):
+        limiter = self.limiter_for(scope["path"]) if scope["type"] == "http" else None
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Kept out of the handler's own phases (see timing.queue_wait)
+        with timing.queue_wait():
+            reason = await limiter.acquire()
+        if reason is not None:
+            route_class = limiter.route_class
+            requests_shed_total.inc((route_class.name, reason))
+            response = ORJSONResponse(
+                {"detail": f"Too many concurrent {route_class.name} requests, retry later"},
+                status_code=route_class.status_code,
+                headers={"Retry-After": str(route_class.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
@@ -0,0 +1,123 @@
+"""
+Request metrics as pure ASGI middleware.
+
+Records, per method and route template (e.g. "/api/v1/content/status/{task_id}",
+never the raw path, so label cardinality stays bounded): request count by
+status, latency, in-flight requests and response body size.
+
+The metric children for each (method, route) are bound once and reused, so
+recording a request costs a few additions rather than label lookups.
+"""
+
+import time
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple
+
+from starlette.routing import Match
+
+from app.core.metrics import (
+    http_request_duration_seconds,
+    http_requests_in_progress,
+    http_requests_total,
+    http_response_size_bytes,
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RouteResolver:
+    """
+    Map a request to its route template before the router runs.
+
+    Results are cached per (method, path); the cache is simply emptied when
+    full, so paths with ids only cost a route scan now and then.
+    """
+
+    def __init__(self, router, max_size: int = 2048):
+        self.router = router
+        self.max_size = max_size
+        self._cache: Dict[Tuple[str, str], str] = {}
+
+    def resolve(self, scope) -> str:
+        key = (scope["method"], scope["path"])
+        template = self._cache.get(key)
+        if template is None:
+            template = self._match(scope)
+            if len(self._cache) >= self.max_size:
+                self._cache.clear()
+            self._cache[key] = template
+        return template
+
+    def _match(self, scope) -> str:
+        partial: Optional[str] = None
+        for route in self.router.routes:
+            match, _ = route.matches(scope)
+            if match is Match.FULL:
+                return route.path
+            if match is Match.PARTIAL and partial is None:
+                partial = route.path
+        return partial or UNMATCHED_ROUTE
+
+
+class _RouteMetrics(NamedTuple):
+    method: str
+    route: str
+    in_progress: object
+    duration: object
+    size: object
+    # status code -> http_requests_total child
+    requests: Dict[int, object]
+
+    def requests_for(self, status: int):
+        child = self.requests.get(status)
+        if child is None:
+            child = self.requests[status] = http_requests_total.labels(self.method, self.route, str(status))
+        return child
+
+
+class MetricsMiddleware:
+    def __init__(self, app, router, exclude_paths: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.resolver = RouteResolver(router)
+        self.exclude_paths = frozenset(exclude_paths)
+        # Bounded like the route templates themselves: one entry per method and route
+        self._routes: Dict[Tuple[str, str], _RouteMetrics] = {}
+
+    def _route_metrics(self, method: str, route: str) -> _RouteMetrics:
+        metrics = self._routes.get((method, route))
+        if metrics is None:
+            metrics = self._routes[(method, route)] = _RouteMetrics(
+                method,
+                route,
+                http_requests_in_progress.labels(method, route),
+                http_request_duration_seconds.labels(method, route),
+                http_response_size_bytes.labels(method, route),
+                {},
+            )
+        return metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self._route_metrics(scope["method"], self.resolver.resolve(scope))
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        metrics.in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.duration.observe(time.perf_counter() - start)
+            metrics.in_progress.dec()
+            metrics.requests_for(status).inc()
+            metrics.size.observe(size)
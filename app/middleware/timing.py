@@ -0,0 +1,66 @@
+"""
+Server-Timing header and structured timing log as pure ASGI middleware.
+
+Starts a RequestTimer (see app/core/timing.py) for each request, adds the
+recorded phases plus the total to the response's `Server-Timing` header and
+logs them as one JSON line: at INFO for requests slower than `log_threshold_ms`,
+at DEBUG otherwise.
+"""
+
+import logging
+from typing import Optional
+
+import orjson
+
+from app.core import timing
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ServerTimingMiddleware:
+    def __init__(self, app, log_threshold_ms: Optional[float] = None):
+        self.app = app
+        self.log_threshold_ms = (
+            settings.request_timing_log_threshold_ms if log_threshold_ms is None else log_threshold_ms
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = timing.start_request_timer()
+        timer = timing.current_timer()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timer.header_value(timer.elapsed()).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            timing.stop_request_timer(token)
+            self._log(scope, status, timer)
+
+    def _log(self, scope, status: int, timer: timing.RequestTimer) -> None:
+        total_ms = timer.elapsed() * 1000
+        level = logging.INFO if total_ms >= self.log_threshold_ms else logging.DEBUG
+        if not logger.isEnabledFor(level):
+            return
+        route = scope.get("route")
+        record = {
+            "event": "request_timing",
+            "method": scope["method"],
+            "route": getattr(route, "path", scope["path"]),
+            "status": status,
+            "total_ms": round(total_ms, 2),
+            "phases_ms": timer.phases_ms(),
+        }
+        logger.log(level, orjson.dumps(record).decode("utf-8"))
@@ -1,9 +1,16 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+class RevokeRequest(BaseModel):
+    token: str
 
 class TokenData(BaseModel):
     username: Optional[str] = None
@@ -15,4 +22,9 @@ class User(BaseModel):
     disabled: Optional[bool] = None
 
 class UserInDB(User):
+    # Immutable so the user store can hand out the same instance on every lookup
+    model_config = ConfigDict(frozen=True)
+
     hashed_password: str
+    # Bumped by the user store on every write; used for ETags
+    version: int = 0
@@ -0,0 +1,210 @@
+"""
+Production entry point for the API.
+
+    $ python -m app.server
+
+SERVER_MODE selects how requests are served:
+
+* "single" (default): one uvicorn process, as in development.
+* "multi": several worker processes, so one CPU-bound login or blocking SDK
+  call no longer stalls every request in the container. Workers only share
+  state through the SQLite user store (which also holds token
+  revocations), so multi mode refuses to start with user_store_backend
+  "memory". Gunicorn preloads the app in the master, so workers share
+  imported code copy-on-write; without it uvicorn's own supervisor runs
+  the workers. Each worker is recycled after MAX_REQUESTS (+ jitter) requests
+  to cap memory growth, and drains in-flight requests for up to
+  GRACEFUL_TIMEOUT seconds on shutdown.
+
+Environment variables:
+
+    SERVER_MODE          single | multi
+    PORT                 listen port (default 8000)
+    WEB_CONCURRENCY      worker count; derived from CPUs and memory if unset
+    WORKER_MEMORY_MB     memory budget per worker used for sizing (default 512)
+    MAX_REQUESTS         requests per worker before it is recycled (default 1000)
+    MAX_REQUESTS_JITTER  random extra requests so workers don't recycle together (default 100)
+    GRACEFUL_TIMEOUT     seconds to finish in-flight requests on shutdown
+                         (default: the drain deadline, drain_timeout_seconds)
+"""
+
+import logging
+import os
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import uvicorn
+
+logger = logging.getLogger(__name__)
+
+APP = "app.main:app"
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+
+def available_cpus() -> float:
+    """
+    CPUs this process may actually use.
+
+    Containers often see every host core in os.cpu_count() while a cgroup
+    quota limits them to a fraction, so the quota wins when it is set.
+    """
+    try:
+        cpus = float(len(os.sched_getaffinity(0)))
+    except AttributeError:
+        cpus = float(os.cpu_count() or 1)
+    try:
+        quota, period = (CGROUP_ROOT / "cpu.max").read_text().split()
+        if quota != "max":
+            cpus = min(cpus, int(quota) / int(period))
+    except (OSError, ValueError):
+        pass
+    return max(cpus, 1.0)
+
+
+def available_memory_mb() -> Optional[int]:
+    """Memory limit of the container (cgroup v2), else total system memory."""
+    try:
+        limit = (CGROUP_ROOT / "memory.max").read_text().strip()
+        if limit != "max":
+            return int(limit) // (1024 * 1024)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/proc/meminfo", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("MemTotal:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def default_workers(worker_memory_mb: int = 512) -> int:
+    """
+    One worker per usable CPU, capped by how many fit in memory.
+
+    The app is async, so extra workers beyond the CPU count would only
+    compete for the same cores; the memory cap keeps the container from
+    being OOM-killed when many cores come with little memory.
+    """
+    workers = int(available_cpus())
+    memory_mb = available_memory_mb()
+    if memory_mb is not None and worker_memory_mb > 0:
+        workers = min(workers, memory_mb // worker_memory_mb)
+    return max(workers, 1)
+
+
+def default_graceful_timeout() -> int:
+    """
+    The app's drain deadline, so the server does not cancel podcast and crew
+    requests that the lifespan is still waiting for (see app/core/drain.py).
+    """
+    from app.core.config import settings
+
+    return int(settings.drain_timeout_seconds)
+
+
+@dataclass
+class ServerConfig:
+    mode: str = "single"
+    host: str = "0.0.0.0"
+    port: int = 8000
+    workers: int = 1
+    max_requests: int = 1000
+    max_requests_jitter: int = 100
+    graceful_timeout: int = 300
+
+    @classmethod
+    def from_env(cls) -> "ServerConfig":
+        mode = os.getenv("SERVER_MODE", "single").lower()
+        if mode not in ("single", "multi"):
+            raise ValueError(f"Unknown SERVER_MODE: {mode}")
+        workers = os.getenv("WEB_CONCURRENCY")
+        return cls(
+            mode=mode,
+            host=os.getenv("HOST", "0.0.0.0"),
+            port=int(os.getenv("PORT", "8000")),
+            workers=int(workers) if workers else default_workers(int(os.getenv("WORKER_MEMORY_MB", "512"))),
+            max_requests=int(os.getenv("MAX_REQUESTS", "1000")),
+            max_requests_jitter=int(os.getenv("MAX_REQUESTS_JITTER", "100")),
+            graceful_timeout=int(os.getenv("GRACEFUL_TIMEOUT", "0")) or default_graceful_timeout(),
+        )
+
+
+def run_gunicorn(config: ServerConfig) -> None:
+    from gunicorn.app.base import BaseApplication
+
+    class Application(BaseApplication):
+        def load_config(self):
+            options = {
+                "bind": f"{config.host}:{config.port}",
+                "workers": config.workers,
+                "worker_class": "uvicorn.workers.UvicornWorker",
+                "preload_app": True,
+                "max_requests": config.max_requests,
+                "max_requests_jitter": config.max_requests_jitter,
+                "graceful_timeout": config.graceful_timeout,
+                # Long crew and TTS requests must not be killed as hung workers
+                "timeout": 0,
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app.main import app
+
+            return app
+
+    Application().run()
+
+
+def run_uvicorn_workers(config: ServerConfig) -> None:
+    # uvicorn has no per-worker jitter, so it is applied once to the shared limit
+    limit = config.max_requests + random.randint(0, config.max_requests_jitter) if config.max_requests else None
+    uvicorn.run(
+        APP,
+        host=config.host,
+        port=config.port,
+        workers=config.workers,
+        limit_max_requests=limit,
+        timeout_graceful_shutdown=config.graceful_timeout,
+    )
+
+
+def check_shared_state() -> None:
+    """Refuse multi mode while users and revocations live in each worker's memory."""
+    from app.core.config import settings
+
+    if settings.user_store_backend == "memory":
+        raise ValueError(
+            "SERVER_MODE=multi requires user_store_backend=sqlite: with the memory store "
+            "each worker has its own users and revoked tokens"
+        )
+
+
+def run(config: Optional[ServerConfig] = None) -> None:
+    config = config or ServerConfig.from_env()
+    if config.mode == "single":
+        uvicorn.run(APP, host=config.host, port=config.port, timeout_graceful_shutdown=config.graceful_timeout)
+        return
+
+    check_shared_state()
+
+    logger.info(
+        "Starting %d workers (%.1f CPUs, %s MB memory)",
+        config.workers, available_cpus(), available_memory_mb(),
+    )
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        logger.warning("gunicorn is not installed; using uvicorn workers")
+        run_uvicorn_workers(config)
+    else:
+        run_gunicorn(config)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run()
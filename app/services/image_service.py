@@ -3,6 +3,7 @@ import base64
 from typing import Optional
 from openai import OpenAI
 from app.core.config import settings
+from app.core.metrics import upstream_timer
 
 class ImageService:
     def __init__(self):
@@ -31,12 +32,13 @@ class ImageService:
             raise ValueError("OpenAI API key not configured")
 
         try:
-            response = self.client.images.generate(
-                model="gpt-image-1",
-                prompt=prompt,
-                n=n,
-                size=size
-            )
+            with upstream_timer("openai"):
+                response = self.client.images.generate(
+                    model="gpt-image-1",
+                    prompt=prompt,
+                    n=n,
+                    size=size
+                )
 
             # Ensure output directory exists
             os.makedirs(settings.images_dir, exist_ok=True)
@@ -0,0 +1,233 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TrendReport:
+    """Precomputed trend research for one industry."""
+    industry: str
+    keywords: List[str] = field(default_factory=list)
+    trending_topics: str = ""
+    social_trends: str = ""
+    generated_at: float = 0.0
+
+    def age_seconds(self) -> float:
+        return time.time() - self.generated_at
+
+    def is_fresh(self, max_age_seconds: float) -> bool:
+        return self.age_seconds() <= max_age_seconds
+
+    def to_prompt(self) -> str:
+        """Render the report for inclusion in an agent task description."""
+        minutes = int(self.age_seconds() // 60)
+        return (
+            f"Precomputed trend report for {self.industry} "
+            f"(keywords: {', '.join(self.keywords) or 'none'}; refreshed {minutes} min ago)\n"
+            f"Trending topics:\n{self.trending_topics}\n"
+            f"Social trends:\n{self.social_trends}"
+        )
+
+
+class TrendReportStore:
+    """
+    Trend reports stored as one JSON file per industry, cached in memory.
+
+    The cache is keyed by the file's mtime, so a refresh written by another
+    worker process is picked up on the next read.
+    """
+
+    def __init__(self, reports_dir: Path):
+        self.reports_dir = Path(reports_dir)
+        # slug -> (report, mtime_ns of the file it was read from)
+        self._reports: Dict[str, Tuple[TrendReport, int]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _slug(industry: str) -> str:
+        return re.sub(r"[^a-z0-9]+", "-", industry.strip().lower()).strip("-") or "general"
+
+    def _path(self, industry: str) -> Path:
+        return self.reports_dir / f"{self._slug(industry)}.json"
+
+    def save(self, report: TrendReport) -> None:
+        os.makedirs(self.reports_dir, exist_ok=True)
+        path = self._path(report.industry)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(report), f)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._reports[self._slug(report.industry)] = (report, path.stat().st_mtime_ns)
+
+    def get(self, industry: str) -> Optional[TrendReport]:
+        slug = self._slug(industry)
+        path = self._path(industry)
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except OSError:
+            with self._lock:
+                self._reports.pop(slug, None)
+            return None
+
+        with self._lock:
+            cached = self._reports.get(slug)
+        if cached is not None and cached[1] == mtime_ns:
+            return cached[0]
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                report = TrendReport(**json.load(f))
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable trend report {path}: {e}")
+            return None
+        with self._lock:
+            self._reports[slug] = (report, mtime_ns)
+        return report
+
+    def get_fresh(self, industry: str, max_age_seconds: Optional[float] = None) -> Optional[TrendReport]:
+        """Return the stored report if it is younger than the max age."""
+        if max_age_seconds is None:
+            max_age_seconds = settings.trend_report_max_age_seconds
+        report = self.get(industry)
+        if report is not None and report.is_fresh(max_age_seconds):
+            return report
+        return None
+
+
+def build_trend_report(tools, industry: str, keywords: List[str]) -> TrendReport:
+    """
+    Run trend searches for an industry and package them as a report.
+
+    Args:
+        tools: A ContentTrendTools instance
+        industry: Industry to research
+        keywords: Keyword set for the industry
+
+    Returns:
+        TrendReport: The freshly generated report
+    """
+    topic = f"{industry} {' '.join(keywords)}".strip()
+    return TrendReport(
+        industry=industry,
+        keywords=list(keywords),
+        trending_topics=tools.search_trending_topics(industry, keywords),
+        social_trends=tools.search_social_trends(topic),
+        generated_at=time.time(),
+    )
+
+
+class TrendReportScheduler:
+    """
+    Background thread that refreshes trend reports on a fixed interval.
+
+    Every worker process starts one, but only the holder of an exclusive lock
+    on `<reports_dir>/scheduler.lock` refreshes; the others retry the lock
+    each interval, so one takes over when the holder exits or is recycled.
+    Reports reach the other workers through the store's files.
+    """
+
+    def __init__(
+        self,
+        store: TrendReportStore,
+        targets: Dict[str, List[str]],
+        interval_seconds: float,
+    ):
+        self.store = store
+        self.targets = targets
+        self.interval_seconds = interval_seconds
+        self.lock_path = store.reports_dir / "scheduler.lock"
+        self._lock_file = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def acquire_leadership(self) -> bool:
+        """Take the cross-process scheduler lock without blocking; True if held."""
+        if self._lock_file is not None or fcntl is None:
+            return True
+        os.makedirs(self.lock_path.parent, exist_ok=True)
+        lock_file = open(self.lock_path, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def release_leadership(self) -> None:
+        if self._lock_file is not None:
+            # Closing the file releases the lock
+            self._lock_file.close()
+            self._lock_file = None
+
+    def refresh_all(self) -> None:
+        """Regenerate every configured report; failures are logged and skipped."""
+        # Imported here so the scheduler module stays cheap to import
+        from app.tools.content_tools.trend_tools import ContentTrendTools
+
+        tools = ContentTrendTools()
+        for industry, keywords in self.targets.items():
+            try:
+                self.store.save(build_trend_report(tools, industry, keywords))
+                logger.info(f"Refreshed trend report for {industry}")
+            except Exception as e:
+                logger.error(f"Failed to refresh trend report for {industry}: {str(e)}")
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            if self.acquire_leadership():
+                self.refresh_all()
+            self._stop_event.wait(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._thread is not None or not self.targets:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="trend-report-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.release_leadership()
+
+
+_default_store: Optional[TrendReportStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_trend_report_store() -> TrendReportStore:
+    """Return the process-wide store at `settings.trend_reports_dir`."""
+    global _default_store
+    if _default_store is None:
+        with _default_store_lock:
+            if _default_store is None:
+                _default_store = TrendReportStore(settings.trend_reports_dir)
+    return _default_store
+
+
+def create_trend_report_scheduler() -> TrendReportScheduler:
+    """Build a scheduler from `settings.trend_report_targets`."""
+    return TrendReportScheduler(
+        store=get_trend_report_store(),
+        targets=settings.trend_report_targets,
+        interval_seconds=settings.trend_report_refresh_seconds,
+    )
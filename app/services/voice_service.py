@@ -3,6 +3,7 @@ from typing import Optional
 from elevenlabs.client import ElevenLabs
 from elevenlabs import Voice, VoiceSettings
 from app.core.config import settings
+from app.core.metrics import upstream_timer
 
 
 class VoiceService:
@@ -35,22 +36,24 @@ class VoiceService:
             # Create voice settings
             voice_settings = self._create_generic_voice_settings(custom_voice_settings)
 
-            # Generate audio using SDK
-            audio = self.client.text_to_speech.convert(
-                text=text,
-                voice_id=voice_id,
-                model_id="eleven_multilingual_v2",
-                output_format="mp3_44100_128",
-                voice_settings=voice_settings,
-            )
-
             # Save audio file
             output_path = os.path.join(settings.audio_dir, output_filename)
 
-            # Write audio bytes to file
-            with open(output_path, "wb") as f:
-                for chunk in audio:
-                    f.write(chunk)
+            # The SDK streams audio lazily, so the upstream call lasts until the last chunk
+            with upstream_timer("elevenlabs"):
+                # Generate audio using SDK
+                audio = self.client.text_to_speech.convert(
+                    text=text,
+                    voice_id=voice_id,
+                    model_id="eleven_multilingual_v2",
+                    output_format="mp3_44100_128",
+                    voice_settings=voice_settings,
+                )
+
+                # Write audio bytes to file
+                with open(output_path, "wb") as f:
+                    for chunk in audio:
+                        f.write(chunk)
 
             return output_path
 
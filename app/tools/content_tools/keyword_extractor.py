@@ -0,0 +1,203 @@
+"""Local keyword and hashtag extraction for pre-seeding agent prompts.
+
+Source documents are reduced to their content first: structured search
+results contribute only their text fields, and the labels and links that
+`TrendCorpus.format_results` and the search tools put around results are
+stripped. Candidate phrases are then found RAKE-style (runs of content words
+between stopwords and punctuation), split into 1-3 word n-grams and ranked by
+TF-IDF across the documents. A repeated phrase absorbs the shorter n-grams it
+accounts for, so "generative ai" replaces "generative" and "ai" instead of
+losing to them, and phrases mostly made of a better one's words are dropped.
+Seed keywords from the content idea always come first.
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List
+
+from app.tools.content_tools.trend_corpus import STOPWORDS
+
+_PHRASE_SPLIT_RE = re.compile(r"[^\w\s'-]|\s-\s|\n")
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9'-]*")
+_HASHTAG_RE = re.compile(r"#([A-Za-z][A-Za-z0-9_]{1,49})")
+# Links, TrendCorpus.format_results annotations and result field labels
+_MARKUP_RE = re.compile(
+    r"https?://\S+"
+    r"|\[source:[^\]]*\]|\(hashtags:|\(local corpus\)"
+    r"|['\"]?\b(?:title|link|snippet|source|date|position|hashtags)['\"]?\s*:",
+    re.IGNORECASE,
+)
+
+# Text-bearing fields of structured search results (e.g. Serper organic, news, peopleAlsoAsk)
+CONTENT_FIELDS = frozenset({"title", "snippet", "description", "question", "query", "summary", "keywords"})
+
+PHRASE_STOPWORDS = STOPWORDS | frozenset(
+    """about after all also am any been before being but can could did do does
+    each every few had have he her here his i if into just like may me more most
+    much must my new no not now only other out over own same she should so some
+    such than their them then there these they those through too under up very
+    via which while who whom would yes yet include includes including use using
+    used make makes get gets mock data current currently""".split()
+)
+
+MAX_PHRASE_WORDS = 3
+# A repeated phrase absorbs a shorter n-gram inside it when it accounts for at
+# least this share of the shorter n-gram's occurrences
+PHRASE_ABSORB_SHARE = 0.5
+
+
+@dataclass
+class KeywordCandidates:
+    """Ranked keyword and hashtag candidates."""
+    keywords: List[str] = field(default_factory=list)
+    hashtags: List[str] = field(default_factory=list)
+
+    def to_prompt(self) -> str:
+        return (
+            f"Candidate keywords: {', '.join(self.keywords) or 'none'}\n"
+            f"Candidate hashtags: {' '.join(self.hashtags) or 'none'}"
+        )
+
+
+def document_text(document: Any) -> str:
+    """Plain content text of a source document: text fields of structured results, markup stripped."""
+    if isinstance(document, dict):
+        parts = []
+        for key, value in document.items():
+            if isinstance(value, (dict, list, tuple)):
+                parts.append(document_text(value))
+            elif isinstance(value, str) and key in CONTENT_FIELDS:
+                parts.append(value)
+        return "\n".join(part for part in parts if part)
+    if isinstance(document, (list, tuple)):
+        return "\n".join(text for text in (document_text(item) for item in document) if text)
+    return _MARKUP_RE.sub(" ", str(document))
+
+
+def extract_phrases(text: str) -> List[str]:
+    """Split text into runs of content words delimited by stopwords and punctuation."""
+    phrases = []
+    for fragment in _PHRASE_SPLIT_RE.split(_HASHTAG_RE.sub(" ", text.lower())):
+        current: List[str] = []
+        for word in _WORD_RE.findall(fragment):
+            word = word.strip("'-")
+            if not word or word in PHRASE_STOPWORDS or word.isdigit() or len(word) < 2:
+                if current:
+                    phrases.append(" ".join(current))
+                    current = []
+                continue
+            current.append(word)
+        if current:
+            phrases.append(" ".join(current))
+    return phrases
+
+
+def candidate_ngrams(phrase: str) -> List[str]:
+    """All 1..MAX_PHRASE_WORDS word n-grams inside a phrase."""
+    words = phrase.split()
+    return [
+        " ".join(words[start:start + n])
+        for n in range(1, MAX_PHRASE_WORDS + 1)
+        for start in range(len(words) - n + 1)
+    ]
+
+
+def _overlaps(phrase: str, selected: List[str]) -> bool:
+    """Whether most of the phrase's words already appear together in one selected phrase."""
+    words = set(phrase.split())
+    return any(2 * len(words & set(other.split())) > len(words) for other in selected)
+
+
+def _absorb_subphrases(scores: Dict[str, float], term_frequency: Counter) -> None:
+    """
+    Let repeated phrases take over the shorter n-grams they account for.
+
+    Working upwards from two-word phrases, a phrase seen more than once that
+    covers at least PHRASE_ABSORB_SHARE of a sub-n-gram's occurrences inherits
+    that n-gram's score if higher, and the n-gram is dropped. Without this a
+    word always scores at least as high as every phrase containing it.
+    """
+    absorbed = set()
+    for n in range(2, MAX_PHRASE_WORDS + 1):
+        for phrase in [p for p in scores if len(p.split()) == n and term_frequency[p] > 1]:
+            words = phrase.split()
+            for sub in (" ".join(words[:-1]), " ".join(words[1:])):
+                if sub in scores and term_frequency[phrase] >= PHRASE_ABSORB_SHARE * term_frequency[sub]:
+                    scores[phrase] = max(scores[phrase], scores[sub])
+                    absorbed.add(sub)
+        for sub in absorbed:
+            scores.pop(sub, None)
+        absorbed.clear()
+
+
+def to_hashtag(phrase: str) -> str:
+    return "#" + "".join(part[:1].upper() + part[1:] for part in re.split(r"[\s'-]+", phrase) if part)
+
+
+def extract_keywords(
+    documents: Iterable[Any],
+    seed_keywords: Iterable[str] = (),
+    max_keywords: int = 15,
+    max_hashtags: int = 10,
+) -> KeywordCandidates:
+    """
+    Rank keyword and hashtag candidates from cached search and scrape text.
+
+    Args:
+        documents: Source texts or structured search results (search results,
+            scraped pages, reports)
+        seed_keywords: Keywords supplied with the content idea; always included first
+        max_keywords: Maximum number of keywords returned
+        max_hashtags: Maximum number of hashtags returned
+
+    Returns:
+        KeywordCandidates: Ranked keywords and hashtags
+    """
+    documents = [text for text in (document_text(doc) for doc in documents if doc) if text.strip()]
+    seeds = [seed.strip().lower() for seed in seed_keywords if seed and seed.strip()]
+
+    term_frequency: Counter = Counter()
+    document_frequency: Counter = Counter()
+    hashtag_counts: Counter = Counter()
+    hashtag_spelling = {}
+    for doc in documents:
+        phrases = Counter(
+            ngram for phrase in extract_phrases(doc) for ngram in candidate_ngrams(phrase)
+        )
+        term_frequency.update(phrases)
+        document_frequency.update(phrases.keys())
+        for tag in _HASHTAG_RE.findall(doc):
+            hashtag_counts[tag.lower()] += 1
+            hashtag_spelling.setdefault(tag.lower(), f"#{tag}")
+
+    # Smoothed TF-IDF; ties prefer two-word phrases, the usual shape of a keyword
+    n_docs = max(len(documents), 1)
+    scores = {
+        phrase: tf * (math.log(n_docs / document_frequency[phrase]) + 1)
+        for phrase, tf in term_frequency.items()
+    }
+    _absorb_subphrases(scores, term_frequency)
+    ranked = sorted(scores, key=lambda phrase: (-scores[phrase], abs(len(phrase.split()) - 2), phrase))
+
+    # Phrases mostly made of a better one's words are dropped ("generative" after "generative ai",
+    # "ai marketing tools" after "ai marketing"), while "generative ai" still follows "ai"
+    seeds = list(dict.fromkeys(seeds))
+    extracted: List[str] = []
+    for phrase in ranked:
+        if len(seeds) + len(extracted) >= max_keywords:
+            break
+        if phrase not in seeds and not _overlaps(phrase, extracted):
+            extracted.append(phrase)
+    keywords = (seeds + extracted)[:max_keywords]
+
+    hashtags = [
+        hashtag_spelling[tag]
+        for tag, _ in sorted(hashtag_counts.items(), key=lambda item: (-item[1], item[0]))
+    ]
+    for phrase in keywords:
+        tag = to_hashtag(phrase)
+        if tag.lower()[1:] not in hashtag_counts:
+            hashtags.append(tag)
+    return KeywordCandidates(keywords=keywords, hashtags=list(dict.fromkeys(hashtags))[:max_hashtags])
@@ -0,0 +1,152 @@
+"""SimHash fingerprints for detecting unchanged competitor pages.
+
+Each analyzed page is stored with a 64-bit SimHash of its extracted text.
+Pages whose new fingerprint is within a small Hamming distance of the stored
+one are treated as unchanged. The competitor analyst's output is stored with
+the fingerprints of the pages it covered, so when none of them changed the
+crew reuses it instead of running the competitor analysis task again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.tools.content_tools.trend_corpus import tokenize
+
+logger = logging.getLogger(__name__)
+
+SIMHASH_BITS = 64
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str) -> int:
+    """
+    Compute a 64-bit SimHash over word bigrams of the text.
+
+    Args:
+        text: Extracted page text
+
+    Returns:
+        int: The fingerprint; similar texts differ in few bits
+    """
+    tokens = tokenize(text)
+    features = Counter(" ".join(pair) for pair in zip(tokens, tokens[1:])) or Counter(tokens)
+
+    weights = [0] * SIMHASH_BITS
+    for feature, weight in features.items():
+        h = _feature_hash(feature)
+        for bit in range(SIMHASH_BITS):
+            if h >> bit & 1:
+                weights[bit] += weight
+            else:
+                weights[bit] -= weight
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints."""
+    return (a ^ b).bit_count()
+
+
+@dataclass
+class PageFingerprint:
+    """Stored fingerprint and the analysis produced for it."""
+    fingerprint: int
+    analysis: Dict = field(default_factory=dict)
+    analyzed_at: str = ""
+
+
+class PageFingerprintStore:
+    """URL -> fingerprint store persisted as a JSON file."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self._pages: Dict[str, PageFingerprint] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._pages = {url: PageFingerprint(**entry) for url, entry in data.items()}
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable fingerprint store {self.path}: {e}")
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        os.makedirs(self.path.parent, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({url: asdict(page) for url, page in self._pages.items()}, f)
+        os.replace(tmp_path, self.path)
+
+    def get(self, url: str) -> Optional[PageFingerprint]:
+        with self._lock:
+            return self._pages.get(url)
+
+    def put(self, url: str, fingerprint: int, analysis: Dict) -> PageFingerprint:
+        return self.put_many({url: fingerprint}, analysis)[url]
+
+    def put_many(self, fingerprints: Dict[str, int], analysis: Dict) -> Dict[str, PageFingerprint]:
+        """Store one analysis for several pages, writing the file once."""
+        analyzed_at = datetime.now().isoformat()
+        pages = {
+            url: PageFingerprint(fingerprint=fingerprint, analysis=analysis, analyzed_at=analyzed_at)
+            for url, fingerprint in fingerprints.items()
+        }
+        with self._lock:
+            self._pages.update(pages)
+            self._save()
+        return pages
+
+    def matches(self, url: str, fingerprint: int, max_distance: int) -> Optional[PageFingerprint]:
+        """Return the stored entry if `fingerprint` is within `max_distance` bits of it."""
+        previous = self.get(url)
+        if previous is None:
+            return None
+        if hamming_distance(previous.fingerprint, fingerprint) <= max_distance:
+            return previous
+        return None
+
+    def find_unchanged(self, url: str, text: str, max_distance: int) -> Optional[PageFingerprint]:
+        """
+        Return the stored entry if `text` is near-identical to the last analysis.
+
+        The stored fingerprint is not moved on a match, so slow drift across
+        many small edits still triggers a fresh analysis eventually.
+        """
+        return self.matches(url, simhash(text), max_distance)
+
+
+_default_store: Optional[PageFingerprintStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_fingerprint_store() -> PageFingerprintStore:
+    """Return the process-wide store at `settings.competitor_fingerprints_path`."""
+    global _default_store
+    if _default_store is None:
+        with _default_store_lock:
+            if _default_store is None:
+                _default_store = PageFingerprintStore(settings.competitor_fingerprints_path)
+    return _default_store
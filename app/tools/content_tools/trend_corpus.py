@@ -0,0 +1,252 @@
+"""Local trend corpus with an in-memory inverted index and BM25 ranking.
+
+The corpus is a JSONL file where every line is one trend record, e.g.::
+
+    {"title": "...", "summary": "...", "industry": "marketing",
+     "keywords": ["ai content"], "hashtags": ["#AIMarketing"], "source": "...",
+     "updated_at": "2025-06-01T09:00:00+00:00"}
+
+Records are tokenized once at load time into an inverted index
+(token -> postings of (doc_id, term_frequency)), so keyword and industry
+queries are answered without any network round trip. The file is re-read
+automatically when its modification time changes.
+
+Only records with a recent `updated_at` that cover most of a query's terms
+may stand in for a remote search (see `TrendCorpus.answers`); anything else,
+including the undated seed records, is used as a fallback only.
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset(
+    """a an and are as at be by for from has in is it its of on or that the
+    this to was were will with you your our we how what why when 2024 2025
+    trending trend trends topics topic""".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase text and split it into index tokens, dropping stopwords."""
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+@dataclass
+class TrendRecord:
+    """A single trend entry from the corpus."""
+    title: str
+    summary: str = ""
+    industry: str = ""
+    keywords: List[str] = field(default_factory=list)
+    hashtags: List[str] = field(default_factory=list)
+    source: str = ""
+    updated_at: Optional[datetime] = None
+
+    def searchable_text(self) -> str:
+        return " ".join([self.title, self.summary, self.industry, " ".join(self.keywords)])
+
+    def is_fresh(self, max_age: timedelta) -> bool:
+        """Whether the record was updated within `max_age`; undated records never are."""
+        if self.updated_at is None:
+            return False
+        return datetime.now(timezone.utc) - self.updated_at <= max_age
+
+
+def parse_updated_at(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO 8601 `updated_at` value; naive timestamps are taken as UTC."""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class TrendCorpus:
+    """Inverted index over trend records scored with Okapi BM25."""
+
+    def __init__(self, path: Optional[Path] = None, k1: float = 1.5, b: float = 0.75):
+        self.path = Path(path) if path else None
+        self.k1 = k1
+        self.b = b
+        self.records: List[TrendRecord] = []
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        self._doc_lengths: List[int] = []
+        self._avg_doc_length = 0.0
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+        if self.path is not None:
+            self.reload()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def load_records(self, records: List[TrendRecord]) -> None:
+        """Replace the corpus contents and rebuild the index."""
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        doc_lengths = []
+        for doc_id, record in enumerate(records):
+            counts = Counter(tokenize(record.searchable_text()))
+            doc_lengths.append(sum(counts.values()))
+            for token, tf in counts.items():
+                postings.setdefault(token, []).append((doc_id, tf))
+
+        with self._lock:
+            self.records = records
+            self._postings = postings
+            self._doc_lengths = doc_lengths
+            self._avg_doc_length = (sum(doc_lengths) / len(doc_lengths)) if doc_lengths else 0.0
+
+    def reload(self) -> None:
+        """Read the JSONL file from disk and rebuild the index."""
+        if self.path is None or not self.path.exists():
+            self.load_records([])
+            self._mtime = None
+            return
+
+        records = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    data = json.loads(line)
+                    records.append(TrendRecord(
+                        title=data["title"],
+                        summary=data.get("summary", ""),
+                        industry=data.get("industry", ""),
+                        keywords=list(data.get("keywords", [])),
+                        hashtags=list(data.get("hashtags", [])),
+                        source=data.get("source", ""),
+                        updated_at=parse_updated_at(data.get("updated_at")),
+                    ))
+                except (ValueError, KeyError, TypeError) as e:
+                    logger.warning(f"Skipping invalid trend corpus line {line_number}: {e}")
+
+        self.load_records(records)
+        self._mtime = os.path.getmtime(self.path)
+        logger.info(f"Loaded {len(records)} trend records from {self.path}")
+
+    def refresh_if_stale(self) -> None:
+        """Reload the corpus if the backing file changed since the last load."""
+        if self.path is None:
+            return
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            mtime = None
+        if mtime != self._mtime:
+            self.reload()
+
+    def search(self, query: str, industry: Optional[str] = None, limit: int = 5) -> List[Tuple[TrendRecord, float]]:
+        """
+        Rank corpus records against a free-text query.
+
+        Args:
+            query: Free-text query, tokenized the same way as the corpus
+            industry: Optional industry; matching records get a small boost
+            limit: Maximum number of results
+
+        Returns:
+            List of (record, score) pairs, best first
+        """
+        self.refresh_if_stale()
+        with self._lock:
+            records = self.records
+            postings = self._postings
+            doc_lengths = self._doc_lengths
+            avg_doc_length = self._avg_doc_length
+
+        if not records:
+            return []
+
+        n_docs = len(records)
+        scores: Dict[int, float] = {}
+        for token in set(tokenize(query)):
+            token_postings = postings.get(token)
+            if not token_postings:
+                continue
+            df = len(token_postings)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for doc_id, tf in token_postings:
+                norm = self.k1 * (1 - self.b + self.b * doc_lengths[doc_id] / avg_doc_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        if industry:
+            wanted = industry.strip().lower()
+            for doc_id in scores:
+                if records[doc_id].industry.lower() == wanted:
+                    scores[doc_id] *= 1.25
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [(records[doc_id], score) for doc_id, score in ranked]
+
+    @staticmethod
+    def term_coverage(query: str, record: TrendRecord) -> float:
+        """Fraction of the query's distinct tokens that occur in the record."""
+        query_tokens = set(tokenize(query))
+        if not query_tokens:
+            return 0.0
+        return len(query_tokens & set(tokenize(record.searchable_text()))) / len(query_tokens)
+
+    def answers(self, query: str, results: List[Tuple[TrendRecord, float]]) -> bool:
+        """
+        Whether `results` are good enough to skip the remote search for `query`.
+
+        The best record must score at least `trend_corpus_min_score`, cover at
+        least `trend_corpus_min_coverage` of the query terms and have been
+        updated within `trend_corpus_max_age_days`.
+        """
+        if not results:
+            return False
+        record, score = results[0]
+        return (
+            score >= settings.trend_corpus_min_score
+            and self.term_coverage(query, record) >= settings.trend_corpus_min_coverage
+            and record.is_fresh(timedelta(days=settings.trend_corpus_max_age_days))
+        )
+
+    @staticmethod
+    def format_results(results: List[Tuple[TrendRecord, float]], header: str) -> str:
+        """Render search results as plain text for agents and API callers."""
+        lines = [header]
+        for record, score in results:
+            line = f"- {record.title}"
+            if record.summary:
+                line += f": {record.summary}"
+            if record.hashtags:
+                line += f" (hashtags: {' '.join(record.hashtags)})"
+            if record.source:
+                line += f" [source: {record.source}]"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+_default_corpus: Optional[TrendCorpus] = None
+_default_corpus_lock = threading.Lock()
+
+
+def get_trend_corpus() -> TrendCorpus:
+    """Return the process-wide corpus loaded from `settings.trend_corpus_path`."""
+    global _default_corpus
+    if _default_corpus is None:
+        with _default_corpus_lock:
+            if _default_corpus is None:
+                _default_corpus = TrendCorpus(settings.trend_corpus_path)
+    return _default_corpus
@@ -1,11 +1,57 @@
 from crewai_tools import SerperDevTool, WebsiteSearchTool, ScrapeWebsiteTool
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
+import contextvars
 import os
+import threading
+
+from app.core.config import settings
+from app.core.metrics import upstream_timer
+from app.tools.content_tools.page_fingerprints import (
+    PageFingerprint,
+    PageFingerprintStore,
+    get_fingerprint_store,
+    simhash
+)
+from app.tools.content_tools.trend_corpus import TrendCorpus, TrendRecord, get_trend_corpus
+
+_search_executor: Optional[ThreadPoolExecutor] = None
+_search_executor_lock = threading.Lock()
+
+
+def get_search_executor() -> ThreadPoolExecutor:
+    """Return the process-wide pool used for concurrent remote searches."""
+    global _search_executor
+    if _search_executor is None:
+        with _search_executor_lock:
+            if _search_executor is None:
+                _search_executor = ThreadPoolExecutor(
+                    max_workers=settings.trend_search_max_workers,
+                    thread_name_prefix="trend-search"
+                )
+    return _search_executor
+
 
 class ContentTrendTools:
     """Tools for content trend analysis and competitor monitoring"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        corpus: Optional[TrendCorpus] = None,
+        fingerprints: Optional[PageFingerprintStore] = None
+    ):
+        # Local corpus answers queries before (and instead of) remote search
+        self.corpus = corpus if corpus is not None else get_trend_corpus()
+        # Fingerprints of previously analyzed competitor pages
+        self.fingerprints = fingerprints if fingerprints is not None else get_fingerprint_store()
+        # Remote search results for this instance, keyed by query
+        self._search_cache: Dict[str, Optional[str]] = {}
+        # Local corpus results and whether they answer the query, keyed by (query, industry)
+        self._local_cache: Dict[Tuple[str, Optional[str]], Tuple[List[Tuple[TrendRecord, float]], bool]] = {}
+        # Competitor page text (None when the fetch failed) and SimHash, keyed by URL
+        self._page_cache: Dict[str, Optional[str]] = {}
+        self._page_fingerprints: Dict[str, int] = {}
+
         # Initialize tools - these will work even without API keys for basic functionality
         try:
             self.search_tool = SerperDevTool()
@@ -22,17 +68,214 @@ class ContentTrendTools:
         except:
             self.scrape_tool = None
 
-    def search_trending_topics(self, industry: str, keywords: List[str]) -> str:
-        """Search for trending topics in a specific industry"""
-        query = f"trending {industry} topics 2024 {' '.join(keywords)}"
+    @staticmethod
+    def trending_topics_query(industry: str, keywords: List[str]) -> str:
+        return f"trending {industry} topics 2024 {' '.join(keywords)}"
+
+    @staticmethod
+    def social_trends_query(topic: str) -> str:
+        return f"{topic} trending on social media viral content"
 
+    def _remote_search(self, query: str) -> Optional[str]:
+        """Run a remote search once per query; None when unavailable or failed"""
+        if query in self._search_cache:
+            return self._search_cache[query]
+
+        result = None
         if self.search_tool:
             try:
-                return self.search_tool.run(query)
-            except Exception as e:
-                return f"Mock trend data for {industry}: Current trending topics include AI automation, sustainability practices, and digital transformation. Keywords: {', '.join(keywords)}"
+                with upstream_timer("serper"):
+                    result = self.search_tool.run(query)
+            except Exception:
+                result = None
+        self._search_cache[query] = result
+        return result
+
+    def batch_search(self, queries: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Run many remote searches concurrently.
+
+        Queries are deduplicated and those already answered for this instance
+        are skipped; the rest are issued in parallel on the shared search pool,
+        each in a copy of the caller's context so upstream timings still reach
+        the request's Server-Timing.
+
+        Args:
+            queries: Search queries, duplicates allowed
+
+        Returns:
+            Dict mapping each distinct query to its result (None on failure)
+        """
+        pending = [
+            query for query in dict.fromkeys(queries)
+            if query not in self._search_cache
+        ]
+        if self.search_tool and len(pending) > 1:
+            executor = get_search_executor()
+            futures = [
+                executor.submit(contextvars.copy_context().run, self._remote_search, query)
+                for query in pending
+            ]
+            for future in futures:
+                future.result()
+        else:
+            for query in pending:
+                self._remote_search(query)
+
+        return {query: self._search_cache[query] for query in dict.fromkeys(queries)}
+
+    def cached_documents(self, competitor_urls: Optional[List[str]] = None) -> List[str]:
+        """Return already-fetched search results and stored competitor analyses"""
+        documents = [result for result in self._search_cache.values() if result]
+        for url in competitor_urls or []:
+            page = self.fingerprints.get(url)
+            if page and page.analysis.get('competitor_analysis'):
+                documents.append(page.analysis['competitor_analysis'])
+        return documents
+
+    def _fetch_page(self, url: str) -> Optional[str]:
+        try:
+            text = self.scrape_tool.run(url)
+        except Exception:
+            text = None
+        self._page_cache[url] = text
+        return text
+
+    def fetch_competitor_pages(self, competitor_urls: Optional[List[str]]) -> Dict[str, Optional[str]]:
+        """
+        Scrape each distinct competitor page once for this instance.
+
+        Pages not fetched yet are scraped in parallel on the shared search pool,
+        so a batch of ideas naming the same competitors fetches each page once.
+
+        Returns:
+            Dict mapping each distinct URL to its text (None if it could not be fetched)
+        """
+        urls = list(dict.fromkeys(competitor_urls or []))
+        if not self.scrape_tool:
+            return {url: None for url in urls}
+        pending = [url for url in urls if url not in self._page_cache]
+        if len(pending) > 1:
+            executor = get_search_executor()
+            futures = [
+                executor.submit(contextvars.copy_context().run, self._fetch_page, url)
+                for url in pending
+            ]
+            for future in futures:
+                future.result()
         else:
-            return f"Mock trend data for {industry}: Current trending topics include AI automation, sustainability practices, and digital transformation. Keywords: {', '.join(keywords)}"
+            for url in pending:
+                self._fetch_page(url)
+        return {url: self._page_cache[url] for url in urls}
+
+    def fingerprint_competitor_pages(self, competitor_urls: Optional[List[str]]) -> Optional[Dict[str, int]]:
+        """
+        Fingerprint each competitor page, fetching it once per instance.
+
+        Returns:
+            Dict mapping each URL to its SimHash, or None if there are no URLs or
+            any page could not be fetched (the analysis then cannot be reused)
+        """
+        pages = self.fetch_competitor_pages(competitor_urls)
+        if not pages or any(text is None for text in pages.values()):
+            return None
+        for url, text in pages.items():
+            if url not in self._page_fingerprints:
+                self._page_fingerprints[url] = simhash(text)
+        return {url: self._page_fingerprints[url] for url in pages}
+
+    def stored_competitor_analysis(
+        self,
+        page_fingerprints: Optional[Dict[str, int]],
+        task_key: str
+    ) -> Optional[PageFingerprint]:
+        """
+        Return the stored competitor analysis if it was made for the same task
+        (`task_key`, e.g. a hash of the task description, which names the topic),
+        covered exactly these pages, and none of them changed since.
+        """
+        if not page_fingerprints:
+            return None
+        urls = sorted(page_fingerprints)
+        stored = None
+        for url, fingerprint in page_fingerprints.items():
+            page = self.fingerprints.matches(url, fingerprint, settings.simhash_max_distance)
+            if page is None or page.analysis.get('competitors') != urls:
+                return None
+            if page.analysis.get('task_key') != task_key or not page.analysis.get('competitor_analysis'):
+                return None
+            stored = page
+        return stored
+
+    def store_competitor_analysis(self, page_fingerprints: Dict[str, int], analysis: str, task_key: str) -> None:
+        """Store the competitor analyst's output with its task key and the fingerprints of the pages it covered"""
+        self.fingerprints.put_many(page_fingerprints, {
+            'competitors': sorted(page_fingerprints),
+            'task_key': task_key,
+            'competitor_analysis': analysis
+        })
+
+    def _local_first_tier(self, query: str, industry: Optional[str] = None):
+        """Rank the corpus once per query and instance; search_ideas and the per-idea searches share it"""
+        key = (query, industry)
+        if key not in self._local_cache:
+            results = self.corpus.search(query, industry=industry)
+            self._local_cache[key] = (results, self.corpus.answers(query, results))
+        return self._local_cache[key]
+
+    def search_ideas(self, content_ideas: List[Dict]) -> List[Dict]:
+        """
+        Gather trending topics and social trends for a batch of content ideas.
+
+        All remote queries for the batch are collected first and run in one
+        concurrent wave, then fanned back out to each idea.
+
+        Args:
+            content_ideas: Content idea dicts with topic, industry and keywords
+
+        Returns:
+            List of dicts with 'trending_topics' and 'social_trends', one per idea
+        """
+        remote_queries = []
+        for idea in content_ideas:
+            industry = idea.get('industry') or 'general'
+            keywords = idea.get('keywords') or []
+            topic = idea.get('topic') or 'general topic'
+
+            _, strong = self._local_first_tier(f"{industry} {' '.join(keywords)}", industry)
+            if not strong:
+                remote_queries.append(self.trending_topics_query(industry, keywords))
+            _, strong = self._local_first_tier(topic)
+            if not strong:
+                remote_queries.append(self.social_trends_query(topic))
+
+        self.batch_search(remote_queries)
+
+        return [
+            {
+                'trending_topics': self.search_trending_topics(
+                    idea.get('industry') or 'general', idea.get('keywords') or []
+                ),
+                'social_trends': self.search_social_trends(idea.get('topic') or 'general topic')
+            }
+            for idea in content_ideas
+        ]
+
+    def search_trending_topics(self, industry: str, keywords: List[str]) -> str:
+        """Search for trending topics in a specific industry"""
+        header = f"Trend data for {industry} (local corpus):"
+
+        local_results, strong = self._local_first_tier(f"{industry} {' '.join(keywords)}", industry)
+        if strong:
+            return self.corpus.format_results(local_results, header)
+
+        remote = self._remote_search(self.trending_topics_query(industry, keywords))
+        if remote is not None:
+            return remote
+
+        if local_results:
+            return self.corpus.format_results(local_results, header)
+        return f"Mock trend data for {industry}: Current trending topics include AI automation, sustainability practices, and digital transformation. Keywords: {', '.join(keywords)}"
 
     def analyze_competitor_content(self, competitor_urls: List[str]) -> str:
         """Analyze competitor content strategies"""
@@ -41,6 +284,20 @@ class ContentTrendTools:
             try:
                 if self.scrape_tool:
                     content = self.scrape_tool.run(url)
+                    fingerprint = simhash(content)
+                    previous = self.fingerprints.matches(url, fingerprint, settings.simhash_max_distance)
+                    if previous:
+                        # Near-identical to the last fetch: a reference instead of the page text
+                        results.append({
+                            'url': url,
+                            'unchanged_since': previous.analyzed_at,
+                            'fingerprint': f"{previous.fingerprint:016x}",
+                            'analysis_stored': bool(previous.analysis.get('competitor_analysis'))
+                        })
+                        continue
+
+                    # Changed page: any stored analysis of the old version no longer applies
+                    self.fingerprints.put(url, fingerprint, {'url': url})
                     results.append({
                         'url': url,
                         'content': content[:500]  # First 500 chars
@@ -59,12 +316,16 @@ class ContentTrendTools:
 
     def search_social_trends(self, topic: str) -> str:
         """Search for social media trends related to a topic"""
-        query = f"{topic} trending on social media viral content"
+        header = f"Social trends for {topic} (local corpus):"
 
-        if self.search_tool:
-            try:
-                return self.search_tool.run(query)
-            except Exception as e:
-                return f"Mock social trends for {topic}: High engagement on video content, trending hashtags include #{topic.replace(' ', '')}, peak posting times are 9-11 AM and 7-9 PM"
-        else:
-            return f"Mock social trends for {topic}: High engagement on video content, trending hashtags include #{topic.replace(' ', '')}, peak posting times are 9-11 AM and 7-9 PM"
+        local_results, strong = self._local_first_tier(topic)
+        if strong:
+            return self.corpus.format_results(local_results, header)
+
+        remote = self._remote_search(self.social_trends_query(topic))
+        if remote is not None:
+            return remote
+
+        if local_results:
+            return self.corpus.format_results(local_results, header)
+        return f"Mock social trends for {topic}: High engagement on video content, trending hashtags include #{topic.replace(' ', '')}, peak posting times are 9-11 AM and 7-9 PM"
@@ -0,0 +1,206 @@
+"""
+Startup profiler for the API.
+
+Reports where cold-start time goes:
+
+* a cumulative import-time tree of `import app.main` (from `python -X importtime`
+  in a fresh interpreter, so nothing is already cached in `sys.modules`),
+* lifespan startup and shutdown durations, plus any legacy startup/shutdown hooks,
+* latency of the first request and of a warm request after it.
+
+The result is also written as JSON so releases can be diffed:
+
+    $ python -m app.tools.startup_profile
+    $ python -m app.tools.startup_profile --path /api/v1/hello --output before.json
+"""
+
+import argparse
+import inspect
+import json
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+
+DEFAULT_OUTPUT = settings.base_dir / "output" / "startup_profile.json"
+
+
+@dataclass
+class ImportNode:
+    """One module in the import-time tree; times are in milliseconds."""
+    name: str
+    self_ms: float
+    cumulative_ms: float
+    children: List["ImportNode"] = field(default_factory=list)
+
+
+def parse_importtime(output: str) -> List[ImportNode]:
+    """
+    Build the import tree from `-X importtime` output.
+
+    The interpreter prints a module after all of its children, indented two
+    spaces per nesting level, so each line adopts the pending nodes one level
+    deeper than itself.
+
+    Args:
+        output: stderr of a `python -X importtime` run
+
+    Returns:
+        List[ImportNode]: Top-level imports in the order they completed
+    """
+    pending: Dict[int, List[ImportNode]] = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # The header line
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        node = ImportNode(name.strip(), self_us / 1000, cumulative_us / 1000)
+        node.children = pending.pop(depth + 1, [])
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def find_import(nodes: List[ImportNode], name: str) -> Optional[ImportNode]:
+    for node in nodes:
+        if node.name == name:
+            return node
+        found = find_import(node.children, name)
+        if found is not None:
+            return found
+    return None
+
+
+def profile_imports(module: str = "app.main") -> Optional[ImportNode]:
+    """Import `module` in a fresh interpreter and return its import-time node."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=settings.base_dir,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return find_import(parse_importtime(result.stderr), module)
+
+
+def _timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def _instrument_hooks(handlers: List, durations: Dict[str, float]) -> None:
+    """Wrap legacy on_startup/on_shutdown handlers so each one is timed."""
+    def timed(handler):
+        async def wrapper():
+            start = time.perf_counter()
+            result = handler()
+            if inspect.isawaitable(result):
+                await result
+            durations[handler.__qualname__] = (time.perf_counter() - start) * 1000
+        return wrapper
+
+    handlers[:] = [timed(handler) for handler in handlers]
+
+
+def profile_runtime(path: str = "/health") -> Dict:
+    """
+    Run the app's lifespan in-process and time startup, requests and shutdown.
+
+    Args:
+        path: Path used for the first and the warm request
+
+    Returns:
+        Dict: Durations in milliseconds
+    """
+    start = time.perf_counter()
+    from app.main import app
+    import_ms = (time.perf_counter() - start) * 1000
+
+    from fastapi.testclient import TestClient
+
+    hooks: Dict[str, Dict[str, float]] = {"startup": {}, "shutdown": {}}
+    _instrument_hooks(app.router.on_startup, hooks["startup"])
+    _instrument_hooks(app.router.on_shutdown, hooks["shutdown"])
+    client = TestClient(app)
+    startup_ms = _timed(client.__enter__)
+    try:
+        first = time.perf_counter()
+        status_code = client.get(path).status_code
+        first_ms = (time.perf_counter() - first) * 1000
+        warm_ms = _timed(lambda: client.get(path))
+    finally:
+        shutdown_ms = _timed(lambda: client.__exit__(None, None, None))
+
+    return {
+        "in_process_import_ms": import_ms,
+        "lifespan": {"startup_ms": startup_ms, "shutdown_ms": shutdown_ms},
+        "hooks_ms": hooks,
+        "first_request": {"path": path, "status_code": status_code, "latency_ms": first_ms},
+        "warm_request": {"path": path, "latency_ms": warm_ms},
+    }
+
+
+def format_tree(node: ImportNode, min_ms: float, max_depth: int, depth: int = 0) -> List[str]:
+    lines = [f"{node.cumulative_ms:10.1f} ms {node.self_ms:9.1f} ms  {'  ' * depth}{node.name}"]
+    if depth >= max_depth:
+        return lines
+    for child in sorted(node.children, key=lambda c: c.cumulative_ms, reverse=True):
+        if child.cumulative_ms >= min_ms:
+            lines.extend(format_tree(child, min_ms, max_depth, depth + 1))
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Profile API import time, lifespan and first request")
+    parser.add_argument("--path", default="/health", help="Path for the first request (default: /health)")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="JSON report path")
+    parser.add_argument("--min-ms", type=float, default=10.0, help="Hide imports faster than this")
+    parser.add_argument("--depth", type=int, default=6, help="Maximum tree depth to print")
+    args = parser.parse_args(argv)
+
+    import_tree = profile_imports()
+    runtime = profile_runtime(args.path)
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "import": {
+            "total_ms": import_tree.cumulative_ms if import_tree else None,
+            "tree": asdict(import_tree) if import_tree else None,
+        },
+        **runtime,
+    }
+
+    print("Import time of app.main (cumulative, self):")
+    if import_tree:
+        print("\n".join(format_tree(import_tree, args.min_ms, args.depth)))
+    print(f"\nLifespan startup:  {runtime['lifespan']['startup_ms']:8.1f} ms")
+    for name, duration in runtime["hooks_ms"]["startup"].items():
+        print(f"  on_startup {name}: {duration:.1f} ms")
+    print(f"First request:     {runtime['first_request']['latency_ms']:8.1f} ms "
+          f"({args.path} -> {runtime['first_request']['status_code']})")
+    print(f"Warm request:      {runtime['warm_request']['latency_ms']:8.1f} ms")
+    print(f"Lifespan shutdown: {runtime['lifespan']['shutdown_ms']:8.1f} ms")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport written to {args.output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -74,6 +74,19 @@ class TestContentCreationCrew:
         assert "AI Marketing Tools" in task.description
         assert task.agent == crew.trend_researcher
 
+    def test_create_trend_research_task_with_trend_data(self):
+        """Test prefetched search results are injected into the trend task"""
+        crew = ContentCreationCrew()
+        content_idea = {"topic": "AI Marketing Tools", "industry": "marketing"}
+        trend_data = {
+            "trending_topics": "AI copilots for campaign planning",
+            "social_trends": "#AIMarketing is up this week"
+        }
+
+        task = crew.create_trend_research_task(content_idea, trend_data)
+        assert "AI copilots for campaign planning" in task.description
+        assert "#AIMarketing is up this week" in task.description
+
     def test_create_competitor_analysis_task(self):
         """Test competitor analysis task creation"""
         crew = ContentCreationCrew()
@@ -1,13 +1,31 @@
 import pytest
 import asyncio
 from fastapi.testclient import TestClient
+from app.core import dependencies
+from app.core.api_keys import API_KEY_HEADER, ApiKeyStore, generate_api_key, hash_api_key
 from app.main import app
 
-client = TestClient(app)
+SERVICE_KEY = generate_api_key()
+client = TestClient(app, headers={API_KEY_HEADER: SERVICE_KEY})
+
+
+@pytest.fixture(autouse=True)
+def service_key(monkeypatch):
+    """Fixture registering the client's API key, as N8N would be provisioned"""
+    monkeypatch.setattr(dependencies, "api_key_store", ApiKeyStore({hash_api_key(SERVICE_KEY): "johndoe"}))
+
 
 class TestContentCrewAPI:
     """Test suite for Content Crew API endpoints using FastAPI TestClient"""
 
+    def test_content_creation_requires_authentication(self):
+        """Test requests without an API key or bearer token are rejected"""
+        payload = {"content_ideas": [{"topic": "AI Tools", "content_type": "blog post"}]}
+
+        response = TestClient(app).post("/api/v1/content/create", json=payload)
+
+        assert response.status_code == 401
+
     @pytest.mark.smoke
     def test_content_creation_endpoint(self):
         """Test the main content creation endpoint"""
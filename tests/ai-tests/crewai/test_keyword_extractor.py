@@ -0,0 +1,110 @@
+from app.agents.content_crew.content_creation_crew import ContentCreationCrew
+from app.tools.content_tools.keyword_extractor import (
+    document_text,
+    extract_keywords,
+    extract_phrases,
+    to_hashtag
+)
+from app.tools.content_tools.trend_corpus import TrendCorpus, TrendRecord
+
+SEARCH_RESULTS = [
+    "Teams use generative AI for first drafts and content repurposing. #AIMarketing #ContentMarketing",
+    "Generative AI drafts email copy while marketing automation handles intent signals. #AIMarketing",
+    "Short-form video keeps outperforming static posts on social media."
+]
+
+
+class TestKeywordExtractor:
+    """Test suite for local keyword and hashtag extraction"""
+
+    def test_extract_phrases_splits_on_stopwords(self):
+        """Test phrases break at stopwords and punctuation"""
+        phrases = extract_phrases("Generative AI for content repurposing, and marketing automation")
+        assert phrases == ["generative ai", "content repurposing", "marketing automation"]
+
+    def test_to_hashtag(self):
+        """Test phrases become CamelCase hashtags"""
+        assert to_hashtag("marketing automation") == "#MarketingAutomation"
+        assert to_hashtag("short-form video") == "#ShortFormVideo"
+
+    def test_repeated_phrases_rank_first(self):
+        """Test phrases appearing across results outrank one-off phrases"""
+        candidates = extract_keywords(SEARCH_RESULTS)
+        assert candidates.keywords[0] == "generative ai"
+
+    def test_seed_keywords_are_kept_first(self):
+        """Test idea keywords lead the candidate list"""
+        candidates = extract_keywords(SEARCH_RESULTS, seed_keywords=["AI content", "marketing automation"])
+        assert candidates.keywords[:2] == ["ai content", "marketing automation"]
+        assert candidates.keywords.count("marketing automation") == 1
+
+    def test_existing_hashtags_are_preferred(self):
+        """Test hashtags found in sources come before generated ones"""
+        candidates = extract_keywords(SEARCH_RESULTS)
+        assert candidates.hashtags[0] == "#AIMarketing"
+        assert "#ContentMarketing" in candidates.hashtags
+
+    def test_limits(self):
+        """Test the result sizes are capped"""
+        candidates = extract_keywords(SEARCH_RESULTS, max_keywords=3, max_hashtags=2)
+        assert len(candidates.keywords) == 3
+        assert len(candidates.hashtags) == 2
+
+    def test_corpus_markup_is_not_a_keyword(self):
+        """Test labels added by TrendCorpus.format_results do not become keywords"""
+        records = [
+            (TrendRecord(title="Generative AI drafts", summary="Content repurposing at scale",
+                         hashtags=["#GenAI"], source="seed"), 3.0),
+            (TrendRecord(title="Marketing automation", summary="Generative AI nurtures leads",
+                         hashtags=["#MarketingAutomation"], source="seed"), 2.0)
+        ]
+        text = TrendCorpus.format_results(records, "Trend data for marketing (local corpus):")
+
+        candidates = extract_keywords([text, text])
+        words = {word for keyword in candidates.keywords for word in keyword.split()}
+        assert not words & {"hashtags", "source", "seed", "local", "corpus"}
+        assert "#GenAI" in candidates.hashtags
+
+    def test_structured_results_use_text_fields(self):
+        """Test structured search results contribute titles and snippets, not field names or links"""
+        result = {
+            "searchParameters": {"q": "marketing", "type": "search"},
+            "organic": [{"title": "Marketing automation", "link": "https://example.com/a",
+                         "snippet": "Marketing automation platforms", "position": 1}]
+        }
+        assert document_text(result).split("\n") == ["Marketing automation", "Marketing automation platforms"]
+        assert extract_keywords([result]).keywords[0] == "marketing automation"
+
+    def test_repeated_phrase_replaces_its_words(self):
+        """Test a phrase making up most uses of its words outranks them"""
+        documents = [
+            "Marketing automation tools for small teams",
+            "Marketing automation platforms and email marketing",
+            "Automation budgets"
+        ]
+        keywords = extract_keywords(documents).keywords
+
+        assert keywords[0] == "marketing automation"
+        assert "marketing" not in keywords
+        assert "automation" not in keywords
+        assert "email marketing" in keywords
+
+    def test_empty_input(self):
+        """Test no documents and no seeds yield empty candidates"""
+        candidates = extract_keywords([])
+        assert candidates.keywords == []
+        assert candidates.hashtags == []
+
+
+class TestCrewKeywordSeeding:
+    """Test keyword candidates are passed into crew task prompts"""
+
+    def test_candidates_in_trend_task(self):
+        """Test the trend task carries the extracted candidates"""
+        crew = ContentCreationCrew()
+        content_idea = {"topic": "AI Marketing Tools", "keywords": ["marketing automation"]}
+        trend_data = {"trending_topics": SEARCH_RESULTS[0], "social_trends": SEARCH_RESULTS[1]}
+
+        task = crew.create_trend_research_task(content_idea, trend_data)
+        assert "Candidate keywords: marketing automation" in task.description
+        assert "#AIMarketing" in task.description
@@ -0,0 +1,189 @@
+import pytest
+from app.tools.content_tools.page_fingerprints import (
+    PageFingerprintStore,
+    hamming_distance,
+    simhash
+)
+from app.tools.content_tools.trend_corpus import TrendCorpus
+from app.tools.content_tools.trend_tools import ContentTrendTools
+
+PAGE_TEXT = (
+    "Our marketing platform helps teams plan campaigns, publish blog posts and "
+    "measure engagement across social channels. Start a free trial today and see "
+    "how automation saves hours every week for content teams of any size."
+)
+
+
+class FakeScrapeTool:
+    """Scrape tool stub returning preset page text"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = 0
+
+    def run(self, url):
+        self.calls += 1
+        return self.pages[url]
+
+
+class TestSimHash:
+    """Test suite for SimHash fingerprints"""
+
+    def test_identical_text(self):
+        """Test identical text produces identical fingerprints"""
+        assert simhash(PAGE_TEXT) == simhash(PAGE_TEXT)
+
+    def test_small_edit_is_near_identical(self):
+        """Test a minor edit changes only a few bits"""
+        edited = PAGE_TEXT.replace("free trial", "free demo")
+        assert hamming_distance(simhash(PAGE_TEXT), simhash(edited)) <= 10
+
+    def test_different_text_is_far(self):
+        """Test unrelated text differs in many bits"""
+        other = "Quarterly earnings rose on strong demand for industrial sensors in Europe and Asia."
+        assert hamming_distance(simhash(PAGE_TEXT), simhash(other)) > 10
+
+
+class TestPageFingerprintStore:
+    """Test suite for the persisted fingerprint store"""
+
+    def test_persistence(self, tmp_path):
+        """Test stored fingerprints survive a reload"""
+        path = tmp_path / "fingerprints.json"
+        store = PageFingerprintStore(path)
+        store.put("example.com", simhash(PAGE_TEXT), {"url": "example.com", "content": "summary"})
+
+        reloaded = PageFingerprintStore(path)
+        entry = reloaded.get("example.com")
+        assert entry is not None
+        assert entry.fingerprint == simhash(PAGE_TEXT)
+        assert entry.analysis["content"] == "summary"
+
+    def test_find_unchanged(self, tmp_path):
+        """Test near-identical text matches and changed text does not"""
+        store = PageFingerprintStore(tmp_path / "fingerprints.json")
+        store.put("example.com", simhash(PAGE_TEXT), {"url": "example.com"})
+
+        assert store.find_unchanged("example.com", PAGE_TEXT, max_distance=3) is not None
+        assert store.find_unchanged("example.com", "Completely new page about pricing", max_distance=3) is None
+        assert store.find_unchanged("other.com", PAGE_TEXT, max_distance=3) is None
+
+
+class TestCrewReusesCompetitorAnalysis:
+    """Test the crew skips competitor analysis when a stored one applies"""
+
+    def test_stored_analysis_replaces_competitor_task(self, tmp_path):
+        """Test the competitor task is dropped and the stored output is fed to later tasks"""
+        from app.agents.content_crew.content_creation_crew import ContentCreationCrew
+
+        crew = ContentCreationCrew()
+        stored = PageFingerprintStore(tmp_path / "fingerprints.json").put(
+            "example.com", simhash(PAGE_TEXT),
+            {"competitors": ["example.com"], "competitor_analysis": "Competitor posts weekly AI tutorials"}
+        )
+        idea = {"topic": "AI Tools", "competitors": ["example.com"]}
+
+        fresh = crew.build_crew(idea)
+        reused = crew.build_crew(idea, stored_competitor_analysis=stored)
+
+        assert any(task.agent is crew.competitor_analyst for task in fresh.tasks)
+        assert not any(task.agent is crew.competitor_analyst for task in reused.tasks)
+        assert all("Competitor posts weekly AI tutorials" in task.description for task in reused.tasks[1:])
+
+    def test_task_key_depends_on_topic(self):
+        """Test ideas with the same competitors but different topics do not share an analysis"""
+        from app.agents.content_crew.content_creation_crew import ContentCreationCrew
+
+        key = ContentCreationCrew.competitor_task_key
+        assert key({"topic": "AI Tools", "competitors": ["example.com"]}) == \
+            key({"topic": "AI Tools", "competitors": ["example.com"]})
+        assert key({"topic": "AI Tools", "competitors": ["example.com"]}) != \
+            key({"topic": "Remote Work", "competitors": ["example.com"]})
+
+    def test_analyst_receives_page_text(self):
+        """Test the fetched page text is part of the competitor task"""
+        from app.agents.content_crew.content_creation_crew import ContentCreationCrew
+
+        crew = ContentCreationCrew()
+        idea = {"topic": "AI Tools", "competitors": ["example.com"]}
+        task = crew.create_competitor_analysis_task(idea, {"example.com": PAGE_TEXT})
+
+        assert "Our marketing platform" in task.description
+
+
+class TestCompetitorAnalysisReuse:
+    """Test analyze_competitor_content reuses analyses of unchanged pages"""
+
+    @pytest.fixture
+    def make_tools(self, tmp_path):
+        """Fixture building per-request tools over one shared fingerprint store and site"""
+        store = PageFingerprintStore(tmp_path / "fingerprints.json")
+        scraper = FakeScrapeTool({"example.com": PAGE_TEXT})
+
+        def make_tools():
+            tools = ContentTrendTools(corpus=TrendCorpus(), fingerprints=store)
+            tools.scrape_tool = scraper
+            return tools
+        return make_tools
+
+    @pytest.fixture
+    def tools(self, make_tools):
+        return make_tools()
+
+    def test_unchanged_page_returns_reference(self, tools):
+        """Test the second fetch of an unchanged page returns a reference, not the page text"""
+        first = tools.analyze_competitor_content(["example.com"])
+        second = tools.analyze_competitor_content(["example.com"])
+
+        assert "Our marketing platform" in first
+        assert "unchanged_since" in second
+        assert "Our marketing platform" not in second
+        assert len(second) < len(first)
+
+    def test_stored_analysis_reused_while_pages_unchanged(self, make_tools):
+        """Test the analyst output is reused only for the same task and unchanged pages"""
+        tools = make_tools()
+        pages = tools.fingerprint_competitor_pages(["example.com"])
+        assert tools.stored_competitor_analysis(pages, "task-a") is None
+        tools.store_competitor_analysis(pages, "Competitor focuses on automation tutorials", "task-a")
+
+        tools = make_tools()
+        stored = tools.stored_competitor_analysis(tools.fingerprint_competitor_pages(["example.com"]), "task-a")
+        assert stored.analysis["competitor_analysis"] == "Competitor focuses on automation tutorials"
+
+        tools = make_tools()
+        tools.scrape_tool.pages["example.com"] = "Brand new pricing page with enterprise plans and annual discounts."
+        assert tools.stored_competitor_analysis(tools.fingerprint_competitor_pages(["example.com"]), "task-a") is None
+
+    def test_stored_analysis_requires_same_task(self, tools):
+        """Test an analysis made for one topic is not reused for another with the same competitors"""
+        pages = tools.fingerprint_competitor_pages(["example.com"])
+        tools.store_competitor_analysis(pages, "Analysis for topic A", "task-a")
+
+        assert tools.stored_competitor_analysis(pages, "task-b") is None
+
+    def test_stored_analysis_requires_same_competitor_set(self, tools):
+        """Test an analysis of one page is not reused for a larger set of competitors"""
+        tools.scrape_tool.pages["other.com"] = "Another competitor page about social scheduling tools."
+        tools.store_competitor_analysis(tools.fingerprint_competitor_pages(["example.com"]), "Analysis", "task")
+
+        pages = tools.fingerprint_competitor_pages(["example.com", "other.com"])
+        assert tools.stored_competitor_analysis(pages, "task") is None
+
+    def test_pages_fetched_once_per_instance(self, tools):
+        """Test each distinct page is scraped once however many ideas name it"""
+        tools.scrape_tool.pages["other.com"] = "Another competitor page about social scheduling tools."
+        tools.fetch_competitor_pages(["example.com", "other.com", "example.com"])
+        tools.fingerprint_competitor_pages(["example.com"])
+        tools.fingerprint_competitor_pages(["other.com", "example.com"])
+
+        assert tools.scrape_tool.calls == 2
+
+    def test_changed_page_is_reanalyzed(self, tools):
+        """Test a changed page produces a fresh analysis"""
+        tools.analyze_competitor_content(["example.com"])
+        tools.scrape_tool.pages["example.com"] = "Brand new pricing page with enterprise plans and annual discounts."
+
+        result = tools.analyze_competitor_content(["example.com"])
+        assert "unchanged_since" not in result
+        assert "enterprise plans" in result
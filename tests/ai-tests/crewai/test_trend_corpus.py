@@ -0,0 +1,246 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from app.core.config import settings
+from app.tools.content_tools.trend_corpus import TrendCorpus, TrendRecord, tokenize
+from app.tools.content_tools.trend_tools import ContentTrendTools
+
+
+@pytest.fixture
+def corpus_file(tmp_path):
+    """Fixture for a small JSONL trend corpus"""
+    records = [
+        {
+            "title": "AI content assistants in marketing",
+            "summary": "Generative AI drafts blog posts and social snippets",
+            "industry": "marketing",
+            "keywords": ["ai content", "automation"],
+            "hashtags": ["#AIMarketing"]
+        },
+        {
+            "title": "Remote work tools",
+            "summary": "Async collaboration for distributed teams",
+            "industry": "business",
+            "keywords": ["remote work"],
+            "hashtags": ["#RemoteWork"],
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        },
+        {
+            "title": "Edge AI models",
+            "summary": "On-device machine learning",
+            "industry": "technology",
+            "keywords": ["edge ai"]
+        }
+    ]
+    path = tmp_path / "trend_corpus.jsonl"
+    path.write_text("\n".join(json.dumps(record) for record in records) + "\n")
+    return path
+
+
+class TestTrendCorpus:
+    """Test suite for the local trend corpus"""
+
+    def test_tokenize_drops_stopwords(self):
+        """Test tokenization lowercases and removes stopwords"""
+        assert tokenize("The Trending AI tools for Marketing") == ["ai", "tools", "marketing"]
+
+    def test_load_from_jsonl(self, corpus_file):
+        """Test records are loaded from a JSONL file"""
+        corpus = TrendCorpus(corpus_file)
+        assert len(corpus) == 3
+
+    def test_invalid_lines_are_skipped(self, tmp_path):
+        """Test malformed lines do not break loading"""
+        path = tmp_path / "corpus.jsonl"
+        path.write_text('{"title": "Valid"}\nnot json\n{"summary": "missing title"}\n')
+        corpus = TrendCorpus(path)
+        assert len(corpus) == 1
+
+    def test_bm25_ranking(self, corpus_file):
+        """Test the most relevant record ranks first"""
+        corpus = TrendCorpus(corpus_file)
+        results = corpus.search("ai content automation")
+
+        assert results
+        assert results[0][0].title == "AI content assistants in marketing"
+        scores = [score for _, score in results]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_industry_boost(self, corpus_file):
+        """Test records from the requested industry are boosted"""
+        corpus = TrendCorpus(corpus_file)
+        results = corpus.search("ai", industry="technology")
+        assert results[0][0].industry == "technology"
+
+    def test_no_match(self, corpus_file):
+        """Test queries without matching tokens return nothing"""
+        corpus = TrendCorpus(corpus_file)
+        assert corpus.search("quantum gardening") == []
+
+    def test_reload_when_file_changes(self, corpus_file):
+        """Test the corpus refreshes after the file is rewritten"""
+        corpus = TrendCorpus(corpus_file)
+        corpus_file.write_text(json.dumps({"title": "Quantum gardening"}) + "\n")
+        corpus._mtime = -1  # Force staleness regardless of filesystem timestamp resolution
+
+        results = corpus.search("quantum gardening")
+        assert len(corpus) == 1
+        assert results[0][0].title == "Quantum gardening"
+
+    def test_answers_needs_fresh_record_covering_query(self, corpus_file):
+        """Test only recent records matching most query terms replace remote search"""
+        corpus = TrendCorpus(corpus_file)
+
+        assert corpus.answers("remote work", corpus.search("remote work"))
+        # Undated record: fallback only, however well it matches
+        assert not corpus.answers("ai content automation", corpus.search("ai content automation"))
+        # One of three query terms is not enough
+        assert not corpus.answers("remote gardening quantum", corpus.search("remote gardening quantum"))
+
+    def test_stale_record_does_not_answer(self):
+        """Test records older than the max age are fallback only"""
+        old = datetime.now(timezone.utc) - timedelta(days=settings.trend_corpus_max_age_days + 1)
+        corpus = TrendCorpus()
+        corpus.load_records([
+            TrendRecord(title="Remote work tools", keywords=["remote work"], updated_at=old),
+            TrendRecord(title="Edge AI models"),
+        ])
+
+        assert not corpus.answers("remote work", corpus.search("remote work"))
+
+    def test_updated_at_parsed(self, tmp_path):
+        """Test naive timestamps are read as UTC"""
+        path = tmp_path / "corpus.jsonl"
+        path.write_text(json.dumps({"title": "Dated", "updated_at": "2025-06-01T09:00:00"}) + "\n")
+        corpus = TrendCorpus(path)
+        assert corpus.records[0].updated_at == datetime(2025, 6, 1, 9, tzinfo=timezone.utc)
+
+    def test_missing_file_is_empty(self, tmp_path):
+        """Test a missing corpus file yields an empty corpus"""
+        corpus = TrendCorpus(tmp_path / "missing.jsonl")
+        assert len(corpus) == 0
+        assert corpus.search("anything") == []
+
+
+class TestTrendToolsWithCorpus:
+    """Test ContentTrendTools answering from the local corpus"""
+
+    def test_trending_topics_first_tier(self, corpus_file):
+        """Test a strong local match is returned without remote search"""
+        tools = ContentTrendTools(corpus=TrendCorpus(corpus_file))
+        tools.search_tool = None
+
+        result = tools.search_trending_topics("marketing", ["AI", "content"])
+        assert "local corpus" in result
+        assert "AI content assistants in marketing" in result
+
+    def test_social_trends_include_hashtags(self, corpus_file):
+        """Test social trend results carry corpus hashtags"""
+        tools = ContentTrendTools(corpus=TrendCorpus(corpus_file))
+        tools.search_tool = None
+
+        result = tools.search_social_trends("remote work")
+        assert "#RemoteWork" in result
+
+    def test_seed_corpus_does_not_replace_remote_search(self):
+        """Test partial matches against the undated seed records still go to remote search"""
+        tools = ContentTrendTools(corpus=TrendCorpus(settings.trend_corpus_path))
+        tools.search_tool = CountingSearchTool()
+
+        result = tools.search_social_trends("real estate")
+
+        assert tools.search_tool.queries == [tools.social_trends_query("real estate")]
+        assert result.startswith("Remote results for:")
+
+    def test_mock_fallback_without_matches(self, tmp_path):
+        """Test the mock response is kept when the corpus has no match"""
+        tools = ContentTrendTools(corpus=TrendCorpus(tmp_path / "empty.jsonl"))
+        tools.search_tool = None
+
+        result = tools.search_trending_topics("marketing", ["AI"])
+        assert result.startswith("Mock trend data for marketing")
+
+
+class CountingSearchTool:
+    """Search tool stub that records every query it receives"""
+
+    def __init__(self):
+        self.queries = []
+
+    def run(self, query):
+        self.queries.append(query)
+        return f"Remote results for: {query}"
+
+
+class TestBatchSearch:
+    """Test the batched multi-query search API"""
+
+    @pytest.fixture
+    def tools(self, tmp_path):
+        tools = ContentTrendTools(corpus=TrendCorpus(tmp_path / "empty.jsonl"))
+        tools.search_tool = CountingSearchTool()
+        return tools
+
+    def test_batch_search_dedupes(self, tools):
+        """Test duplicate queries are issued once and fanned back out"""
+        results = tools.batch_search(["ai tools", "remote work", "ai tools"])
+
+        assert sorted(tools.search_tool.queries) == ["ai tools", "remote work"]
+        assert results["ai tools"] == "Remote results for: ai tools"
+        assert len(results) == 2
+
+    def test_cached_queries_are_not_repeated(self, tools):
+        """Test later single searches reuse batched results"""
+        tools.batch_search([tools.social_trends_query("AI marketing")])
+        result = tools.search_social_trends("AI marketing")
+
+        assert len(tools.search_tool.queries) == 1
+        assert result.startswith("Remote results for:")
+
+    def test_search_ideas_fans_out(self, tools):
+        """Test each idea receives its own trending and social results"""
+        ideas = [
+            {"topic": "AI in Healthcare", "industry": "healthcare", "keywords": ["diagnostics"]},
+            {"topic": "AI in Healthcare", "industry": "healthcare", "keywords": ["diagnostics"]},
+            {"topic": "Remote Work", "industry": "business"}
+        ]
+        results = tools.search_ideas(ideas)
+
+        assert len(results) == 3
+        assert "AI in Healthcare" in results[0]["social_trends"]
+        assert results[0] == results[1]
+        # Two distinct ideas -> two trending queries and two social queries
+        assert len(tools.search_tool.queries) == 4
+
+    def test_search_ideas_skips_remote_for_strong_local_hits(self, corpus_file):
+        """Test ideas answered by the corpus do not trigger remote searches"""
+        tools = ContentTrendTools(corpus=TrendCorpus(corpus_file))
+        tools.search_tool = CountingSearchTool()
+
+        results = tools.search_ideas([{"topic": "remote work", "industry": "business", "keywords": ["remote work"]}])
+
+        assert tools.search_tool.queries == []
+        assert "#RemoteWork" in results[0]["social_trends"]
+
+    def test_search_ideas_ranks_corpus_once_per_query(self, corpus_file, monkeypatch):
+        """Test the first-tier decision and the per-idea searches share one corpus ranking"""
+        corpus = TrendCorpus(corpus_file)
+        tools = ContentTrendTools(corpus=corpus)
+        tools.search_tool = CountingSearchTool()
+        queries = []
+        original_search = corpus.search
+
+        def counting_search(query, industry=None, limit=5):
+            queries.append(query)
+            return original_search(query, industry=industry, limit=limit)
+
+        monkeypatch.setattr(corpus, "search", counting_search)
+        tools.search_ideas([
+            {"topic": "remote work", "industry": "business", "keywords": ["remote work"]},
+            {"topic": "AI in Healthcare", "industry": "healthcare", "keywords": ["diagnostics"]}
+        ])
+
+        # One trending and one social query per idea, each ranked once
+        assert len(queries) == 4
+        assert len(set(queries)) == 4
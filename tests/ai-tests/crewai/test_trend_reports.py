@@ -0,0 +1,138 @@
+import time
+import pytest
+from app.agents.content_crew.content_creation_crew import ContentCreationCrew
+from app.services.trend_report_scheduler import (
+    TrendReport,
+    TrendReportScheduler,
+    TrendReportStore,
+    build_trend_report
+)
+from app.tools.content_tools.trend_corpus import TrendCorpus
+from app.tools.content_tools.trend_tools import ContentTrendTools
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Fixture for a trend report store in a temporary directory"""
+    return TrendReportStore(tmp_path / "trend_reports")
+
+
+def make_report(industry="marketing", age_seconds=0):
+    return TrendReport(
+        industry=industry,
+        keywords=["ai content"],
+        trending_topics="AI copilots for campaign planning",
+        social_trends="#AIMarketing up 40% this week",
+        generated_at=time.time() - age_seconds
+    )
+
+
+class TestTrendReportStore:
+    """Test suite for the trend report store"""
+
+    def test_save_and_reload(self, store):
+        """Test reports persist across store instances"""
+        store.save(make_report())
+
+        reloaded = TrendReportStore(store.reports_dir)
+        report = reloaded.get("Marketing")
+        assert report is not None
+        assert report.trending_topics == "AI copilots for campaign planning"
+
+    def test_freshness(self, store):
+        """Test stale reports are not returned as fresh"""
+        store.save(make_report(age_seconds=7200))
+
+        assert store.get_fresh("marketing", max_age_seconds=3600) is None
+        assert store.get_fresh("marketing", max_age_seconds=10800) is not None
+
+    def test_sees_reports_written_by_another_process(self, store):
+        """Test a cached report is replaced once another store rewrites its file"""
+        store.save(make_report())
+        assert store.get("marketing").trending_topics == "AI copilots for campaign planning"
+
+        other_worker = TrendReportStore(store.reports_dir)
+        refreshed = make_report()
+        refreshed.trending_topics = "Agentic workflows"
+        time.sleep(0.01)
+        other_worker.save(refreshed)
+
+        assert store.get("marketing").trending_topics == "Agentic workflows"
+
+    def test_missing_industry(self, store):
+        """Test unknown industries have no report"""
+        assert store.get_fresh("aerospace") is None
+
+
+class TestTrendReportScheduler:
+    """Test suite for the trend report scheduler"""
+
+    def test_build_trend_report(self, tmp_path):
+        """Test a report is generated from trend tools"""
+        tools = ContentTrendTools(corpus=TrendCorpus(tmp_path / "empty.jsonl"))
+        tools.search_tool = None
+
+        report = build_trend_report(tools, "marketing", ["AI"])
+        assert report.industry == "marketing"
+        assert "marketing" in report.trending_topics.lower()
+        assert report.is_fresh(60)
+
+    def test_scheduler_refreshes_targets(self, store):
+        """Test the background thread writes reports for configured industries"""
+        scheduler = TrendReportScheduler(store, {"marketing": ["AI"], "technology": []}, interval_seconds=60)
+        scheduler.start()
+        try:
+            deadline = time.time() + 30
+            while time.time() < deadline and not (store.get("marketing") and store.get("technology")):
+                time.sleep(0.05)
+        finally:
+            scheduler.stop()
+
+        assert store.get("marketing") is not None
+        assert store.get("technology") is not None
+
+    def test_only_one_scheduler_refreshes(self, store):
+        """Test the scheduler lock lets a single process refresh until it stops"""
+        first = TrendReportScheduler(store, {"marketing": []}, interval_seconds=60)
+        second = TrendReportScheduler(store, {"marketing": []}, interval_seconds=60)
+        try:
+            assert first.acquire_leadership()
+            assert not second.acquire_leadership()
+            first.release_leadership()
+            assert second.acquire_leadership()
+        finally:
+            first.release_leadership()
+            second.release_leadership()
+
+    def test_scheduler_without_targets_does_not_start(self, store):
+        """Test no thread is started when nothing is configured"""
+        scheduler = TrendReportScheduler(store, {}, interval_seconds=60)
+        scheduler.start()
+        assert scheduler._thread is None
+
+
+class TestCrewUsesPrecomputedReports:
+    """Test the crew injects fresh precomputed reports"""
+
+    def test_fresh_report_replaces_live_research(self, store):
+        """Test the trend task carries the report instead of research instructions"""
+        crew = ContentCreationCrew()
+        crew.trend_reports = store
+        store.save(make_report())
+
+        task = crew.create_trend_research_task({"topic": "AI Tools", "industry": "marketing"})
+        assert "Precomputed trend report for marketing" in task.description
+        assert "Do not perform new research" in task.description
+
+    def test_prefetch_skips_covered_ideas(self, store):
+        """Test ideas covered by a fresh report are not searched"""
+        crew = ContentCreationCrew()
+        crew.trend_reports = store
+        store.save(make_report())
+
+        trend_data = crew.prefetch_trend_data([
+            {"topic": "AI Tools", "industry": "marketing"},
+            {"topic": "Edge AI", "industry": "technology"}
+        ])
+        assert trend_data[0] is None
+        assert trend_data[1] is not None
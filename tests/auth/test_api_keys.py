@@ -0,0 +1,86 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import dependencies
+from app.core.api_keys import API_KEY_HEADER, ApiKeyStore, generate_api_key, hash_api_key
+from app.main import app
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def service_key(monkeypatch):
+    """Fixture registering a fresh API key for johndoe"""
+    key = generate_api_key()
+    store = ApiKeyStore({hash_api_key(key): "johndoe"})
+    monkeypatch.setattr(dependencies, "api_key_store", store)
+    return key
+
+
+class TestApiKeyStore:
+    """Test suite for HMAC-digest API key verification"""
+
+    def test_verify_known_key(self):
+        """Test a registered key resolves to its username"""
+        key = generate_api_key()
+        store = ApiKeyStore({hash_api_key(key): "n8n"})
+        assert store.verify(key) == "n8n"
+
+    def test_unknown_key(self):
+        """Test unregistered keys are rejected"""
+        store = ApiKeyStore({hash_api_key(generate_api_key()): "n8n"})
+        assert store.verify("not-a-key") is None
+
+    def test_digest_depends_on_secret(self):
+        """Test digests are keyed with the server secret"""
+        assert hash_api_key("key", b"secret-a") != hash_api_key("key", b"secret-b")
+
+    def test_revoke(self):
+        """Test revoked keys stop working"""
+        key = generate_api_key()
+        digest = hash_api_key(key)
+        store = ApiKeyStore({digest: "n8n"})
+        store.revoke(digest)
+        assert store.verify(key) is None
+
+    def test_keys_are_not_stored(self):
+        """Test only the digest is kept"""
+        key = generate_api_key()
+        store = ApiKeyStore({hash_api_key(key): "n8n"})
+        assert key not in str(store._records)
+
+
+class TestApiKeyAuthentication:
+    """Test API keys authenticate requests alongside bearer tokens"""
+
+    def test_api_key_authenticates(self, service_key):
+        """Test a valid service key reaches a protected endpoint"""
+        response = client.get("/api/v1/users/me/", headers={API_KEY_HEADER: service_key})
+        assert response.status_code == 200
+        assert response.json()["username"] == "johndoe"
+
+    def test_invalid_api_key(self, service_key):
+        """Test an invalid service key is rejected"""
+        response = client.get("/api/v1/users/me/", headers={API_KEY_HEADER: "wrong"})
+        assert response.status_code == 401
+
+    def test_key_for_unknown_user(self, monkeypatch):
+        """Test a key mapped to a missing user is rejected"""
+        key = generate_api_key()
+        monkeypatch.setattr(dependencies, "api_key_store", ApiKeyStore({hash_api_key(key): "ghost"}))
+        response = client.get("/api/v1/users/me/", headers={API_KEY_HEADER: key})
+        assert response.status_code == 401
+
+    def test_no_credentials(self):
+        """Test requests without any credentials are rejected"""
+        response = client.get("/api/v1/users/me/")
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Not authenticated"
+
+    def test_bearer_token_still_works(self):
+        """Test OAuth2 bearer tokens keep working"""
+        token = client.post(
+            "/api/v1/token", data={"username": "johndoe", "password": "password"}
+        ).json()["access_token"]
+        response = client.get("/api/v1/users/me/", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200
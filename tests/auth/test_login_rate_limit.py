@@ -0,0 +1,146 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from starlette.requests import Request
+
+from app.core.rate_limit import TokenBucketLimiter, client_ip, login_attempts_rejected_total, login_rate_limiter
+from app.main import app
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def fresh_limiter():
+    """Fixture giving each test empty login buckets"""
+    login_rate_limiter.reset()
+    yield login_rate_limiter
+    login_rate_limiter.reset()
+
+
+class TestTokenBucketLimiter:
+    """Test suite for the sharded token bucket"""
+
+    def test_allows_burst_then_rejects(self):
+        """Test a key may use its burst and is then rejected"""
+        limiter = TokenBucketLimiter(rate_per_minute=60, burst=3)
+        assert [limiter.acquire("alice") for _ in range(3)] == [None, None, None]
+        retry_after = limiter.acquire("alice")
+        assert retry_after is not None and 0 < retry_after <= 1
+        assert limiter.rejected == 1
+
+    def test_keys_are_independent(self):
+        """Test exhausting one key leaves others untouched"""
+        limiter = TokenBucketLimiter(rate_per_minute=60, burst=1)
+        assert limiter.acquire("alice") is None
+        assert limiter.acquire("alice") is not None
+        assert limiter.acquire("bob") is None
+
+    def test_refills_over_time(self, monkeypatch):
+        """Test tokens come back at the configured rate"""
+        now = [1000.0]
+        monkeypatch.setattr("app.core.rate_limit.time.monotonic", lambda: now[0])
+        limiter = TokenBucketLimiter(rate_per_minute=60, burst=1)
+        assert limiter.acquire("alice") is None
+        assert limiter.acquire("alice") is not None
+        now[0] += 1.0
+        assert limiter.acquire("alice") is None
+
+    def test_prunes_full_buckets(self, monkeypatch):
+        """Test idle buckets are dropped when a shard is full"""
+        now = [1000.0]
+        monkeypatch.setattr("app.core.rate_limit.time.monotonic", lambda: now[0])
+        limiter = TokenBucketLimiter(rate_per_minute=60, burst=1, shards=1, max_keys_per_shard=2)
+        limiter.acquire("a")
+        limiter.acquire("b")
+        now[0] += 10
+        limiter.acquire("c")
+        assert list(limiter._shards[0][1]) == ["c"]
+
+    def test_flood_of_distinct_keys_stays_bounded(self):
+        """Test active buckets are evicted when none have refilled"""
+        limiter = TokenBucketLimiter(rate_per_minute=1, burst=1, shards=1, max_keys_per_shard=100)
+        for i in range(1000):
+            limiter.acquire(f"attacker-{i}")
+        assert len(limiter._shards[0][1]) <= 100
+        assert "attacker-999" in limiter._shards[0][1]
+
+
+def make_request(peer: str, forwarded_for=None) -> Request:
+    headers = [(b"x-forwarded-for", value.encode()) for value in forwarded_for or []]
+    return Request({"type": "http", "headers": headers, "client": (peer, 1234)})
+
+
+class TestClientIp:
+    """Test suite for resolving the client address behind proxies"""
+
+    def test_direct_connection_ignores_forwarded_for(self):
+        """Test a forged header is ignored when no proxy is trusted"""
+        assert client_ip(make_request("203.0.113.7", ["10.0.0.1"]), trusted_proxy_hops=0) == "203.0.113.7"
+
+    def test_one_trusted_proxy(self):
+        """Test the entry appended by the proxy is used, not one supplied by the client"""
+        request = make_request("10.1.1.1", ["1.2.3.4, 198.51.100.9"])
+        assert client_ip(request, trusted_proxy_hops=1) == "198.51.100.9"
+
+    def test_multiple_headers_and_hops(self):
+        """Test entries across repeated headers are counted from the right"""
+        request = make_request("10.1.1.1", ["198.51.100.9", "10.0.0.2"])
+        assert client_ip(request, trusted_proxy_hops=2) == "198.51.100.9"
+
+    def test_missing_header_falls_back_to_peer(self):
+        """Test the socket address is used when the proxy sent no header"""
+        assert client_ip(make_request("10.1.1.1"), trusted_proxy_hops=1) == "10.1.1.1"
+
+
+class TestLoginRateLimit:
+    """Test suite for rate limiting on the /token endpoint"""
+
+    def test_rejects_with_429_before_hashing(self, monkeypatch):
+        """Test the limit kicks in without running bcrypt"""
+        limit = login_rate_limiter.by_username.burst
+        for _ in range(limit):
+            client.post("/api/v1/token", data={"username": "johndoe", "password": "wrong"})
+
+        async def fail(*args, **kwargs):
+            raise AssertionError("password was verified")
+
+        monkeypatch.setattr("app.api.v1.endpoints.auth.verify_and_update_password_async", fail)
+        response = client.post("/api/v1/token", data={"username": "johndoe", "password": "password"})
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+        assert login_rate_limiter.counters()["username"] == 1
+
+    def test_rejections_exported_as_metrics(self):
+        """Test rejections show up in the metrics registry"""
+        before = login_attempts_rejected_total.value(("username",))
+        for _ in range(login_rate_limiter.by_username.burst + 1):
+            client.post("/api/v1/token", data={"username": "nosuchuser", "password": "wrong"})
+
+        assert login_attempts_rejected_total.value(("username",)) == before + 1
+        assert 'login_attempts_rejected_total{limit="username"}' in client.get("/metrics").text
+
+    def test_username_limit_is_case_insensitive(self):
+        """Test varying the username case does not bypass the limit"""
+        limit = login_rate_limiter.by_username.burst
+        for i in range(limit):
+            name = "JohnDoe" if i % 2 else "johndoe"
+            client.post("/api/v1/token", data={"username": name, "password": "wrong"})
+        response = client.post("/api/v1/token", data={"username": "JOHNDOE", "password": "wrong"})
+        assert response.status_code == 429
+
+    def test_ip_limit_covers_many_usernames(self):
+        """Test one client spraying usernames hits the per-IP limit"""
+        limit = login_rate_limiter.by_ip.burst
+        for i in range(limit):
+            client.post("/api/v1/token", data={"username": f"user{i}", "password": "wrong"})
+        response = client.post("/api/v1/token", data={"username": "someone", "password": "wrong"})
+        assert response.status_code == 429
+        assert login_rate_limiter.counters()["ip"] == 1
+
+    def test_disabled_limit(self, monkeypatch):
+        """Test the limiter can be switched off"""
+        monkeypatch.setattr("app.core.rate_limit.settings.login_rate_limit_enabled", False)
+        limit = login_rate_limiter.by_username.burst
+        for _ in range(limit + 1):
+            response = client.post("/api/v1/token", data={"username": "nobody", "password": "wrong"})
+            assert response.status_code == 401
@@ -0,0 +1,165 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import importlib.util
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.core import security
+from app.core.config import Settings
+from app.core.security import (
+    PasswordHashingBusy,
+    build_password_context,
+    get_password_hash,
+    get_password_hash_async,
+    verify_password_async
+)
+from app.db.database import fake_users_db
+from app.main import app
+
+client = TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def password_hash():
+    """Fixture for a bcrypt hash of 'password'"""
+    return get_password_hash("password")
+
+
+@pytest.fixture
+def small_hash_pool(monkeypatch):
+    """Fixture replacing the hashing pool with one worker and no queue"""
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(security, "_hash_executor", executor)
+    monkeypatch.setattr(security, "_hash_slots", threading.BoundedSemaphore(1))
+    yield executor
+    executor.shutdown(wait=True)
+
+
+class TestPasswordHashingPool:
+    """Test suite for password hashing on the dedicated CPU pool"""
+
+    def test_verify_password_async(self, password_hash):
+        """Test async verification accepts the right password only"""
+        assert asyncio.run(verify_password_async("password", password_hash)) is True
+        assert asyncio.run(verify_password_async("wrong", password_hash)) is False
+
+    def test_get_password_hash_async(self):
+        """Test async hashing produces a verifiable hash"""
+        hashed = asyncio.run(get_password_hash_async("s3cret"))
+        assert security.verify_password("s3cret", hashed)
+
+    def test_event_loop_keeps_running_during_verify(self, password_hash):
+        """Test other coroutines make progress while bcrypt runs"""
+        async def scenario():
+            ticks = 0
+            verify = asyncio.create_task(verify_password_async("password", password_hash))
+            while not verify.done():
+                ticks += 1
+                await asyncio.sleep(0.001)
+            return ticks, verify.result()
+
+        ticks, result = asyncio.run(scenario())
+        assert result is True
+        assert ticks > 1
+
+    def test_full_queue_fails_fast(self, small_hash_pool, password_hash):
+        """Test requests beyond the queue limit are rejected"""
+        release = threading.Event()
+        small_hash_pool.submit(release.wait)
+
+        async def scenario():
+            first = asyncio.create_task(verify_password_async("password", password_hash))
+            await asyncio.sleep(0)
+            with pytest.raises(PasswordHashingBusy):
+                await verify_password_async("password", password_hash)
+            release.set()
+            return await first
+
+        assert asyncio.run(scenario()) is True
+
+
+class TestLoginUsesHashingPool:
+    """Test the /token endpoint with the hashing pool"""
+
+    def test_login_success(self):
+        """Test valid credentials return a bearer token"""
+        response = client.post("/api/v1/token", data={"username": "johndoe", "password": "password"})
+        assert response.status_code == 200
+        assert response.json()["token_type"] == "bearer"
+
+    def test_login_wrong_password(self):
+        """Test invalid credentials are rejected"""
+        response = client.post("/api/v1/token", data={"username": "johndoe", "password": "wrong"})
+        assert response.status_code == 401
+
+    def test_login_when_pool_is_full(self, monkeypatch):
+        """Test a saturated pool returns 503 with Retry-After"""
+        monkeypatch.setattr(security, "_hash_executor", ThreadPoolExecutor(max_workers=1))
+        monkeypatch.setattr(security, "_hash_slots", threading.BoundedSemaphore(1))
+        security._hash_slots.acquire()
+
+        response = client.post("/api/v1/token", data={"username": "johndoe", "password": "password"})
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+
+class TestPasswordHashPolicy:
+    """Test suite for the configurable hashing policy and rehash on login"""
+
+    def test_policy_uses_configured_cost(self):
+        """Test new hashes use the configured bcrypt cost"""
+        context = build_password_context("bcrypt", bcrypt_rounds=4)
+        assert context.hash("password").startswith("$2b$04$")
+
+    def test_other_cost_needs_update(self):
+        """Test hashes with another cost are flagged for rehash"""
+        old_hash = build_password_context("bcrypt", bcrypt_rounds=4).hash("password")
+        context = build_password_context("bcrypt", bcrypt_rounds=5)
+        ok, new_hash = context.verify_and_update("password", old_hash)
+        assert ok is True
+        assert new_hash.startswith("$2b$05$")
+        assert context.verify_and_update("wrong", old_hash) == (False, None)
+
+    def test_unknown_scheme(self):
+        """Test an unknown scheme is rejected"""
+        with pytest.raises(ValueError):
+            build_password_context("md5_crypt")
+
+    def test_settings_reject_unknown_scheme(self):
+        """Test a misspelled scheme fails when settings load"""
+        with pytest.raises(ValidationError):
+            Settings(password_hash_scheme="argon")
+
+    def test_settings_reject_argon2_without_backend(self, monkeypatch):
+        """Test argon2 without argon2-cffi fails when settings load, not at first login"""
+        find_spec = importlib.util.find_spec
+        monkeypatch.setattr(
+            importlib.util, "find_spec", lambda name, *args: None if name == "argon2" else find_spec(name, *args)
+        )
+        with pytest.raises(ValidationError, match="argon2-cffi"):
+            Settings(password_hash_scheme="argon2")
+
+    def test_login_upgrades_outdated_hash(self, monkeypatch):
+        """Test a successful login stores a hash under the current policy"""
+        monkeypatch.setattr(security, "pwd_context", build_password_context("bcrypt", bcrypt_rounds=5))
+        old_hash = build_password_context("bcrypt", bcrypt_rounds=4).hash("password")
+        fake_users_db.add_user("rehash_user", {
+            "username": "rehash_user",
+            "email": "rehash@example.com",
+            "hashed_password": old_hash,
+            "disabled": False,
+        })
+
+        response = client.post("/api/v1/token", data={"username": "rehash_user", "password": "password"})
+        assert response.status_code == 200
+        new_hash = fake_users_db.get_user("rehash_user").hashed_password
+        assert new_hash.startswith("$2b$05$")
+        assert security.verify_password("password", new_hash)
+
+        # A second login finds nothing to upgrade
+        client.post("/api/v1/token", data={"username": "rehash_user", "password": "password"})
+        assert fake_users_db.get_user("rehash_user").hashed_password == new_hash
@@ -0,0 +1,118 @@
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.config import settings
+from app.db.sqlite_users import SQLiteUserRepository
+
+NEW_USER = {
+    "username": "janedoe",
+    "full_name": "Jane Doe",
+    "email": "janedoe@example.com",
+    "hashed_password": "$2b$12$go/kUbiHTL7D/0ysuIaqRu9x8IMKDh9YcWEHGnGG1IqMZ0UTBelMC",
+    "disabled": False
+}
+
+
+@pytest.fixture
+def repository(tmp_path):
+    """Fixture for a seeded SQLite repository in a temporary directory"""
+    repository = SQLiteUserRepository(tmp_path / "users.sqlite3", pool_size=2, seed_path=settings.seed_users_path)
+    yield repository
+    repository.close()
+
+
+class TestSQLiteUserRepository:
+    """Test suite for the SQLite-backed user store"""
+
+    def test_seed_users(self, repository):
+        """Test seed users are inserted into an empty database"""
+        user = repository.get_user("johndoe")
+        assert user is not None
+        assert user.email == "johndoe@example.com"
+        assert user.disabled is False
+
+    def test_add_and_get_user(self, repository):
+        """Test added users can be read back"""
+        repository.add_user("janedoe", NEW_USER)
+
+        assert repository.user_exists("janedoe")
+        assert repository.get_user("janedoe").full_name == "Jane Doe"
+        assert repository.get_user("missing") is None
+
+    def test_add_user_updates_existing(self, repository):
+        """Test adding an existing username updates it in place"""
+        repository.add_user("janedoe", NEW_USER)
+        repository.add_user("janedoe", {**NEW_USER, "disabled": True})
+        assert repository.get_user("janedoe").disabled is True
+
+    def test_version_bumped_on_update(self, repository):
+        """Test each write bumps the user's version"""
+        repository.add_user("janedoe", NEW_USER)
+        assert repository.get_user("janedoe").version == 0
+        repository.add_user("janedoe", {**NEW_USER, "full_name": "Jane"})
+        assert repository.get_user("janedoe").version == 1
+
+    def test_adds_version_column_to_old_database(self, tmp_path):
+        """Test databases created without the version column are migrated"""
+        path = tmp_path / "old.sqlite3"
+        connection = sqlite3.connect(path)
+        connection.execute(
+            "CREATE TABLE users (username TEXT NOT NULL PRIMARY KEY, email TEXT, full_name TEXT, "
+            "hashed_password TEXT NOT NULL, disabled INTEGER NOT NULL DEFAULT 0)"
+        )
+        connection.commit()
+        connection.close()
+
+        repository = SQLiteUserRepository(path, pool_size=1)
+        try:
+            repository.add_user("janedoe", NEW_USER)
+            assert repository.get_user("janedoe").version == 0
+        finally:
+            repository.close()
+
+    def test_persists_across_instances(self, repository, tmp_path):
+        """Test users survive a restart, like a second worker opening the file"""
+        repository.add_user("janedoe", NEW_USER)
+
+        other = SQLiteUserRepository(repository.path, pool_size=1)
+        try:
+            assert other.get_user("janedoe") is not None
+        finally:
+            other.close()
+
+    def test_wal_mode_and_indexes(self, repository):
+        """Test the database uses WAL and indexes username and email"""
+        repository.user_exists("johndoe")
+        connection = sqlite3.connect(repository.path)
+        try:
+            assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            plan = connection.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM users WHERE email = ?", ("x",)
+            ).fetchall()
+            assert "idx_users_email" in str(plan)
+            plan = connection.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM users WHERE username = ?", ("x",)
+            ).fetchall()
+            assert "INDEX" in str(plan)
+        finally:
+            connection.close()
+
+    def test_async_access(self, repository):
+        """Test the async methods run on the pool"""
+        async def scenario():
+            await repository.aadd_user("janedoe", NEW_USER)
+            results = await asyncio.gather(*[repository.aget_user("janedoe") for _ in range(10)])
+            return results, await repository.auser_exists("janedoe")
+
+        results, exists = asyncio.run(scenario())
+        assert exists
+        assert all(user.username == "janedoe" for user in results)
+
+    def test_concurrent_threads(self, repository):
+        """Test the connection pool serves many threads"""
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            users = list(executor.map(repository.get_user, ["johndoe"] * 50))
+        assert all(user is not None for user in users)
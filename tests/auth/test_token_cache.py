@@ -0,0 +1,124 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import dependencies
+from app.core.config import settings
+from app.core.token_cache import TokenCache, create_token_cache, token_cache
+from app.db.database import users_db
+from app.main import app
+from app.models.user import UserInDB
+
+client = TestClient(app)
+
+
+def make_user(username="johndoe", disabled=False):
+    return UserInDB(username=username, hashed_password="x", disabled=disabled)
+
+
+@pytest.fixture
+def access_token():
+    """Fixture for a bearer token obtained through /token"""
+    response = client.post("/api/v1/token", data={"username": "johndoe", "password": "password"})
+    return response.json()["access_token"]
+
+
+class TestTokenCache:
+    """Test suite for the decoded-JWT LRU cache"""
+
+    def test_put_and_get(self):
+        """Test cached tokens return their user"""
+        cache = TokenCache(max_size=10)
+        cache.put("token", make_user(), time.time() + 60)
+        assert cache.get("token").username == "johndoe"
+
+    def test_expired_entries_are_dropped(self):
+        """Test entries are not served past the token expiry"""
+        cache = TokenCache(max_size=10)
+        cache.put("token", make_user(), time.time() - 1)
+        assert cache.get("token") is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        """Test the least recently used token is evicted first"""
+        cache = TokenCache(max_size=2)
+        expires_at = time.time() + 60
+        cache.put("a", make_user("a"), expires_at)
+        cache.put("b", make_user("b"), expires_at)
+        cache.get("a")
+        cache.put("c", make_user("c"), expires_at)
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+
+    def test_invalidate_user(self):
+        """Test all tokens of a user can be dropped at once"""
+        cache = TokenCache(max_size=10)
+        expires_at = time.time() + 60
+        cache.put("t1", make_user("johndoe"), expires_at)
+        cache.put("t2", make_user("johndoe"), expires_at)
+        cache.put("t3", make_user("janedoe"), expires_at)
+
+        cache.invalidate_user("johndoe")
+        assert cache.get("t1") is None
+        assert cache.get("t2") is None
+        assert cache.get("t3") is not None
+
+    def test_ttl_caps_entry_lifetime(self):
+        """Test entries expire after the TTL even if the token is still valid"""
+        cache = TokenCache(max_size=10, ttl_seconds=0.05)
+        cache.put("token", make_user(), time.time() + 60)
+        assert cache.get("token") is not None
+
+        time.sleep(0.1)
+        assert cache.get("token") is None
+
+    def test_shared_user_store_uses_ttl(self, monkeypatch):
+        """Test the sqlite user store bounds how long other workers serve stale users"""
+        monkeypatch.setattr(settings, "user_store_backend", "sqlite")
+        assert create_token_cache().ttl_seconds == settings.token_cache_shared_ttl_seconds
+
+        monkeypatch.setattr(settings, "user_store_backend", "memory")
+        assert create_token_cache().ttl_seconds is None
+
+    def test_disabled_cache(self):
+        """Test a zero-size cache stores nothing"""
+        cache = TokenCache(max_size=0)
+        cache.put("token", make_user(), time.time() + 60)
+        assert cache.get("token") is None
+
+
+class TestCurrentUserCaching:
+    """Test get_current_user skips decoding for cached tokens"""
+
+    def test_repeat_requests_skip_jwt_decode(self, access_token, monkeypatch):
+        """Test only the first request with a token decodes it"""
+        token_cache.clear()
+        decode_calls = []
+        original_decode = dependencies.jwt.decode
+
+        def counting_decode(*args, **kwargs):
+            decode_calls.append(1)
+            return original_decode(*args, **kwargs)
+
+        monkeypatch.setattr(dependencies.jwt, "decode", counting_decode)
+        headers = {"Authorization": f"Bearer {access_token}"}
+        for _ in range(3):
+            assert client.get("/api/v1/users/me/", headers=headers).status_code == 200
+
+        assert len(decode_calls) == 1
+
+    def test_disabling_user_invalidates_cached_tokens(self, access_token):
+        """Test a user update is visible on the next request"""
+        token_cache.clear()
+        headers = {"Authorization": f"Bearer {access_token}"}
+        assert client.get("/api/v1/users/me/", headers=headers).status_code == 200
+
+        original = users_db.get_user("johndoe")
+        users_db.add_user("johndoe", original.model_copy(update={"disabled": True}))
+        try:
+            assert client.get("/api/v1/users/me/", headers=headers).status_code == 400
+        finally:
+            users_db.add_user("johndoe", original)
@@ -0,0 +1,221 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from app.core.rate_limit import login_rate_limiter
+from app.core.revocation import BloomFilter, SQLiteRevocationList, TokenRevocationList
+from app.core.security import ALGORITHM, SECRET_KEY, create_access_token
+from app.core.token_cache import token_cache
+from app.main import app
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def revocations(tmp_path, monkeypatch):
+    """Fixture routing token revocation to a temporary list"""
+    revocations = TokenRevocationList(tmp_path / "revoked.jsonl", capacity=100, reload_seconds=0)
+    monkeypatch.setattr("app.api.v1.endpoints.auth.revocation_list", revocations)
+    monkeypatch.setattr("app.core.dependencies.revocation_list", revocations)
+    login_rate_limiter.reset()
+    token_cache.clear()
+    yield revocations
+    token_cache.clear()
+
+
+def login():
+    response = client.post("/api/v1/token", data={"username": "johndoe", "password": "password"})
+    assert response.status_code == 200
+    return response.json()
+
+
+class TestBloomFilter:
+    """Test suite for the Bloom filter"""
+
+    def test_no_false_negatives(self):
+        """Test every added item is reported present"""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        items = [f"jti-{i}" for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+        assert all(item in bloom for item in items)
+
+    def test_false_positive_rate(self):
+        """Test the false positive rate stays near the configured rate"""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"jti-{i}")
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        assert false_positives < 300
+
+
+class TestTokenRevocationList:
+    """Test suite for the persistent revocation list"""
+
+    def test_revoke_and_check(self, tmp_path):
+        """Test revoked ids are reported and others are not"""
+        revocations = TokenRevocationList(tmp_path / "revoked.jsonl")
+        revocations.revoke("abc", time.time() + 60)
+        assert revocations.is_revoked("abc") is True
+        assert revocations.is_revoked("xyz") is False
+
+    def test_shared_between_instances(self, tmp_path):
+        """Test another worker's revocations are picked up from the file"""
+        path = tmp_path / "revoked.jsonl"
+        worker_a = TokenRevocationList(path, reload_seconds=0)
+        worker_b = TokenRevocationList(path, reload_seconds=0)
+        assert worker_b.is_revoked("abc") is False
+        worker_a.revoke("abc", time.time() + 60)
+        assert worker_b.is_revoked("abc") is True
+
+    def test_expired_entries(self, tmp_path):
+        """Test expired revocations are ignored and dropped by compaction"""
+        revocations = TokenRevocationList(tmp_path / "revoked.jsonl")
+        revocations.revoke("old", time.time() - 1)
+        revocations.revoke("new", time.time() + 60)
+        assert revocations.is_revoked("old") is False
+        assert revocations.compact() == 1
+        assert revocations.is_revoked("new") is True
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def make_list(request, tmp_path):
+    """Fixture building revocation lists of either backend over one shared location"""
+    if request.param == "file":
+        # A long reload interval: claims must not depend on the periodic re-read
+        return lambda: TokenRevocationList(tmp_path / "revoked.jsonl", capacity=100, reload_seconds=60)
+    return lambda: SQLiteRevocationList(tmp_path / "users.sqlite3", capacity=100, reload_seconds=60)
+
+
+class TestRevokeIfAbsent:
+    """Test suite for the atomic single-use claim on a token id"""
+
+    def test_claims_once(self, make_list):
+        """Test only the first claim succeeds"""
+        revocations = make_list()
+        assert revocations.revoke_if_absent("abc", time.time() + 60) is True
+        assert revocations.revoke_if_absent("abc", time.time() + 60) is False
+        assert revocations.is_revoked("abc") is True
+
+    def test_claims_once_across_workers(self, make_list):
+        """Test another worker's claim is seen before its reload interval passes"""
+        worker_a, worker_b = make_list(), make_list()
+        assert worker_b.is_revoked("abc") is False
+        assert worker_a.revoke_if_absent("abc", time.time() + 60) is True
+        assert worker_b.revoke_if_absent("abc", time.time() + 60) is False
+
+    def test_concurrent_claims(self, make_list):
+        """Test exactly one of many concurrent claims succeeds"""
+        workers = [make_list() for _ in range(4)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            claims = list(executor.map(
+                lambda i: workers[i % 4].revoke_if_absent("abc", time.time() + 60), range(16)
+            ))
+        assert claims.count(True) == 1
+
+    def test_async_variants(self, make_list):
+        """Test the async methods agree with the sync ones"""
+        revocations = make_list()
+
+        async def run():
+            assert await revocations.ais_revoked("abc") is False
+            assert await revocations.arevoke_if_absent("abc", time.time() + 60) is True
+            assert await revocations.ais_revoked("abc") is True
+            await revocations.arevoke("xyz", time.time() + 60)
+            assert await revocations.ais_revoked("xyz") is True
+
+        asyncio.run(run())
+
+
+class TestSQLiteRevocationList:
+    """Test suite for the Bloom-filtered SQLite revocation table"""
+
+    def test_unrevoked_tokens_need_no_query(self, tmp_path):
+        """Test a fresh filter answers for never-revoked tokens without touching the database"""
+        revocations = SQLiteRevocationList(tmp_path / "users.sqlite3", capacity=100, reload_seconds=60)
+        revocations.revoke("abc", time.time() + 60)
+        queries = []
+        revocations._connect().set_trace_callback(queries.append)
+
+        assert all(revocations.is_revoked(f"token-{i}") is False for i in range(50))
+        assert asyncio.run(revocations.ais_revoked("token-x")) is False
+        assert revocations.is_revoked("abc") is True
+        assert len(queries) == 1
+
+    def test_other_workers_picked_up_after_reload(self, tmp_path):
+        """Test rows inserted by another worker reach the filter on the next catch-up read"""
+        path = tmp_path / "users.sqlite3"
+        worker_a = SQLiteRevocationList(path, capacity=100, reload_seconds=0)
+        worker_b = SQLiteRevocationList(path, capacity=100, reload_seconds=0)
+        assert worker_b.is_revoked("abc") is False
+        worker_a.revoke("abc", time.time() + 60)
+        assert worker_b.is_revoked("abc") is True
+
+    def test_compact(self, tmp_path):
+        """Test expired rows are deleted and live ones kept"""
+        revocations = SQLiteRevocationList(tmp_path / "users.sqlite3", capacity=100)
+        revocations.revoke("old", time.time() - 1)
+        revocations.revoke("new", time.time() + 60)
+        assert revocations.compact() == 1
+        assert revocations.is_revoked("old") is False
+        assert revocations.is_revoked("new") is True
+
+
+class TestRefreshTokens:
+    """Test suite for refresh and revoke endpoints"""
+
+    def test_login_returns_refresh_token(self, revocations):
+        """Test login issues an access and a refresh token"""
+        tokens = login()
+        assert jwt.decode(tokens["access_token"], SECRET_KEY, algorithms=[ALGORITHM])["type"] == "access"
+        assert jwt.decode(tokens["refresh_token"], SECRET_KEY, algorithms=[ALGORITHM])["type"] == "refresh"
+
+    def test_refresh_rotates_tokens(self, revocations):
+        """Test a refresh token works exactly once"""
+        tokens = login()
+        response = client.post("/api/v1/token/refresh", json={"refresh_token": tokens["refresh_token"]})
+        assert response.status_code == 200
+        new_tokens = response.json()
+        assert new_tokens["refresh_token"] != tokens["refresh_token"]
+
+        headers = {"Authorization": f"Bearer {new_tokens['access_token']}"}
+        assert client.get("/api/v1/users/me/", headers=headers).status_code == 200
+
+        replay = client.post("/api/v1/token/refresh", json={"refresh_token": tokens["refresh_token"]})
+        assert replay.status_code == 401
+
+    def test_concurrent_refreshes(self, revocations):
+        """Test concurrent exchanges of one refresh token issue tokens once"""
+        tokens = login()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            responses = list(executor.map(
+                lambda _: client.post("/api/v1/token/refresh", json={"refresh_token": tokens["refresh_token"]}),
+                range(4)
+            ))
+        assert sorted(response.status_code for response in responses) == [200, 401, 401, 401]
+
+    def test_access_token_cannot_refresh(self, revocations):
+        """Test only refresh tokens are accepted at /token/refresh"""
+        tokens = login()
+        response = client.post("/api/v1/token/refresh", json={"refresh_token": tokens["access_token"]})
+        assert response.status_code == 401
+
+    def test_refresh_token_cannot_authenticate(self, revocations):
+        """Test refresh tokens are rejected as bearer tokens"""
+        tokens = login()
+        headers = {"Authorization": f"Bearer {tokens['refresh_token']}"}
+        assert client.get("/api/v1/users/me/", headers=headers).status_code == 401
+
+    def test_revoked_access_token_rejected_despite_cache(self, revocations):
+        """Test revocation applies to tokens already in the token cache"""
+        token = create_access_token(data={"sub": "johndoe"})
+        headers = {"Authorization": f"Bearer {token}"}
+        assert client.get("/api/v1/users/me/", headers=headers).status_code == 200
+
+        response = client.post("/api/v1/token/revoke", json={"token": token})
+        assert response.status_code == 204
+        assert client.get("/api/v1/users/me/", headers=headers).status_code == 401
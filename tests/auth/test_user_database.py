@@ -0,0 +1,60 @@
+import json
+
+from app.core import security
+from app.db.database import FakeUserDatabase, load_seed_users
+
+
+def write_seed_file(tmp_path, users):
+    path = tmp_path / "seed_users.json"
+    path.write_text(json.dumps(users))
+    return path
+
+
+SEED_USER = {
+    "username": "janedoe",
+    "full_name": "Jane Doe",
+    "email": "janedoe@example.com",
+    "hashed_password": "$2b$12$go/kUbiHTL7D/0ysuIaqRu9x8IMKDh9YcWEHGnGG1IqMZ0UTBelMC",
+    "disabled": False
+}
+
+
+class TestFakeUserDatabase:
+    """Test suite for the seeded in-memory user store"""
+
+    def test_default_seed_user(self):
+        """Test the bundled seed file provides johndoe with a valid hash"""
+        user = FakeUserDatabase().get_user("johndoe")
+        assert user is not None
+        assert security.verify_password("password", user.hashed_password)
+
+    def test_seed_file_is_read_lazily(self, tmp_path):
+        """Test nothing is loaded until the store is first used"""
+        path = write_seed_file(tmp_path, [SEED_USER])
+        db = FakeUserDatabase(seed_path=path)
+        assert db._users_data is None
+
+        assert db.user_exists("janedoe")
+        assert db._users_data is not None
+
+    def test_construction_does_no_hashing(self, tmp_path, monkeypatch):
+        """Test building and querying the store never calls bcrypt"""
+        def fail(*args, **kwargs):
+            raise AssertionError("password hashing during store setup")
+
+        monkeypatch.setattr(security, "get_password_hash", fail)
+        monkeypatch.setattr(security.pwd_context, "hash", fail)
+
+        db = FakeUserDatabase(seed_path=write_seed_file(tmp_path, [SEED_USER]))
+        assert db.get_user("janedoe").full_name == "Jane Doe"
+
+    def test_missing_seed_file(self, tmp_path):
+        """Test a missing seed file yields an empty store"""
+        assert load_seed_users(tmp_path / "missing.json") == {}
+        assert FakeUserDatabase(seed_path=tmp_path / "missing.json").get_user("johndoe") is None
+
+    def test_add_user(self, tmp_path):
+        """Test users can be added after lazy loading"""
+        db = FakeUserDatabase(seed_path=write_seed_file(tmp_path, []))
+        db.add_user("janedoe", SEED_USER)
+        assert db.user_exists("janedoe")
@@ -0,0 +1,77 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.etag import etag_matches, weak_etag
+from app.core.security import create_access_token
+from app.core.token_cache import token_cache
+from app.db.database import fake_users_db
+from app.main import app
+
+client = TestClient(app)
+
+ETAG_USER = {
+    "username": "etag_user",
+    "full_name": "ETag User",
+    "email": "etag@example.com",
+    "hashed_password": "$2b$12$go/kUbiHTL7D/0ysuIaqRu9x8IMKDh9YcWEHGnGG1IqMZ0UTBelMC",
+    "disabled": False
+}
+
+
+@pytest.fixture
+def headers():
+    """Fixture for bearer headers of a dedicated user"""
+    fake_users_db.add_user("etag_user", ETAG_USER)
+    token_cache.clear()
+    yield {"Authorization": f"Bearer {create_access_token(data={'sub': 'etag_user'})}"}
+    token_cache.clear()
+
+
+class TestEtagHelpers:
+    """Test suite for ETag helpers"""
+
+    def test_weak_etag(self):
+        """Test ETags are weak and change with their inputs"""
+        assert weak_etag("a", 1).startswith('W/"')
+        assert weak_etag("a", 1) == weak_etag("a", 1)
+        assert weak_etag("a", 1) != weak_etag("a", 2)
+        assert weak_etag("a", 1) != weak_etag("b", 1)
+
+    def test_etag_matches(self):
+        """Test weak comparison, lists and the wildcard"""
+        etag = weak_etag("a", 1)
+        assert etag_matches(etag, etag)
+        assert etag_matches(etag.removeprefix("W/"), etag)
+        assert etag_matches(f'"other", {etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('W/"other"', etag)
+        assert not etag_matches(None, etag)
+
+
+class TestUsersMeEtag:
+    """Test suite for conditional GET /users/me"""
+
+    def test_returns_etag(self, headers):
+        """Test the response carries a weak ETag"""
+        response = client.get("/api/v1/users/me/", headers=headers)
+        assert response.status_code == 200
+        assert response.headers["ETag"].startswith('W/"')
+        assert "version" not in response.json()
+
+    def test_if_none_match_returns_304(self, headers):
+        """Test a current ETag short-circuits to an empty 304"""
+        etag = client.get("/api/v1/users/me/", headers=headers).headers["ETag"]
+        response = client.get("/api/v1/users/me/", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+
+    def test_user_update_changes_etag(self, headers):
+        """Test updating the user invalidates the previous ETag"""
+        etag = client.get("/api/v1/users/me/", headers=headers).headers["ETag"]
+        fake_users_db.add_user("etag_user", {**ETAG_USER, "full_name": "Renamed"})
+
+        response = client.get("/api/v1/users/me/", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["full_name"] == "Renamed"
+        assert response.headers["ETag"] != etag
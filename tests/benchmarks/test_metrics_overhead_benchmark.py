@@ -0,0 +1,73 @@
+"""
+Benchmark for the per-request cost of MetricsMiddleware.
+
+Drives the middleware directly around a trivial ASGI app, so the numbers
+show what recording metrics adds to each request without HTTP client or
+routing overhead on top.
+
+Run with:
+
+    $ pytest tests/benchmarks/test_metrics_overhead_benchmark.py -s
+"""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+
+from app.middleware.metrics import MetricsMiddleware
+
+REQUESTS = 20000
+ROUNDS = 5
+# The budget is a few microseconds per request; 5-8 µs was measured in a
+# single-CPU container. The bound leaves about 2x headroom for slower
+# machines, and taking the best of several rounds keeps scheduler noise out.
+OVERHEAD_BUDGET_US = 15
+
+
+async def trivial_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message):
+    pass
+
+
+def build_router():
+    app = FastAPI()
+
+    @app.get("/api/v1/content/status/{task_id}")
+    async def status(task_id: str):
+        return {}
+
+    return app.router
+
+
+async def drive(asgi_app) -> float:
+    start = time.perf_counter()
+    for i in range(REQUESTS):
+        scope = {"type": "http", "method": "GET", "path": f"/api/v1/content/status/{i % 100}", "headers": []}
+        await asgi_app(scope, receive, send)
+    return (time.perf_counter() - start) / REQUESTS
+
+
+@pytest.mark.benchmark
+def test_metrics_overhead_benchmark():
+    middleware = MetricsMiddleware(trivial_app, router=build_router())
+
+    baseline = min(asyncio.run(drive(trivial_app)) for _ in range(ROUNDS))
+    instrumented = min(asyncio.run(drive(middleware)) for _ in range(ROUNDS))
+    overhead_us = (instrumented - baseline) * 1_000_000
+
+    print(f"\nMetricsMiddleware, best of {ROUNDS} x {REQUESTS} requests:")
+    print(f"bare app:     {baseline * 1_000_000:6.2f} µs/request")
+    print(f"instrumented: {instrumented * 1_000_000:6.2f} µs/request")
+    print(f"overhead:     {overhead_us:6.2f} µs/request")
+
+    assert overhead_us < OVERHEAD_BUDGET_US
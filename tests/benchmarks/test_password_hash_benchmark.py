@@ -0,0 +1,52 @@
+"""
+Throughput benchmark for the supported password hashing policies.
+
+Reports how many logins (one verify each) a single core can serve per second
+under each policy, to pick a deliberate point between hash strength and login
+capacity. argon2id is skipped unless argon2-cffi is installed.
+
+Run with:
+
+    $ pytest tests/benchmarks/test_password_hash_benchmark.py -s
+"""
+
+import time
+
+import pytest
+from passlib.exc import MissingBackendError
+
+from app.core.security import build_password_context
+
+# (label, scheme, bcrypt cost); argon2id uses the argon2_* settings
+POLICIES = [
+    ("bcrypt cost 10", "bcrypt", 10),
+    ("bcrypt cost 12", "bcrypt", 12),
+    ("argon2id", "argon2", None),
+]
+MIN_SECONDS = 0.5
+
+
+def logins_per_second(context, password_hash: str) -> float:
+    count = 0
+    start = time.perf_counter()
+    while True:
+        context.verify("password", password_hash)
+        count += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_SECONDS:
+            return count / elapsed
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("label,scheme,rounds", POLICIES)
+def test_password_hash_benchmark(label, scheme, rounds):
+    context = build_password_context(scheme, bcrypt_rounds=rounds)
+    try:
+        password_hash = context.hash("password")
+    except MissingBackendError:
+        pytest.skip(f"{label}: backend not installed")
+
+    rate = logins_per_second(context, password_hash)
+    print(f"\n{label:>15}: {rate:8.1f} logins/sec/core ({1000 / rate:6.1f} ms per verify)")
+
+    assert rate > 0
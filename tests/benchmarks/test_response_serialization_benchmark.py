@@ -0,0 +1,93 @@
+"""
+Benchmark for serializing a large content batch response.
+
+Compares three ways of turning a validated ContentCreationResponse with many
+multi-kilobyte `optimized_content` strings into response bytes:
+
+* the previous path: FastAPI's `response_model` handling (dump, re-validate,
+  serialize) followed by JSONResponse (json.dumps),
+* the same `response_model` handling followed by ORJSONResponse, the app's
+  default response class now,
+* ModelResponse, which dumps the validated model once and encodes it with orjson.
+
+Run with:
+
+    $ pytest tests/benchmarks/test_response_serialization_benchmark.py -s
+"""
+
+import asyncio
+import json
+import timeit
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.testclient import TestClient
+
+from app.api.v1.schemas.content.content_schemas import ContentCreationResponse
+from app.core.responses import ModelResponse
+
+IDEAS = 200
+CONTENT_BYTES = 8 * 1024
+ITERATIONS = 20
+
+
+def build_response() -> ContentCreationResponse:
+    return ContentCreationResponse(
+        status="success",
+        processed_ideas=[
+            {
+                "original_idea": {"topic": f"Idea {i}", "content_type": "blog post", "keywords": ["ai", "content"]},
+                "optimized_content": ("Optimized paragraph about trends. " * (CONTENT_BYTES // 34))[:CONTENT_BYTES],
+                "timestamp": "2024-03-15T10:30:00",
+                "status": "success",
+            }
+            for i in range(IDEAS)
+        ],
+        processing_time=12.5,
+        errors=[],
+    )
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/json", response_model=ContentCreationResponse, response_class=JSONResponse)
+    async def json_path():
+        return build_response()
+
+    @app.get("/model", response_model=ContentCreationResponse)
+    async def model_path():
+        return ModelResponse(build_response())
+
+    return app
+
+
+@pytest.mark.benchmark
+def test_response_serialization_benchmark():
+    app = build_app()
+    client = TestClient(app)
+    assert json.loads(client.get("/json").content) == json.loads(client.get("/model").content)
+
+    response_field = next(route for route in app.routes if getattr(route, "path", None) == "/json").response_field
+    model = build_response()
+
+    def response_model_content():
+        return asyncio.run(serialize_response(field=response_field, response_content=model, is_coroutine=True))
+
+    def timed(func) -> float:
+        return min(timeit.repeat(func, number=ITERATIONS, repeat=3)) / ITERATIONS
+
+    previous = timed(lambda: JSONResponse(response_model_content()))
+    orjson_default = timed(lambda: ORJSONResponse(response_model_content()))
+    serialize_once = timed(lambda: ModelResponse(model))
+
+    size_kb = len(ModelResponse(model).body) / 1024
+    print(f"\nResponse with {IDEAS} ideas, {size_kb:.0f} KB:")
+    print(f"response_model + JSONResponse:   {previous * 1000:7.2f} ms")
+    print(f"response_model + ORJSONResponse: {orjson_default * 1000:7.2f} ms")
+    print(f"ModelResponse (serialize once):  {serialize_once * 1000:7.2f} ms")
+
+    assert serialize_once < previous
+    assert orjson_default < previous
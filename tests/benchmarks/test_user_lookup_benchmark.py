@@ -0,0 +1,43 @@
+"""
+Microbenchmark for user lookups on the authenticated request path.
+
+Compares the previous lookup (building a new UserInDB from a stored dict on
+every call) with the current one (returning the stored frozen instance).
+
+Run with:
+
+    $ pytest tests/benchmarks/test_user_lookup_benchmark.py -s
+"""
+
+import timeit
+
+import pytest
+
+from app.db.database import FakeUserDatabase
+from app.models.user import UserInDB
+
+ITERATIONS = 20000
+
+
+@pytest.mark.benchmark
+def test_user_lookup_benchmark():
+    db = FakeUserDatabase()
+    db.get_user("johndoe")  # Load seed users outside the timed section
+    user_dict = db.get_user("johndoe").model_dump()
+    stored_dicts = {"johndoe": user_dict}
+
+    def rebuild_lookup():
+        return UserInDB(**stored_dicts["johndoe"])
+
+    def stored_instance_lookup():
+        return db.get_user("johndoe")
+
+    rebuild = min(timeit.repeat(rebuild_lookup, number=ITERATIONS, repeat=3)) / ITERATIONS
+    stored = min(timeit.repeat(stored_instance_lookup, number=ITERATIONS, repeat=3)) / ITERATIONS
+
+    print(f"\nUserInDB(**dict) per lookup:      {rebuild * 1e9:8.0f} ns")
+    print(f"Stored frozen instance per lookup: {stored * 1e9:8.0f} ns")
+    print(f"Saving per authenticated request:  {(rebuild - stored) * 1e9:8.0f} ns")
+
+    assert stored_instance_lookup() is stored_instance_lookup()
+    assert stored < rebuild
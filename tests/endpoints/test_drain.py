@@ -0,0 +1,105 @@
+import asyncio
+import os
+import signal
+import threading
+import time
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import dependencies
+from app.core.api_keys import API_KEY_HEADER, ApiKeyStore, generate_api_key, hash_api_key
+from app.core.config import settings
+from app.core.drain import DrainTracker, drain_tracker, install_drain_signal_handlers, long_job
+from app.main import app
+
+client = TestClient(app)
+
+PODCAST_TEXT = "Speaker 1: Welcome to the show.\nSpeaker 2: Glad to be here."
+
+
+@pytest.fixture(autouse=True)
+def reset_drain_tracker():
+    drain_tracker.reset()
+    yield
+    drain_tracker.reset()
+
+
+class TestDrainTracker:
+    """Test suite for long job tracking and shutdown draining"""
+
+    def test_ready_until_draining(self):
+        """Test /ready reports ready, then draining with 503"""
+        assert client.get("/ready").json()["status"] == "ready"
+
+        drain_tracker.start_draining()
+        response = client.get("/ready")
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "draining"
+        assert client.get("/health").status_code == 200
+
+    def test_new_long_jobs_refused_while_draining(self, monkeypatch):
+        """Test podcast and content requests get 503 with Retry-After while draining"""
+        service_key = generate_api_key()
+        monkeypatch.setattr(dependencies, "api_key_store", ApiKeyStore({hash_api_key(service_key): "johndoe"}))
+        drain_tracker.start_draining()
+
+        podcast = client.post("/api/v1/gemini/podcast", json={"text": PODCAST_TEXT}, headers={"X-API-Key": "key"})
+        content = client.post(
+            "/api/v1/content/create",
+            json={"content_ideas": [{"topic": "AI", "content_type": "blog post"}]},
+            headers={API_KEY_HEADER: service_key},
+        )
+
+        for response in (podcast, content):
+            assert response.status_code == 503
+            assert response.headers["retry-after"] == str(settings.drain_retry_after_seconds)
+
+    def test_job_counted_while_running(self):
+        """Test a long job is in flight for the duration of its handler only"""
+        test_app = FastAPI()
+
+        @test_app.get("/job", dependencies=[Depends(long_job("podcast"))])
+        async def job():
+            return drain_tracker.in_flight()
+
+        assert TestClient(test_app).get("/job").json() == {"podcast": 1}
+        assert drain_tracker.in_flight() == {}
+
+    def test_wait_idle(self):
+        """Test waiting ends when the last job finishes, or at the deadline"""
+        tracker = DrainTracker(poll_interval=0.01)
+        tracker.begin("content")
+        assert asyncio.run(tracker.wait_idle(0.05)) is False
+
+        threading.Timer(0.05, tracker.end, ("content",)).start()
+        assert asyncio.run(tracker.wait_idle(5)) is True
+
+    def test_shutdown_waits_for_in_flight_jobs(self, monkeypatch):
+        """Test lifespan shutdown drains and waits for a running job to finish"""
+        monkeypatch.setattr(settings, "drain_timeout_seconds", 5)
+        with TestClient(app):
+            drain_tracker.begin("podcast")
+            threading.Timer(0.2, drain_tracker.end, ("podcast",)).start()
+            start = time.monotonic()
+        elapsed = time.monotonic() - start
+
+        assert drain_tracker.draining
+        assert drain_tracker.in_flight() == {}
+        assert 0.15 <= elapsed < 5
+
+    def test_sigterm_starts_draining_and_chains(self):
+        """Test SIGTERM marks the worker draining before the previous handler runs"""
+        received = []
+        original = signal.signal(signal.SIGTERM, lambda signum, frame: received.append(drain_tracker.draining))
+        restore = install_drain_signal_handlers()
+        try:
+            os.kill(os.getpid(), signal.SIGTERM)
+            time.sleep(0.01)
+        finally:
+            restore()
+            signal.signal(signal.SIGTERM, original)
+
+        assert received == [True]
@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from app.core.loop_monitor import LoopLagMonitor, event_loop_blocked_total, event_loop_lag_seconds
+from app.main import app
+
+
+def blocking_handler():
+    # Stands in for a synchronous SDK call made from an async handler
+    time.sleep(0.3)
+
+
+class TestLoopLagMonitor:
+    """Test suite for event-loop lag measurement and stall capture"""
+
+    def test_records_lag_without_stalls(self):
+        """Test a healthy loop records heartbeat lag but no stalls"""
+        async def scenario():
+            monitor = LoopLagMonitor(interval=0.01, threshold=0.2)
+            monitor.start()
+            await asyncio.sleep(0.1)
+            await monitor.stop()
+            return monitor
+
+        lag_before = event_loop_lag_seconds.count()
+        monitor = asyncio.run(scenario())
+
+        assert event_loop_lag_seconds.count() > lag_before
+        assert monitor.stalls == []
+
+    def test_captures_blocking_stack_once_per_stall(self, caplog):
+        """Test a blocked loop is reported once with the blocking function on the stack"""
+        async def scenario():
+            monitor = LoopLagMonitor(interval=0.01, threshold=0.1)
+            monitor.start()
+            await asyncio.sleep(0.05)
+            blocking_handler()
+            await asyncio.sleep(0.05)
+            await monitor.stop()
+            return monitor
+
+        blocked_before = event_loop_blocked_total.value()
+        with caplog.at_level("WARNING", logger="app.core.loop_monitor"):
+            monitor = asyncio.run(scenario())
+
+        assert len(monitor.stalls) == 1
+        assert "blocking_handler" in monitor.stalls[0]
+        assert event_loop_blocked_total.value() == blocked_before + 1
+        assert any("Event loop blocked" in record.getMessage() for record in caplog.records)
+
+    def test_started_by_lifespan(self):
+        """Test the application runs the monitor and exports its metrics"""
+        lag_before = event_loop_lag_seconds.count()
+        with TestClient(app) as client:
+            time.sleep(0.3)
+            response = client.get("/metrics")
+
+        assert "# TYPE event_loop_lag_seconds histogram" in response.text
+        assert event_loop_lag_seconds.count() > lag_before
@@ -0,0 +1,92 @@
+import sys
+
+import pytest
+
+from app import server
+from app.core.config import settings
+from app.server import ServerConfig, default_workers
+
+
+@pytest.fixture
+def cgroup(tmp_path, monkeypatch):
+    """Fixture pointing cgroup lookups at a temporary directory"""
+    monkeypatch.setattr(server, "CGROUP_ROOT", tmp_path)
+    return tmp_path
+
+
+class TestWorkerSizing:
+    """Test suite for CPU- and memory-aware worker sizing"""
+
+    def test_cpu_quota_limits_cpus(self, cgroup, monkeypatch):
+        """Test a cgroup CPU quota wins over the visible core count"""
+        monkeypatch.setattr(server.os, "sched_getaffinity", lambda pid: set(range(16)), raising=False)
+        (cgroup / "cpu.max").write_text("200000 100000\n")
+        assert server.available_cpus() == 2.0
+
+    def test_memory_limits_workers(self, cgroup, monkeypatch):
+        """Test workers are capped by how many fit in the memory limit"""
+        monkeypatch.setattr(server, "available_cpus", lambda: 8.0)
+        (cgroup / "memory.max").write_text(str(1024 * 1024 * 1024))
+        assert default_workers(worker_memory_mb=512) == 2
+
+    def test_at_least_one_worker(self, monkeypatch):
+        """Test tiny containers still get one worker"""
+        monkeypatch.setattr(server, "available_cpus", lambda: 1.0)
+        monkeypatch.setattr(server, "available_memory_mb", lambda: 128)
+        assert default_workers(worker_memory_mb=512) == 1
+
+
+class TestServerConfig:
+    """Test suite for environment-driven server configuration"""
+
+    def test_defaults(self, monkeypatch):
+        """Test single-process mode is the default"""
+        for name in ("SERVER_MODE", "PORT", "WEB_CONCURRENCY"):
+            monkeypatch.delenv(name, raising=False)
+        config = ServerConfig.from_env()
+        assert config.mode == "single"
+        assert config.port == 8000
+
+    def test_multi_mode_from_env(self, monkeypatch):
+        """Test mode, port, workers and recycling come from the environment"""
+        monkeypatch.setenv("SERVER_MODE", "multi")
+        monkeypatch.setenv("PORT", "9000")
+        monkeypatch.setenv("WEB_CONCURRENCY", "3")
+        monkeypatch.setenv("MAX_REQUESTS", "500")
+        config = ServerConfig.from_env()
+        assert (config.mode, config.port, config.workers, config.max_requests) == ("multi", 9000, 3, 500)
+
+    def test_graceful_timeout_defaults_to_drain_deadline(self, monkeypatch):
+        """Test the server waits as long as the app drains long jobs unless overridden"""
+        monkeypatch.delenv("GRACEFUL_TIMEOUT", raising=False)
+        monkeypatch.setattr(server, "default_graceful_timeout", lambda: 120)
+        assert ServerConfig.from_env().graceful_timeout == 120
+
+        monkeypatch.setenv("GRACEFUL_TIMEOUT", "45")
+        assert ServerConfig.from_env().graceful_timeout == 45
+
+    def test_unknown_mode(self, monkeypatch):
+        """Test an unknown mode is rejected"""
+        monkeypatch.setenv("SERVER_MODE", "threads")
+        with pytest.raises(ValueError):
+            ServerConfig.from_env()
+
+    def test_multi_mode_needs_shared_store(self, monkeypatch):
+        """Test multi mode refuses to start with per-process users and revocations"""
+        monkeypatch.setattr(settings, "user_store_backend", "memory")
+        monkeypatch.setattr(server.uvicorn, "run", lambda app, **kwargs: pytest.fail("server started"))
+        with pytest.raises(ValueError, match="user_store_backend=sqlite"):
+            server.run(ServerConfig(mode="multi", workers=2))
+
+    def test_falls_back_to_uvicorn_workers(self, monkeypatch):
+        """Test multi mode runs uvicorn workers with recycling when gunicorn is missing"""
+        calls = {}
+        monkeypatch.setattr(settings, "user_store_backend", "sqlite")
+        monkeypatch.setitem(sys.modules, "gunicorn", None)
+        monkeypatch.setattr(server.uvicorn, "run", lambda app, **kwargs: calls.update(app=app, **kwargs))
+        server.run(ServerConfig(mode="multi", workers=3, max_requests=100, max_requests_jitter=10))
+
+        assert calls["app"] == "app.main:app"
+        assert calls["workers"] == 3
+        assert 100 <= calls["limit_max_requests"] <= 110
+        assert calls["timeout_graceful_shutdown"] == 300
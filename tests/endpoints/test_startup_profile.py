@@ -0,0 +1,47 @@
+import json
+
+from app.tools.startup_profile import find_import, format_tree, main, parse_importtime
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     json.decoder
+import time:       200 |        300 |   json
+import time:        50 |         50 |   app.core
+import time:      1000 |       1350 | app.main
+import time:        10 |         10 | other
+"""
+
+
+class TestParseImporttime:
+    """Test suite for parsing -X importtime output"""
+
+    def test_builds_tree(self):
+        """Test children are attached to the module that imported them"""
+        roots = parse_importtime(SAMPLE)
+        assert [root.name for root in roots] == ["app.main", "other"]
+        main_node = roots[0]
+        assert main_node.cumulative_ms == 1.35
+        assert [child.name for child in main_node.children] == ["json", "app.core"]
+        assert main_node.children[0].children[0].name == "json.decoder"
+
+    def test_find_and_format(self):
+        """Test nested lookup and threshold pruning in the printed tree"""
+        node = find_import(parse_importtime(SAMPLE), "json")
+        assert node.self_ms == 0.2
+        lines = format_tree(find_import(parse_importtime(SAMPLE), "app.main"), min_ms=0.1, max_depth=5)
+        assert len(lines) == 3
+        assert "json.decoder" in lines[2]
+
+
+class TestStartupProfile:
+    """Test suite for the startup profiler entry point"""
+
+    def test_writes_report(self, tmp_path):
+        """Test a full profile run writes a diffable JSON report"""
+        output = tmp_path / "profile.json"
+        main(["--output", str(output), "--min-ms", "50"])
+
+        report = json.loads(output.read_text())
+        assert report["import"]["total_ms"] > 0
+        assert report["import"]["tree"]["name"] == "app.main"
+        assert report["first_request"]["status_code"] == 200
+        assert report["lifespan"]["startup_ms"] >= 0
@@ -0,0 +1,55 @@
+"""
+Cold-start budget for the application import.
+
+`import app.main` is what every new Railway / Cloud Run instance pays before it
+can serve a request. Heavy SDKs must be imported on first use, not here.
+The budget can be raised on slow machines with STARTUP_IMPORT_BUDGET_SECONDS.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+BUDGET_SECONDS = float(os.getenv("STARTUP_IMPORT_BUDGET_SECONDS", "3.0"))
+LAZY_MODULES = ["crewai", "crewai_tools", "litellm", "embedchain", "google.genai"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "modules": [m for m in %r if m in sys.modules]}))
+""" % (LAZY_MODULES,)
+
+
+@pytest.fixture(scope="module")
+def startup():
+    """Fixture importing the app in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class TestStartupTime:
+    """Test suite for application cold-start cost"""
+
+    def test_heavy_sdks_are_not_imported(self, startup):
+        """Test SDKs used by individual routes load on first use"""
+        assert startup["modules"] == []
+
+    def test_import_within_budget(self, startup):
+        """Test `import app.main` stays within the startup budget"""
+        assert startup["seconds"] < BUDGET_SECONDS, (
+            f"import app.main took {startup['seconds']:.2f}s (budget {BUDGET_SECONDS:.2f}s)"
+        )
@@ -0,0 +1,168 @@
+import gzip
+import zlib
+
+import pytest
+import zstandard
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware.compression import CompressionMiddleware, select_encoding
+
+LARGE_TEXT = "Trending content about AI marketing automation. " * 200
+
+
+def build_app(**options) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, **{"minimum_size": 500, "level": 6, "route_levels": {}, **options})
+
+    @app.get("/large")
+    async def large():
+        return {"content": LARGE_TEXT}
+
+    @app.get("/small")
+    async def small():
+        return {"content": "short"}
+
+    @app.get("/audio")
+    async def audio():
+        return Response(content=b"RIFF" + b"\x00" * 4000, media_type="audio/wav")
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(5):
+                yield f"chunk {i} {LARGE_TEXT[:200]}\n"
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/raw/large")
+    async def raw_large():
+        return PlainTextResponse(LARGE_TEXT)
+
+    return app
+
+
+def raw_get(client: TestClient, path: str, accept_encoding: str):
+    """GET without httpx's transparent decoding, returning the response and raw body"""
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+class TestSelectEncoding:
+    """Test suite for Accept-Encoding negotiation"""
+
+    def test_prefers_zstd_then_gzip(self):
+        """Test server preference breaks ties between equally rated encodings"""
+        assert select_encoding("gzip, deflate, zstd") == "zstd"
+        assert select_encoding("gzip, deflate") == "gzip"
+
+    def test_quality_values(self):
+        """Test q-values and q=0 exclusions are honoured"""
+        assert select_encoding("zstd;q=0.5, gzip") == "gzip"
+        assert select_encoding("zstd;q=0, gzip;q=0") is None
+        assert select_encoding("identity") is None
+        assert select_encoding("*") is not None
+
+
+class TestCompressionMiddleware:
+    """Test suite for the compression middleware"""
+
+    @pytest.mark.parametrize("encoding,decode", [
+        ("gzip", gzip.decompress),
+        ("zstd", lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data)),
+    ])
+    def test_compresses_large_json(self, encoding, decode):
+        """Test large JSON bodies are compressed with the negotiated encoding"""
+        client = TestClient(build_app())
+        response, body = raw_get(client, "/large", encoding)
+        assert response.headers["content-encoding"] == encoding
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) == len(body)
+        assert len(body) < len(LARGE_TEXT) / 5
+        assert LARGE_TEXT.encode() in decode(body)
+
+    def test_compresses_with_brotli(self):
+        """Test Brotli is negotiated when the package is installed"""
+        brotli = pytest.importorskip("brotli")
+        response, body = raw_get(TestClient(build_app()), "/large", "br")
+        assert response.headers["content-encoding"] == "br"
+        assert brotli.decompress(body) == f'{{"content":"{LARGE_TEXT}"}}'.encode()
+
+    def test_small_body_not_compressed(self):
+        """Test bodies below the threshold are sent as is"""
+        response, body = raw_get(TestClient(build_app()), "/small", "gzip")
+        assert "content-encoding" not in response.headers
+        assert body == b'{"content":"short"}'
+
+    def test_audio_excluded(self):
+        """Test already compressed media types pass through"""
+        response, body = raw_get(TestClient(build_app()), "/audio", "gzip")
+        assert "content-encoding" not in response.headers
+        assert body.startswith(b"RIFF")
+
+    def test_no_accept_encoding(self):
+        """Test clients that accept no supported encoding get identity"""
+        response, _ = raw_get(TestClient(build_app()), "/large", "identity")
+        assert "content-encoding" not in response.headers
+
+    @pytest.mark.parametrize("path, accept_encoding", [
+        ("/large", "gzip"),
+        ("/large", "identity"),
+        ("/small", "gzip"),
+        ("/stream", "gzip"),
+    ])
+    def test_vary_on_every_compressible_response(self, path, accept_encoding):
+        """Test caches are told the response depends on Accept-Encoding, compressed or not"""
+        response, _ = raw_get(TestClient(build_app()), path, accept_encoding)
+        assert response.headers["vary"] == "Accept-Encoding"
+
+    def test_no_vary_when_never_compressed(self):
+        """Test excluded media types and disabled routes do not vary"""
+        response, _ = raw_get(TestClient(build_app()), "/audio", "gzip")
+        assert "vary" not in response.headers
+        response, _ = raw_get(TestClient(build_app(route_levels={"/raw": 0})), "/raw/large", "gzip")
+        assert "vary" not in response.headers
+
+    def test_vary_merged_with_existing(self):
+        """Test Accept-Encoding is appended to, not duplicated in, an existing Vary"""
+        app = build_app()
+
+        @app.get("/varies")
+        async def varies():
+            return PlainTextResponse("short", headers={"Vary": "Authorization"})
+
+        @app.get("/already")
+        async def already():
+            return PlainTextResponse(LARGE_TEXT, headers={"Vary": "accept-encoding"})
+
+        client = TestClient(app)
+        assert raw_get(client, "/varies", "gzip")[0].headers["vary"] == "Authorization, Accept-Encoding"
+        assert raw_get(client, "/already", "gzip")[0].headers["vary"] == "accept-encoding"
+
+    def test_streaming_compressed_incrementally(self):
+        """Test streamed bodies are compressed without a content length"""
+        response, body = raw_get(TestClient(build_app()), "/stream", "gzip")
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        text = zlib.decompressobj(zlib.MAX_WBITS | 16).decompress(body).decode()
+        assert text.count("chunk") == 5
+
+    def test_route_level_zero_disables(self):
+        """Test a per-route level of 0 turns compression off for that prefix"""
+        client = TestClient(build_app(route_levels={"/raw": 0}))
+        response, _ = raw_get(client, "/raw/large", "gzip")
+        assert "content-encoding" not in response.headers
+        response, _ = raw_get(client, "/large", "gzip")
+        assert response.headers["content-encoding"] == "gzip"
+
+    def test_route_level_changes_output(self):
+        """Test per-route levels are applied"""
+        fast = raw_get(TestClient(build_app(route_levels={"/raw": 1})), "/raw/large", "gzip")[1]
+        best = raw_get(TestClient(build_app(route_levels={"/raw": 9})), "/raw/large", "gzip")[1]
+        assert gzip.decompress(fast) == gzip.decompress(best) == LARGE_TEXT.encode()
+        assert len(best) <= len(fast)
+
+    def test_transparent_for_clients(self):
+        """Test a decoding client sees the original JSON"""
+        response = TestClient(build_app()).get("/large")
+        assert response.json() == {"content": LARGE_TEXT}
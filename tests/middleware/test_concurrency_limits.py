@@ -0,0 +1,202 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.main import app as main_app
+from app.middleware.concurrency import (
+    ConcurrencyLimiter,
+    ConcurrencyLimitMiddleware,
+    RouteClass,
+    requests_shed_total,
+)
+
+ROUTE_CLASSES = {"/slow": "slow", "/auth": "auth"}
+CLASS_LIMITS = {
+    "slow": {"max_concurrency": 1, "max_queue": 1, "queue_timeout": 5, "status_code": 503, "retry_after": 7},
+    "auth": {"max_concurrency": 1, "max_queue": 0, "status_code": 429, "retry_after": 1},
+}
+
+
+def build_middleware(release: asyncio.Event, started: list) -> ConcurrencyLimitMiddleware:
+    async def app(scope, receive, send):
+        started.append(scope["path"])
+        if scope["path"] != "/health":
+            await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    return ConcurrencyLimitMiddleware(app, ROUTE_CLASSES, CLASS_LIMITS, exempt_paths=["/health"])
+
+
+async def request(middleware, path: str) -> dict:
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware({"type": "http", "method": "GET", "path": path, "headers": []}, receive, send)
+    start = messages[0]
+    return {"status": start["status"], "headers": dict(start["headers"])}
+
+
+class TestConcurrencyLimitMiddleware:
+    """Test suite for route-class concurrency limits"""
+
+    def test_queues_then_sheds(self):
+        """Test one request runs, one waits and the next is rejected with Retry-After"""
+        async def scenario():
+            release, started = asyncio.Event(), []
+            middleware = build_middleware(release, started)
+            running = asyncio.create_task(request(middleware, "/slow/a"))
+            queued = asyncio.create_task(request(middleware, "/slow/b"))
+            await asyncio.sleep(0.01)
+
+            rejected = await request(middleware, "/slow/c")
+            assert started == ["/slow/a"]
+            release.set()
+            return rejected, await running, await queued
+
+        before = requests_shed_total.value(("slow", "queue_full"))
+        rejected, running, queued = asyncio.run(scenario())
+
+        assert rejected["status"] == 503
+        assert rejected["headers"][b"retry-after"] == b"7"
+        assert running["status"] == 200
+        assert queued["status"] == 200
+        assert requests_shed_total.value(("slow", "queue_full")) == before + 1
+
+    def test_class_status_code(self):
+        """Test a class can shed with 429 instead of 503"""
+        async def scenario():
+            release, started = asyncio.Event(), []
+            middleware = build_middleware(release, started)
+            running = asyncio.create_task(request(middleware, "/auth/token"))
+            await asyncio.sleep(0.01)
+            rejected = await request(middleware, "/auth/token")
+            release.set()
+            await running
+            return rejected
+
+        assert asyncio.run(scenario())["status"] == 429
+
+    def test_classes_are_isolated_and_exempt_paths_bypass(self):
+        """Test a saturated class does not block other classes or exempt paths"""
+        async def scenario():
+            release, started = asyncio.Event(), []
+            middleware = build_middleware(release, started)
+            running = asyncio.create_task(request(middleware, "/slow/a"))
+            queued = asyncio.create_task(request(middleware, "/slow/b"))
+            await asyncio.sleep(0.01)
+
+            health = await request(middleware, "/health")
+            auth = asyncio.create_task(request(middleware, "/auth/token"))
+            await asyncio.sleep(0.01)
+            assert "/auth/token" in started
+            release.set()
+            await asyncio.gather(running, queued, auth)
+            return health
+
+        assert asyncio.run(scenario())["status"] == 200
+
+
+class TestConcurrencyLimiter:
+    """Test suite for slot hand-off and queue timeouts"""
+
+    def test_queue_timeout(self):
+        """Test a waiter gives up after queue_timeout and leaves the queue"""
+        async def scenario():
+            limiter = ConcurrencyLimiter(RouteClass("slow", max_concurrency=1, max_queue=1, queue_timeout=0.01))
+            assert await limiter.acquire() is None
+            assert await limiter.acquire() == "queue_timeout"
+            assert limiter.queued == 0
+            limiter.release()
+            return limiter.active
+
+        assert asyncio.run(scenario()) == 0
+
+    def test_fifo_hand_off(self):
+        """Test released slots go to waiters in arrival order"""
+        async def scenario():
+            limiter = ConcurrencyLimiter(RouteClass("slow", max_concurrency=1, max_queue=2))
+            order = []
+            await limiter.acquire()
+
+            async def waiter(name):
+                await limiter.acquire()
+                order.append(name)
+
+            tasks = [asyncio.create_task(waiter("first")), asyncio.create_task(waiter("second"))]
+            await asyncio.sleep(0.01)
+            limiter.release()
+            await asyncio.sleep(0.01)
+            limiter.release()
+            await asyncio.gather(*tasks)
+            limiter.release()
+            return order, limiter.active
+
+        order, active = asyncio.run(scenario())
+        assert order == ["first", "second"]
+        assert active == 0
+
+    def test_cancelled_waiter_leaves_queue(self):
+        """Test a cancelled waiter neither holds a slot nor blocks the queue"""
+        async def scenario():
+            limiter = ConcurrencyLimiter(RouteClass("slow", max_concurrency=1, max_queue=1))
+            await limiter.acquire()
+            task = asyncio.create_task(limiter.acquire())
+            await asyncio.sleep(0.01)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            limiter.release()
+            return limiter.queued, limiter.active
+
+        assert asyncio.run(scenario()) == (0, 0)
+
+    def test_hand_off_across_event_loops(self):
+        """Test a slot released on one loop wakes a waiter on another loop"""
+        import threading
+
+        limiter = ConcurrencyLimiter(RouteClass("slow", max_concurrency=1, max_queue=1, queue_timeout=5))
+        holding, results = threading.Event(), []
+
+        async def holder():
+            await limiter.acquire()
+            holding.set()
+            await asyncio.sleep(0.05)
+            limiter.release()
+
+        async def waiter():
+            holding.wait()
+            results.append(await limiter.acquire())
+            limiter.release()
+
+        threads = [threading.Thread(target=asyncio.run, args=(coro(),)) for coro in (holder, waiter)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert results == [None]
+        assert limiter.active == 0
+
+
+class TestAppConfiguration:
+    """Test suite for the limits configured on the application"""
+
+    def test_expensive_routes_are_classified(self):
+        """Test crew, TTS and login routes fall into limited classes and /health does not"""
+        middleware = ConcurrencyLimitMiddleware(None)
+
+        assert middleware.limiter_for("/api/v1/content/create").route_class.name == "crew"
+        assert middleware.limiter_for("/api/v1/gemini/podcast").route_class.name == "tts"
+        assert middleware.limiter_for("/api/v1/token").route_class.name == "auth"
+        assert middleware.limiter_for("/api/v1/content/health") is None
+        assert middleware.limiter_for("/health") is None
+        assert middleware.limiter_for("/api/v1/hello") is None
+
+    def test_health_served_through_app(self):
+        """Test the application still serves /health with the middleware installed"""
+        assert TestClient(main_app).get("/health").status_code == 200
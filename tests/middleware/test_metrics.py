@@ -0,0 +1,177 @@
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.core.metrics import (
+    Counter,
+    Histogram,
+    _registry,
+    http_request_duration_seconds,
+    http_requests_in_progress,
+    http_requests_total,
+    http_response_size_bytes,
+    upstream_request_duration_seconds,
+    upstream_timer,
+)
+from app.main import app as main_app
+from app.middleware.metrics import UNMATCHED_ROUTE, MetricsMiddleware, RouteResolver
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, router=app.router)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        if item_id == "missing":
+            raise HTTPException(status_code=404, detail="Not found")
+        return {"item_id": item_id}
+
+    @app.get("/metrics")
+    async def metrics():
+        return {"ok": True}
+
+    return app
+
+
+@pytest.fixture
+def client():
+    return TestClient(build_app())
+
+
+class TestMetricsMiddleware:
+    """Test suite for per-route request metrics"""
+
+    def test_labels_use_route_template(self, client):
+        """Test requests for different ids share one route template label"""
+        labels = ("GET", "/items/{item_id}", "200")
+        before = http_requests_total.value(labels)
+
+        client.get("/items/a")
+        client.get("/items/b")
+
+        assert http_requests_total.value(labels) == before + 2
+        assert http_requests_total.value(("GET", "/items/a", "200")) == 0
+
+    def test_counts_by_status(self, client):
+        """Test error responses are counted under their own status"""
+        labels = ("GET", "/items/{item_id}", "404")
+        before = http_requests_total.value(labels)
+
+        client.get("/items/missing")
+
+        assert http_requests_total.value(labels) == before + 1
+
+    def test_records_latency_size_and_in_progress(self, client):
+        """Test latency and size histograms are observed and the gauge returns to zero"""
+        labels = ("GET", "/items/{item_id}")
+        latency_before = http_request_duration_seconds.count(labels)
+        size_before = http_response_size_bytes.count(labels)
+
+        client.get("/items/a")
+
+        assert http_request_duration_seconds.count(labels) == latency_before + 1
+        assert http_response_size_bytes.count(labels) == size_before + 1
+        assert http_requests_in_progress.value(labels) == 0
+
+    def test_unmatched_path_has_bounded_label(self, client):
+        """Test unknown paths collapse into a single label"""
+        labels = ("GET", UNMATCHED_ROUTE, "404")
+        before = http_requests_total.value(labels)
+
+        client.get("/no/such/path/123")
+        client.get("/no/such/path/456")
+
+        assert http_requests_total.value(labels) == before + 2
+
+    def test_excluded_paths_are_not_recorded(self, client):
+        """Test scrapes of /metrics do not count themselves"""
+        client.get("/metrics")
+
+        assert http_requests_total.value(("GET", "/metrics", "200")) == 0
+
+
+class TestRouteResolver:
+    """Test suite for route template resolution"""
+
+    def test_cache_is_bounded(self):
+        """Test the cache is emptied instead of growing past max_size"""
+        resolver = RouteResolver(build_app().router, max_size=3)
+        for i in range(10):
+            assert resolver.resolve({"type": "http", "method": "GET", "path": f"/items/{i}"}) == "/items/{item_id}"
+        assert len(resolver._cache) <= 3
+
+
+class TestRendering:
+    """Test suite for the Prometheus text format"""
+
+    def test_counter_and_histogram_format(self):
+        """Test samples, labels and cumulative buckets are rendered"""
+        counter = Counter("test_events_total", "Events.", ("kind",))
+        histogram = Histogram("test_latency_seconds", "Latency.", ("kind",), buckets=(0.1, 1.0))
+        try:
+            counter.inc(("a\"b",))
+            histogram.observe(("x",), 0.05)
+            histogram.observe(("x",), 0.5)
+
+            assert 'test_events_total{kind="a\\"b"} 1' in counter.render()
+            rendered = histogram.render()
+            assert "# TYPE test_latency_seconds histogram" in rendered
+            assert 'test_latency_seconds_bucket{kind="x",le="0.1"} 1' in rendered
+            assert 'test_latency_seconds_bucket{kind="x",le="1"} 2' in rendered
+            assert 'test_latency_seconds_bucket{kind="x",le="+Inf"} 2' in rendered
+            assert 'test_latency_seconds_count{kind="x"} 2' in rendered
+        finally:
+            _registry.remove(counter)
+            _registry.remove(histogram)
+
+    def test_bound_children_share_state(self):
+        """Test a pre-bound child records into the same series as the labelled calls"""
+        counter = Counter("test_bound_total", "Events.", ("kind",))
+        histogram = Histogram("test_bound_seconds", "Latency.", ("kind",), buckets=(0.1, 1.0))
+        try:
+            assert counter.labels("a") is counter.labels("a")
+            counter.labels("a").inc()
+            counter.inc(("a",), 2)
+            histogram.labels("x").observe(0.05)
+            histogram.observe(("x",), 0.5)
+            assert counter.value(("a",)) == 3
+            assert histogram.count(("x",)) == 2
+        finally:
+            _registry.remove(counter)
+            _registry.remove(histogram)
+
+    def test_metrics_endpoint(self):
+        """Test the app exposes its metrics in the text format"""
+        client = TestClient(main_app)
+        client.get("/health")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'http_requests_total{method="GET",route="/health",status="200"}' in response.text
+        assert "# TYPE http_request_duration_seconds histogram" in response.text
+
+
+class TestUpstreamTimer:
+    """Test suite for upstream call timing"""
+
+    def test_records_success(self):
+        """Test a completed call is recorded as a success"""
+        before = upstream_request_duration_seconds.count(("test-upstream", "success"))
+
+        with upstream_timer("test-upstream"):
+            pass
+
+        assert upstream_request_duration_seconds.count(("test-upstream", "success")) == before + 1
+
+    def test_records_error_and_reraises(self):
+        """Test a failing call is recorded as an error and the exception propagates"""
+        before = upstream_request_duration_seconds.count(("test-upstream", "error"))
+
+        with pytest.raises(RuntimeError):
+            with upstream_timer("test-upstream"):
+                raise RuntimeError("upstream down")
+
+        assert upstream_request_duration_seconds.count(("test-upstream", "error")) == before + 1
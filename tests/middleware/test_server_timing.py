@@ -0,0 +1,176 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import metrics, timing
+from app.core.metrics import upstream_timer
+from app.main import app as main_app
+from app.middleware.concurrency import ConcurrencyLimitMiddleware
+from app.middleware.timing import ServerTimingMiddleware
+from app.tools.content_tools.trend_corpus import TrendCorpus
+from app.tools.content_tools.trend_tools import ContentTrendTools
+
+
+def build_app(log_threshold_ms: float = 0.0) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware, log_threshold_ms=log_threshold_ms)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        timing.mark("validate")
+        with timing.phase("work"):
+            time.sleep(0.01)
+        with upstream_timer("test-upstream"):
+            pass
+        with upstream_timer("test-upstream"):
+            pass
+        return {"item_id": item_id}
+
+    @app.get("/sync")
+    def sync_endpoint():
+        with timing.phase("threaded"):
+            pass
+        return {}
+
+    return app
+
+
+def timing_records(caplog) -> list:
+    return [record for record in caplog.records if record.name == "app.middleware.timing"]
+
+
+def parse_server_timing(value: str) -> dict:
+    entries = {}
+    for entry in value.split(","):
+        name, _, duration = entry.strip().partition(";dur=")
+        entries[name] = float(duration)
+    return entries
+
+
+class SlowSearchTool:
+    """Search tool stub standing in for Serper"""
+
+    def run(self, query):
+        time.sleep(0.01)
+        return f"Remote results for: {query}"
+
+
+class TestUpstreamTimings:
+    """Test suite for upstream calls made off the request's own thread"""
+
+    def test_batch_search_reports_serper(self, tmp_path):
+        """Test searches run on the shared pool still appear in the header"""
+        tools = ContentTrendTools(corpus=TrendCorpus(tmp_path / "empty.jsonl"))
+        tools.search_tool = SlowSearchTool()
+        app = build_app()
+
+        @app.get("/search")
+        async def search():
+            tools.batch_search(["ai tools", "remote work"])
+            return {}
+
+        entries = parse_server_timing(TestClient(app).get("/search").headers["server-timing"])
+        assert entries["serper"] >= 20
+
+    def test_llm_calls_reported(self):
+        """Test LLM durations reported on litellm's callback thread reach the request"""
+        app = build_app()
+
+        @app.get("/llm")
+        async def llm():
+            kwargs = {"custom_llm_provider": "openai"}
+            metrics._llm_started(kwargs)
+            end = datetime.now()
+            # litellm calls success callbacks from its own pool, without the request context
+            callback = threading.Thread(
+                target=metrics._llm_success, args=(kwargs, None, end - timedelta(milliseconds=40), end)
+            )
+            callback.start()
+            callback.join()
+            return {}
+
+        entries = parse_server_timing(TestClient(app).get("/llm").headers["server-timing"])
+        assert entries["openai"] >= 40
+
+    def test_queue_wait_not_counted_as_validate(self, monkeypatch):
+        """Test time waiting for a concurrency slot is its own phase"""
+        async def handler(scope, receive, send):
+            timing.mark("validate")
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"{}"})
+
+        limited = ConcurrencyLimitMiddleware(
+            handler,
+            route_classes={"/items": "slow"},
+            class_limits={"slow": {"max_concurrency": 1}},
+            exempt_paths=(),
+        )
+        limiter = limited.limiters["slow"]
+        acquire = limiter.acquire
+
+        async def queued_acquire():
+            await asyncio.sleep(0.05)
+            return await acquire()
+
+        monkeypatch.setattr(limiter, "acquire", queued_acquire)
+        client = TestClient(ServerTimingMiddleware(limited, log_threshold_ms=0.0))
+
+        entries = parse_server_timing(client.get("/items/1").headers["server-timing"])
+        assert entries["queue"] >= 50
+        assert entries["validate"] < 50
+
+
+class TestServerTiming:
+    """Test suite for the Server-Timing header and timing log"""
+
+    def test_header_lists_phases_and_total(self):
+        """Test recorded phases, upstream calls and the total are returned"""
+        response = TestClient(build_app()).get("/items/1")
+
+        entries = parse_server_timing(response.headers["server-timing"])
+        assert list(entries) == ["validate", "work", "test-upstream", "total"]
+        assert entries["work"] >= 10
+        assert entries["total"] >= entries["work"]
+
+    def test_sync_handler_records_from_threadpool(self):
+        """Test phases recorded in sync handlers run in worker threads are kept"""
+        response = TestClient(build_app()).get("/sync")
+
+        assert "threaded" in parse_server_timing(response.headers["server-timing"])
+
+    def test_structured_log(self, caplog):
+        """Test each request is logged as one JSON line with route template and phases"""
+        with caplog.at_level(logging.INFO, logger="app.middleware.timing"):
+            TestClient(build_app()).get("/items/42")
+
+        record = json.loads(timing_records(caplog)[-1].getMessage())
+        assert record["event"] == "request_timing"
+        assert record["route"] == "/items/{item_id}"
+        assert record["status"] == 200
+        assert set(record["phases_ms"]) == {"validate", "work", "test-upstream"}
+
+    def test_fast_requests_logged_at_debug(self, caplog):
+        """Test requests under the threshold are not logged at INFO"""
+        with caplog.at_level(logging.INFO, logger="app.middleware.timing"):
+            TestClient(build_app(log_threshold_ms=60_000)).get("/items/1")
+
+        assert not timing_records(caplog)
+
+    def test_recording_outside_request_is_noop(self):
+        """Test phases can be recorded safely outside a request"""
+        assert timing.current_timer() is None
+        timing.mark("validate")
+        with timing.phase("work"):
+            pass
+
+    def test_main_app_sends_header(self):
+        """Test the application includes the middleware"""
+        response = TestClient(main_app).get("/health")
+
+        assert "total" in parse_server_timing(response.headers["server-timing"])